@@ -4,11 +4,22 @@ AI Agents for Monopoly - Uses OpenAI and Ollama to make game decisions
 
 import json
 import os
+import math
+import time
+import random
+import asyncio
+import contextlib
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
-from openai import OpenAI
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Dict, Any, List, Optional, Tuple
 from dotenv import load_dotenv
 
+from game_engine import MonopolyGame, GamePhase, TILE_CATALOG
+from batch_engine import play_policy
+from decision_cache import DecisionCache
+from model_backends import ModelBackend, BackendUnavailable, backend_for
+from cassette import CassetteMismatch
+
 load_dotenv()
 
 
@@ -79,12 +90,64 @@ For other actions: {{"action": "<action_name>", "params": {{}}}}
 
 
 class BaseAgent(ABC):
+    # False for agents that only look at the attached game; runners can then
+    # skip building the state dict for them
+    reads_state = True
+    # Model agents reuse decisions for repeated situations through this
+    cache: Optional[DecisionCache] = None
+    model = ""
+    temperature = 0.7
+
     def __init__(self, name: str):
         self.name = name
+        self.game: Optional[MonopolyGame] = None
+
+    def attach(self, game: MonopolyGame):
+        """Give the agent the live game before play. LLM agents only use the state dicts."""
+        self.game = game
     
     @abstractmethod
     def decide(self, game_state: Dict, available_actions: Dict) -> Dict[str, Any]:
         pass
+
+    async def adecide(self, game_state: Dict, available_actions: Dict) -> Dict[str, Any]:
+        """decide() for the async runner; agents that wait on the network override this."""
+        return self.decide(game_state, available_actions)
+    
+    def _cached_decision(self, game_state: Dict, actions: List[str]) -> Tuple[Optional[str], Optional[Dict]]:
+        """(cache key, cached decision) for this situation; the key is None when nothing is cached."""
+        if self.cache is None:
+            return None, None
+        key = self.cache.key(self.model, self.temperature, game_state, self.name, actions)
+        decision = self.cache.get(key) if key is not None else None
+        if decision is not None:
+            params = dict(decision.get("params", {}))
+            if "player_name" in params:
+                params["player_name"] = self.name
+            decision = {"action": decision["action"], "params": params}
+            if not self._bid_still_valid(game_state, decision):
+                self.cache.reject()
+                decision = None
+        return key, decision
+    
+    def _bid_still_valid(self, game_state: Dict, decision: Dict[str, Any]) -> bool:
+        """False for a cached bid the live auction or our cash would refuse.
+
+        The cache key only holds bands of the bid and cash, so the exact amount
+        of a cached place_bid has to be checked again.
+        """
+        if decision["action"] != "place_bid":
+            return True
+        amount = decision["params"].get("amount")
+        auction = game_state.get("auction")
+        return (isinstance(amount, int) and auction is not None
+                and auction["current_bid"] < amount <= game_state["players"][self.name]["money"])
+    
+    def _cache_decision(self, key: Optional[str], decision: Dict[str, Any], actions: List[str]):
+        """Keep a model decision for next time if it names one of the legal actions."""
+        action = str(decision.get("action", "")).split("(")[0].strip().replace(" ", "_")
+        if key is not None and action in {a.split(" ")[0] for a in actions}:
+            self.cache.put(key, decision)
     
     def _parse_response(self, response: str) -> Dict[str, Any]:
         """Parse LLM response to extract JSON action."""
@@ -115,10 +178,19 @@ class BaseAgent(ABC):
 class OpenAIAgent(BaseAgent):
     """Agent powered by OpenAI GPT models."""
     
-    def __init__(self, name: str, model: str = "gpt-4o-mini", api_key: str = None):
+    provider = "OpenAI"
+    
+    def __init__(self, name: str, model: str = "gpt-4o-mini", api_key: str = None, verbose: bool = True,
+                 temperature: float = 0.7, cache: Optional[DecisionCache] = None, base_url: str = None,
+                 deadline: Optional[float] = None, backend: Optional[ModelBackend] = None):
         super().__init__(name)
         self.model = model
-        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        self.verbose = verbose
+        self.temperature = temperature
+        self.cache = cache
+        # Seconds per decision, retries included; None uses the backend's deadline
+        self.deadline = deadline
+        self.backend = backend or backend_for(base_url, api_key or os.getenv("OPENAI_API_KEY"))
     
     def decide(self, game_state: Dict, available_actions: Dict) -> Dict[str, Any]:
         actions_list = available_actions.get("actions", [])
@@ -132,27 +204,41 @@ class OpenAIAgent(BaseAgent):
         if actions_list == ["roll_dice_and_move"]:
             return {"action": "roll_dice_and_move", "params": {}}
         
+        key, cached = self._cached_decision(game_state, actions_list)
+        if cached is not None:
+            return cached
+        
         prompt = get_action_prompt(game_state, self.name, actions_list)
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            content = self.backend.complete(
+                self.model,
+                [
                     {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7,
-                max_tokens=200
+                temperature=self.temperature,
+                max_tokens=200,
+                deadline=self.deadline
             )
             
-            content = response.choices[0].message.content
-            print(f"  [{self.name}] thinking: {content[:100]}...")
+            if self.verbose:
+                print(f"  [{self.name}] thinking: {content[:100]}...")
             
             decision = self._parse_response(content)
+            self._cache_decision(key, decision, actions_list)
             return decision
             
+        except CassetteMismatch:
+            # A replay that diverged from its recording must stop the game, not fall back
+            raise
+        except BackendUnavailable as e:
+            # Failing fast while the backend is down; no point waiting on it
+            if self.verbose:
+                print(f"  [{self.name}] {e}, using fallback")
+            return self._fallback_decision(game_state, actions_list)
         except Exception as e:
-            print(f"  [{self.name}] OpenAI error: {e}")
+            print(f"  [{self.name}] {self.provider} error: {e}")
             # Fallback to simple logic
             return self._fallback_decision(game_state, actions_list)
     
@@ -162,7 +248,8 @@ class OpenAIAgent(BaseAgent):
         
         if "roll_dice_and_move" in actions:
             return {"action": "roll_dice_and_move", "params": {}}
-        if "buy_property" in actions and player.get("money", 0) > 200:
+        price = TILE_CATALOG[player.get("position", 0)].price
+        if "buy_property" in actions and player.get("money", 0) > 200 and player.get("money", 0) >= price:
             return {"action": "buy_property", "params": {}}
         if "decline_purchase" in actions:
             return {"action": "decline_purchase", "params": {}}
@@ -170,26 +257,53 @@ class OpenAIAgent(BaseAgent):
             return {"action": "pay_jail_bail", "params": {}}
         if "roll_for_doubles" in actions:
             return {"action": "roll_for_doubles", "params": {}}
+        if "pass_auction" in actions:
+            return {"action": "pass_auction", "params": {"player_name": self.name}}
         if "end_turn" in actions:
             return {"action": "end_turn", "params": {}}
         
         return {"action": actions[0] if actions else "end_turn", "params": {}}
 
 
-class OllamaAgent(BaseAgent):
-    """Agent powered by Ollama local models (Llama 3.1, etc.)."""
+class OllamaAgent(OpenAIAgent):
+    """Agent powered by Ollama local models (Llama 3.1, etc.), through Ollama's OpenAI-compatible endpoint."""
     
-    def __init__(self, name: str, model: str = "llama3.1", host: str = "http://localhost:11434"):
-        super().__init__(name)
-        self.model = model
+    provider = "Ollama"
+    
+    def __init__(self, name: str, model: str = "llama3.1", host: str = "http://localhost:11434",
+                 verbose: bool = True, temperature: float = 0.7, cache: Optional[DecisionCache] = None,
+                 deadline: Optional[float] = None, backend: Optional[ModelBackend] = None):
+        # Ollama doesn't need a real key
+        super().__init__(name, model=model, api_key="ollama", verbose=verbose, temperature=temperature,
+                         cache=cache, base_url=f"{host}/v1", deadline=deadline, backend=backend)
         self.host = host
-        # Use OpenAI client with Ollama endpoint
-        self.client = OpenAI(
-            base_url=f"{host}/v1",
-            api_key="ollama"  # Ollama doesn't need real key
-        )
+
+
+class AsyncOpenAIAgent(OpenAIAgent):
+    """OpenAI agent for the async runner: awaits the model instead of blocking on it.
+
+    Agents sharing one limiter semaphore never have more than its value of
+    model requests in flight between them.
+    """
+    
+    def __init__(self, name: str, model: str = "gpt-4o-mini", api_key: str = None, base_url: str = None,
+                 limiter: Optional[asyncio.Semaphore] = None, verbose: bool = True,
+                 temperature: float = 0.7, cache: Optional[DecisionCache] = None,
+                 deadline: Optional[float] = None, backend: Optional[ModelBackend] = None):
+        BaseAgent.__init__(self, name)
+        self.model = model
+        self.temperature = temperature
+        self.cache = cache
+        self.deadline = deadline
+        self.backend = backend or backend_for(base_url, api_key or os.getenv("OPENAI_API_KEY"))
+        self.limiter = limiter
+        self.verbose = verbose
+        self.requests = 0
     
     def decide(self, game_state: Dict, available_actions: Dict) -> Dict[str, Any]:
+        raise TypeError(f"{type(self).__name__} is driven by the async runner; await adecide() instead")
+    
+    async def adecide(self, game_state: Dict, available_actions: Dict) -> Dict[str, Any]:
         actions_list = available_actions.get("actions", [])
         
         if not actions_list:
@@ -201,47 +315,57 @@ class OllamaAgent(BaseAgent):
         if actions_list == ["roll_dice_and_move"]:
             return {"action": "roll_dice_and_move", "params": {}}
         
+        key, cached = self._cached_decision(game_state, actions_list)
+        if cached is not None:
+            return cached
+        
         prompt = get_action_prompt(game_state, self.name, actions_list)
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=200
-            )
+            async with self.limiter or contextlib.nullcontext():
+                self.requests += 1
+                content = await self.backend.acomplete(
+                    self.model,
+                    [
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=self.temperature,
+                    max_tokens=200,
+                    deadline=self.deadline
+                )
             
-            content = response.choices[0].message.content
-            print(f"  [{self.name}] thinking: {content[:100]}...")
+            if self.verbose:
+                print(f"  [{self.name}] thinking: {content[:100]}...")
             
             decision = self._parse_response(content)
+            self._cache_decision(key, decision, actions_list)
             return decision
             
+        except CassetteMismatch:
+            raise
+        except BackendUnavailable as e:
+            if self.verbose:
+                print(f"  [{self.name}] {e}, using fallback")
+            return self._fallback_decision(game_state, actions_list)
         except Exception as e:
-            print(f"  [{self.name}] Ollama error: {e}")
+            print(f"  [{self.name}] {self.provider} error: {e}")
             return self._fallback_decision(game_state, actions_list)
+
+
+class AsyncOllamaAgent(AsyncOpenAIAgent):
+    """Ollama agent for the async runner, through Ollama's OpenAI-compatible endpoint."""
     
-    def _fallback_decision(self, game_state: Dict, actions: List[str]) -> Dict[str, Any]:
-        """Simple fallback logic if API fails."""
-        player = game_state["players"].get(self.name, {})
-        
-        if "roll_dice_and_move" in actions:
-            return {"action": "roll_dice_and_move", "params": {}}
-        if "buy_property" in actions and player.get("money", 0) > 200:
-            return {"action": "buy_property", "params": {}}
-        if "decline_purchase" in actions:
-            return {"action": "decline_purchase", "params": {}}
-        if "pay_jail_bail" in actions and player.get("money", 0) > 100:
-            return {"action": "pay_jail_bail", "params": {}}
-        if "roll_for_doubles" in actions:
-            return {"action": "roll_for_doubles", "params": {}}
-        if "end_turn" in actions:
-            return {"action": "end_turn", "params": {}}
-        
-        return {"action": actions[0] if actions else "end_turn", "params": {}}
+    provider = "Ollama"
+    
+    def __init__(self, name: str, model: str = "llama3.1", host: str = "http://localhost:11434",
+                 limiter: Optional[asyncio.Semaphore] = None, verbose: bool = True,
+                 temperature: float = 0.7, cache: Optional[DecisionCache] = None,
+                 deadline: Optional[float] = None, backend: Optional[ModelBackend] = None):
+        super().__init__(name, model=model, api_key="ollama", base_url=f"{host}/v1",
+                         limiter=limiter, verbose=verbose, temperature=temperature, cache=cache,
+                         deadline=deadline, backend=backend)
+        self.host = host
 
 
 class HumanAgent(BaseAgent):
@@ -283,6 +407,302 @@ class HumanAgent(BaseAgent):
         return {"action": action.split()[0], "params": params}
 
 
+# ============================================================================
+# MONTE CARLO TREE SEARCH
+# ============================================================================
+
+# A move is (action, ((param, value), ...)) so it can key a dict and cross processes
+Move = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+def legal_moves(game: MonopolyGame, name: str, cash_floor: int = 150) -> List[Move]:
+    """Moves open to `name` right now, with bids at a few fixed levels.
+
+    Mortgages are only offered below cash_floor and unmortgaging only above it,
+    which keeps the branching factor of a turn small.
+    """
+    p = game.players[name]
+    if game.phase == GamePhase.AUCTION:
+        auction = game.auction
+        if name in auction.passed_players:
+            return []
+        moves = [("pass_auction", (("player_name", name),))]
+        price = TILE_CATALOG[auction.property_pos].price
+        for amount in sorted({auction.current_bid + 10, price // 2, price, price * 5 // 4}):
+            if auction.current_bid < amount <= p.money:
+                moves.append(("place_bid", (("player_name", name), ("amount", amount))))
+        return moves
+    if game.phase == GamePhase.GAME_OVER or game.current_player.name != name:
+        return []
+
+    moves = []
+    if game.phase == GamePhase.WAITING_FOR_ROLL:
+        moves.append(("roll_dice_and_move", ()))
+    elif game.phase == GamePhase.IN_JAIL:
+        moves.append(("roll_for_doubles", ()))
+        if p.money >= 50:
+            moves.append(("pay_jail_bail", ()))
+        if p.jail_cards > 0:
+            moves.append(("use_jail_card", ()))
+    elif game.phase == GamePhase.WAITING_FOR_BUY_DECISION:
+        if p.money >= game.current_tile.price:
+            moves.append(("buy_property", ()))
+        moves.append(("decline_purchase", ()))
+    elif game.phase == GamePhase.TURN_COMPLETE:
+        moves.append(("end_turn", ()))
+
+    for pos in game._get_buildable_properties(p):
+        moves.append(("build_house", (("property_position", pos),)))
+    for pos in p.properties:
+        info = TILE_CATALOG[pos]
+        if game._mortgaged[pos]:
+            if p.money >= int(info.mortgage_value * 1.1) + cash_floor:
+                moves.append(("unmortgage_property", (("property_position", pos),)))
+        elif p.money < cash_floor and not game._houses[pos]:
+            moves.append(("mortgage_property", (("property_position", pos),)))
+    return moves
+
+
+def _net_worth(game: MonopolyGame, p) -> int:
+    worth = p.money
+    for pos in p.properties:
+        info = TILE_CATALOG[pos]
+        worth += info.mortgage_value if game._mortgaged[pos] else info.price + game._houses[pos] * info.house_cost
+    return worth
+
+
+def _evaluate(game: MonopolyGame, name: str) -> float:
+    """Reward in [0, 1]: 1 for a win, 0 for bankruptcy, otherwise share of net worth."""
+    if game.players[name].bankrupt:
+        return 0.0
+    active = [p for p in game.players.values() if not p.bankrupt]
+    if len(active) == 1:
+        return 1.0
+    worths = [max(0, _net_worth(game, p)) for p in active]
+    total = sum(worths)
+    return max(0, _net_worth(game, game.players[name])) / total if total else 1.0 / len(active)
+
+
+def _rollout(game: MonopolyGame, name: str, turns: int) -> float:
+    if game.phase == GamePhase.AUCTION:
+        for player in game.player_order:
+            if game.phase == GamePhase.AUCTION and player not in game.auction.passed_players:
+                game.pass_auction(player)
+    play_policy(game, max_turns=game.turn_number + turns)
+    return _evaluate(game, name)
+
+
+class _Node:
+    __slots__ = ("visits", "value", "children")
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0
+        self.children: Dict[Move, "_Node"] = {}
+
+
+def _search(root: _Node, game: MonopolyGame, name: str, rng: random.Random, deadline: float,
+            max_iterations: int, exploration: float, rollout_turns: int, cash_floor: int) -> int:
+    """Open-loop UCT over `name`'s moves this turn; returns iterations run.
+
+    Each iteration plays a reseeded fork with the unseen deck order shuffled,
+    so the search never peeks at the real dice or cards.
+    """
+    iterations = 0
+    now = started = time.perf_counter()
+    # Stop early rather than start an iteration that would likely overrun the deadline
+    while iterations < max_iterations and now + (now - started) / max(iterations, 1) < deadline:
+        sim = game.fork(seed=rng.getrandbits(63), capture_events=False, record_actions=False)
+        sim.rng.shuffle(sim.chance_deck)
+        sim.rng.shuffle(sim.community_deck)
+
+        node, path = root, [root]
+        while True:
+            moves = legal_moves(sim, name, cash_floor)
+            if not moves:
+                break
+            untried = [m for m in moves if m not in node.children]
+            if untried:
+                move = rng.choice(untried)
+                node.children[move] = child = _Node()
+            else:
+                log_visits = math.log(node.visits)
+                move = max(moves, key=lambda m: node.children[m].value / node.children[m].visits
+                           + exploration * math.sqrt(log_visits / node.children[m].visits))
+                child = node.children[move]
+            sim.execute(move[0], dict(move[1]))
+            node = child
+            path.append(node)
+            if untried:
+                break
+
+        reward = _rollout(sim, name, rollout_turns)
+        # Break the game <-> view map cycles so the fork is freed now, not by a GC pause
+        sim.players = sim.tiles = None
+        for node in path:
+            node.visits += 1
+            node.value += reward
+        iterations += 1
+        now = time.perf_counter()
+    return iterations
+
+
+def _search_worker(game: MonopolyGame, name: str, seed: int, budget_ms: float, max_iterations: int,
+                   exploration: float, rollout_turns: int, cash_floor: int) -> Tuple[int, Dict[Move, tuple]]:
+    """Independent search in a pool process; returns root move statistics."""
+    root = _Node()
+    iterations = _search(root, game, name, random.Random(seed), time.perf_counter() + budget_ms / 1000,
+                         max_iterations, exploration, rollout_turns, cash_floor)
+    return iterations, {move: (child.visits, child.value) for move, child in root.children.items()}
+
+
+class MCTSAgent(BaseAgent):
+    """Local search agent: rollouts from the live game within a time budget, no network.
+
+    With workers > 1 the root is searched in parallel by a process pool and the
+    root statistics are merged. The tree is kept between decisions in the same
+    turn and re-rooted at the move that was played.
+    """
+    reads_state = False
+
+    def __init__(self, name: str, budget_ms: float = 200, max_iterations: int = 100000,
+                 workers: int = 1, rollout_turns: int = 30, exploration: float = 0.7,
+                 cash_floor: int = 150, seed: Optional[int] = None):
+        super().__init__(name)
+        self.budget_ms = budget_ms
+        self.max_iterations = max_iterations
+        self.workers = workers
+        self.rollout_turns = rollout_turns
+        self.exploration = exploration
+        self.cash_floor = cash_floor
+        self.rng = random.Random(seed)
+        self.last_search: Dict[str, Any] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # (game, turn number, action log length, move) the kept tree expects next
+        self._tree: Optional[_Node] = None
+        self._expected: Optional[tuple] = None
+
+    def decide(self, game_state: Dict, available_actions: Dict) -> Dict[str, Any]:
+        game = self.game
+        if game is None:
+            raise ValueError("MCTSAgent needs attach(game) before decide()")
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000
+
+        moves = legal_moves(game, self.name, self.cash_floor)
+        if len(moves) <= 1:
+            self._tree = self._expected = None
+            move = moves[0] if moves else ("end_turn", ())
+            return {"action": move[0], "params": dict(move[1])}
+
+        root = self._reused_root(game)
+        reused = root.visits
+        futures = []
+        if self.workers > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers - 1)
+            snapshot = game.fork(capture_events=False, record_actions=False)
+            worker_budget = self.budget_ms * 0.8
+            futures = [self._pool.submit(_search_worker, snapshot, self.name, self.rng.getrandbits(63),
+                                         worker_budget, self.max_iterations, self.exploration,
+                                         self.rollout_turns, self.cash_floor)
+                       for _ in range(self.workers - 1)]
+
+        iterations = _search(root, game, self.name, self.rng, deadline, self.max_iterations,
+                             self.exploration, self.rollout_turns, self.cash_floor)
+        done, late = wait(futures, timeout=max(0.0, deadline - time.perf_counter()))
+        for future in late:
+            future.cancel()
+        for future in done:
+            worker_iterations, stats = future.result()
+            iterations += worker_iterations
+            root.visits += worker_iterations
+            for move, (visits, value) in stats.items():
+                child = root.children.setdefault(move, _Node())
+                child.visits += visits
+                child.value += value
+
+        move = max((m for m in moves if m in root.children), key=lambda m: root.children[m].visits,
+                   default=moves[0])
+        if game.action_log is not None:
+            self._tree = root.children.get(move)
+            self._expected = (id(game), game.turn_number, len(game.action_log) + 1,
+                              (move[0], *(value for _, value in move[1])))
+        self.last_search = {
+            "iterations": iterations, "reused_visits": reused,
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+            "move_visits": {m[0] + "".join(f" {v}" for _, v in m[1]): c.visits for m, c in root.children.items()},
+        }
+        return {"action": move[0], "params": dict(move[1])}
+
+    def _reused_root(self, game: MonopolyGame) -> _Node:
+        """The kept subtree if the game only advanced by the move we chose, else a new root."""
+        tree, expected = self._tree, self._expected
+        self._tree = self._expected = None
+        if tree is not None and game.action_log is not None:
+            game_id, turn, log_length, entry = expected
+            if (game_id == id(game) and turn == game.turn_number and log_length == len(game.action_log)
+                    and game.action_log[-1] == entry):
+                return tree
+        return _Node()
+
+    def close(self):
+        """Shut down the rollout process pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+# ============================================================================
+# BASELINES
+# ============================================================================
+
+class PolicyAgent(BaseAgent):
+    """The batch engine's fixed policy: buy when affordable, never bid, card > bail > roll in jail."""
+    reads_state = False
+
+    def __init__(self, name: str, buy_reserve: int = 0, bail_threshold: int = 100):
+        super().__init__(name)
+        self.buy_reserve = buy_reserve
+        self.bail_threshold = bail_threshold
+
+    def decide(self, game_state: Dict, available_actions: Dict) -> Dict[str, Any]:
+        game = self.game
+        p = game.players[self.name]
+        if game.phase == GamePhase.AUCTION:
+            return {"action": "pass_auction", "params": {"player_name": self.name}}
+        if game.phase == GamePhase.WAITING_FOR_ROLL:
+            action = "roll_dice_and_move"
+        elif game.phase == GamePhase.IN_JAIL:
+            if p.jail_cards > 0:
+                action = "use_jail_card"
+            elif p.money > self.bail_threshold:
+                action = "pay_jail_bail"
+            else:
+                action = "roll_for_doubles"
+        elif game.phase == GamePhase.WAITING_FOR_BUY_DECISION:
+            affordable = p.money >= game.current_tile.price + self.buy_reserve
+            action = "buy_property" if affordable else "decline_purchase"
+        else:
+            action = "end_turn"
+        return {"action": action, "params": {}}
+
+
+class RandomAgent(BaseAgent):
+    """Uniformly random legal move; the floor any strategy should beat."""
+    reads_state = False
+
+    def __init__(self, name: str, seed: Optional[int] = None, cash_floor: int = 150):
+        super().__init__(name)
+        self.rng = random.Random(seed)
+        self.cash_floor = cash_floor
+
+    def decide(self, game_state: Dict, available_actions: Dict) -> Dict[str, Any]:
+        moves = legal_moves(self.game, self.name, self.cash_floor)
+        move = self.rng.choice(moves) if moves else ("end_turn", ())
+        return {"action": move[0], "params": dict(move[1])}
+
+
 def create_agent(name: str, agent_type: str, **kwargs) -> BaseAgent:
     """Factory function to create agents."""
     if agent_type == "openai":
@@ -291,5 +711,11 @@ def create_agent(name: str, agent_type: str, **kwargs) -> BaseAgent:
         return OllamaAgent(name, **kwargs)
     elif agent_type == "human":
         return HumanAgent(name)
+    elif agent_type == "mcts":
+        return MCTSAgent(name, **kwargs)
+    elif agent_type == "policy":
+        return PolicyAgent(name, **kwargs)
+    elif agent_type == "random":
+        return RandomAgent(name, **kwargs)
     else:
         raise ValueError(f"Unknown agent type: {agent_type}")
\ No newline at end of file
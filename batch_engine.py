@@ -0,0 +1,453 @@
+"""
+Batch Game Engine - Advances thousands of Monopoly games in lockstep with NumPy
+
+Every game is played by the same fixed policy (buy when affordable, nobody bids
+in auctions, card > bail > roll in jail, no building), so a whole population of
+games can be stepped with vectorized array operations. Randomness comes from
+counter-based per-game streams, which makes each game reproducible on its own:
+``play_reference_game(n, seed)`` replays game ``seed`` through ``MonopolyGame``
+and ends in exactly the same state as the batch.
+"""
+
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from game_engine import (
+    MonopolyGame, GamePhase, TileType, TILE_DATA, CHANCE_CARDS, COMMUNITY_CARDS
+)
+
+
+# Phase codes used by the batch arrays
+ROLL, BUY, JAIL, TURN_COMPLETE, GAME_OVER = range(5)
+
+# Tile kinds
+_NOTHING, _GO_TO_JAIL, _TAX, _CHANCE, _CHEST, _PROPERTY, _RAILROAD, _UTILITY = range(8)
+_KIND_OF_TYPE = {
+    TileType.GO: _NOTHING, TileType.JAIL: _NOTHING, TileType.FREE_PARKING: _NOTHING,
+    TileType.GO_TO_JAIL: _GO_TO_JAIL, TileType.TAX: _TAX,
+    TileType.CHANCE: _CHANCE, TileType.COMMUNITY_CHEST: _CHEST,
+    TileType.PROPERTY: _PROPERTY, TileType.RAILROAD: _RAILROAD, TileType.UTILITY: _UTILITY,
+}
+
+TILE_KIND = np.array([_KIND_OF_TYPE[TILE_DATA[p]["type"]] for p in range(40)], dtype=np.int8)
+PRICE = np.array([TILE_DATA[p].get("price", 0) for p in range(40)], dtype=np.int32)
+TAX = np.array([TILE_DATA[p].get("amount", 0) for p in range(40)], dtype=np.int32)
+RENT = np.array([TILE_DATA[p].get("rent", [0] * 6) for p in range(40)], dtype=np.int32)
+RAILROADS = np.flatnonzero(TILE_KIND == _RAILROAD)
+UTILITIES = np.flatnonzero(TILE_KIND == _UTILITY)
+RAILROAD_RENT = np.array([0, 25, 50, 100, 200], dtype=np.int32)
+
+# Card effects
+_MONEY, _MOVE, _MOVE_BACK, _JAIL_CARD, _GO_TO_JAIL_CARD = range(5)
+_CARD_KINDS = {"money": _MONEY, "move": _MOVE, "move_back": _MOVE_BACK,
+               "jail_card": _JAIL_CARD, "go_to_jail": _GO_TO_JAIL_CARD}
+
+
+def _card_table(cards: List[Dict]) -> tuple:
+    kinds = np.array([_CARD_KINDS[c["type"]] for c in cards], dtype=np.int8)
+    values = np.array([c.get("amount", c.get("to", c.get("spaces", 0))) for c in cards], dtype=np.int32)
+    return kinds, values
+
+
+CHANCE_KIND, CHANCE_VALUE = _card_table(CHANCE_CARDS)
+CHEST_KIND, CHEST_VALUE = _card_table(COMMUNITY_CARDS)
+
+
+# ============================================================================
+# COUNTER-BASED RANDOM STREAMS
+# ============================================================================
+
+DICE_STREAM = 1
+CARD_STREAM = 2
+_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer, applied elementwise to a uint64 array."""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def stream_keys(seeds, stream: int) -> np.ndarray:
+    """Key of the given stream for each seed."""
+    seeds = np.atleast_1d(np.asarray(seeds, dtype=np.uint64))
+    return _mix64(_mix64(seeds) + np.uint64((stream * int(_GAMMA)) & _MASK64))
+
+
+def stream_values(keys: np.ndarray, counters: np.ndarray) -> np.ndarray:
+    """The counters-th 64-bit value of each keyed stream."""
+    return _mix64(keys + (counters + np.uint64(1)) * _GAMMA)
+
+
+def _dice_from(values: np.ndarray) -> np.ndarray:
+    return (values % np.uint64(6)).astype(np.int8) + 1
+
+
+def _shuffle_order(values: np.ndarray) -> np.ndarray:
+    return np.argsort(values, axis=-1, kind="stable")
+
+
+# ============================================================================
+# BATCH ENGINE
+# ============================================================================
+
+class BatchGame:
+    """N independent games of the same player count, stored as arrays."""
+
+    def __init__(self, num_games: int, num_players: int = 2, seed: int = 0,
+                 max_turns: int = 100, buy_reserve: int = 0, bail_threshold: int = 100):
+        if not 2 <= num_players <= 6:
+            raise ValueError("num_players must be between 2 and 6")
+        if bail_threshold < 50:
+            raise ValueError("bail_threshold must be at least the $50 bail")
+
+        n, p = num_games, num_players
+        self.num_games = n
+        self.num_players = p
+        self.max_turns = max_turns
+        self.buy_reserve = buy_reserve
+        self.bail_threshold = bail_threshold
+        self.seeds = np.arange(seed, seed + n, dtype=np.uint64)
+
+        self.position = np.zeros((n, p), dtype=np.int8)
+        self.money = np.full((n, p), 1500, dtype=np.int32)
+        self.in_jail = np.zeros((n, p), dtype=bool)
+        self.jail_turns = np.zeros((n, p), dtype=np.int8)
+        self.jail_cards = np.zeros((n, p), dtype=np.int8)
+        self.doubles_count = np.zeros((n, p), dtype=np.int8)
+        self.bankrupt = np.zeros((n, p), dtype=bool)
+
+        self.owner = np.full((n, 40), -1, dtype=np.int8)
+        self.houses = np.zeros((n, 40), dtype=np.int8)
+        self.mortgaged = np.zeros((n, 40), dtype=bool)
+
+        self.current = np.zeros(n, dtype=np.int8)
+        self.phase = np.full(n, ROLL, dtype=np.int8)
+        self.turn = np.zeros(n, dtype=np.int32)
+        self.dice_total = np.zeros(n, dtype=np.int8)
+
+        self._dice_keys = stream_keys(self.seeds, DICE_STREAM)
+        self._card_keys = stream_keys(self.seeds, CARD_STREAM)
+        self._dice_ctr = np.zeros(n, dtype=np.uint64)
+        self._card_ctr = np.zeros(n, dtype=np.uint64)
+
+        # Decks are shuffled chance first, then community chest, like MonopolyGame.__init__
+        all_games = np.arange(n)
+        self.chance_order = self._shuffle(all_games, len(CHANCE_CARDS)).astype(np.int8)
+        self.chest_order = self._shuffle(all_games, len(COMMUNITY_CARDS)).astype(np.int8)
+        self.chance_cursor = np.zeros(n, dtype=np.int8)
+        self.chest_cursor = np.zeros(n, dtype=np.int8)
+
+    # ------------------------------------------------------------------ random
+
+    def _roll(self, g: np.ndarray) -> tuple:
+        ctr = self._dice_ctr[g]
+        d1 = _dice_from(stream_values(self._dice_keys[g], ctr))
+        d2 = _dice_from(stream_values(self._dice_keys[g], ctr + np.uint64(1)))
+        self._dice_ctr[g] = ctr + np.uint64(2)
+        self.dice_total[g] = d1 + d2
+        return d1, d2
+
+    def _shuffle(self, g: np.ndarray, size: int) -> np.ndarray:
+        ctr = self._card_ctr[g][:, None] + np.arange(size, dtype=np.uint64)
+        self._card_ctr[g] += np.uint64(size)
+        return _shuffle_order(stream_values(self._card_keys[g][:, None], ctr))
+
+    # ------------------------------------------------------------------ stepping
+
+    def active(self) -> np.ndarray:
+        return (self.phase != GAME_OVER) & (self.turn < self.max_turns)
+
+    def step(self) -> int:
+        """Advance every unfinished game through one jail/roll/buy/end-turn pass."""
+        live = self.active()
+        self._jail_action(np.flatnonzero(live & (self.phase == JAIL)))
+        self._roll_and_move(np.flatnonzero(live & (self.phase == ROLL)))
+        self._buy_decision(np.flatnonzero(live & (self.phase == BUY)))
+        self._end_turn(np.flatnonzero(live & (self.phase == TURN_COMPLETE)))
+        return int(live.sum())
+
+    def run(self) -> Dict[str, Any]:
+        while self.step():
+            pass
+        return self.results()
+
+    def _send_to_jail(self, g: np.ndarray, c: np.ndarray):
+        self.position[g, c] = 10
+        self.in_jail[g, c] = True
+        self.jail_turns[g, c] = 0
+        self.doubles_count[g, c] = 0
+        self.phase[g] = TURN_COMPLETE
+
+    def _release(self, g: np.ndarray, c: np.ndarray):
+        self.in_jail[g, c] = False
+        self.jail_turns[g, c] = 0
+        self.phase[g] = ROLL
+
+    def _jail_action(self, g: np.ndarray):
+        if not g.size:
+            return
+        c = self.current[g]
+
+        card = self.jail_cards[g, c] > 0
+        self.jail_cards[g[card], c[card]] -= 1
+        self._release(g[card], c[card])
+
+        bail = ~card & (self.money[g, c] > self.bail_threshold)
+        self.money[g[bail], c[bail]] -= 50
+        self._release(g[bail], c[bail])
+
+        roll = ~card & ~bail
+        g, c = g[roll], c[roll]
+        d1, d2 = self._roll(g)
+        escaped = d1 == d2
+        self._release(g[escaped], c[escaped])
+
+        g, c = g[~escaped], c[~escaped]
+        self.jail_turns[g, c] += 1
+        forced = self.jail_turns[g, c] >= 3
+        self.money[g[forced], c[forced]] -= 50
+        self._release(g[forced], c[forced])
+        self.phase[g[~forced]] = TURN_COMPLETE
+
+    def _roll_and_move(self, g: np.ndarray):
+        if not g.size:
+            return
+        c = self.current[g]
+        d1, d2 = self._roll(g)
+        doubles = d1 == d2
+
+        count = np.where(doubles, self.doubles_count[g, c] + 1, 0)
+        self.doubles_count[g, c] = count
+        third = count >= 3
+        self._send_to_jail(g[third], c[third])
+
+        g, c, doubles = g[~third], c[~third], doubles[~third]
+        old = self.position[g, c]
+        new = (old + self.dice_total[g]) % 40
+        self.money[g, c] += np.where((new < old) & (new != 10), 200, 0).astype(np.int32)
+        self.position[g, c] = new
+        self._land(g, c)
+
+        again = doubles & (self.phase[g] == TURN_COMPLETE)
+        self.phase[g[again]] = ROLL
+
+    def _land(self, g: np.ndarray, c: np.ndarray):
+        # Cards can move the player onto another tile, so resolve until nobody moved
+        while g.size:
+            self.phase[g] = TURN_COMPLETE
+            kind = TILE_KIND[self.position[g, c]]
+
+            jail = kind == _GO_TO_JAIL
+            self._send_to_jail(g[jail], c[jail])
+
+            tax = kind == _TAX
+            self.money[g[tax], c[tax]] -= TAX[self.position[g[tax], c[tax]]]
+
+            ownable = kind >= _PROPERTY
+            self._land_ownable(g[ownable], c[ownable])
+
+            chance, chest = kind == _CHANCE, kind == _CHEST
+            mg1, mc1 = self._draw_card(g[chance], c[chance], self.chance_order, self.chance_cursor,
+                                       CHANCE_KIND, CHANCE_VALUE)
+            mg2, mc2 = self._draw_card(g[chest], c[chest], self.chest_order, self.chest_cursor,
+                                       CHEST_KIND, CHEST_VALUE)
+            g, c = np.concatenate([mg1, mg2]), np.concatenate([mc1, mc2])
+
+    def _land_ownable(self, g: np.ndarray, c: np.ndarray):
+        pos = self.position[g, c]
+        owner = self.owner[g, pos]
+
+        self.phase[g[owner < 0]] = BUY
+
+        pays = (owner >= 0) & (owner != c)
+        g, c, pos, owner = g[pays], c[pays], pos[pays], owner[pays]
+        kind = TILE_KIND[pos]
+        owners = self.owner[g]
+        railroads = (owners[:, RAILROADS] == owner[:, None]).sum(axis=1)
+        utilities = (owners[:, UTILITIES] == owner[:, None]).sum(axis=1)
+        rent = np.select(
+            [kind == _PROPERTY, kind == _RAILROAD],
+            [RENT[pos, np.minimum(self.houses[g, pos], 5)], RAILROAD_RENT[railroads]],
+            np.where(utilities == 2, 10, 4) * self.dice_total[g],
+        )
+        rent = np.where(self.mortgaged[g, pos], 0, rent).astype(np.int32)
+        self.money[g, c] -= rent
+        self.money[g, owner] += rent
+
+    def _draw_card(self, g: np.ndarray, c: np.ndarray, order: np.ndarray, cursor: np.ndarray,
+                   kinds: np.ndarray, values: np.ndarray) -> tuple:
+        if not g.size:
+            return g, c
+        cur = cursor[g]
+        card = np.empty(g.size, dtype=np.int8)
+        fresh = cur >= order.shape[1]
+        card[~fresh] = order[g[~fresh], cur[~fresh]]
+        cursor[g[~fresh]] += 1
+        # An exhausted deck draws the top card of a freshly shuffled copy every time
+        if fresh.any():
+            card[fresh] = self._shuffle(g[fresh], order.shape[1])[:, 0]
+
+        kind, value = kinds[card], values[card]
+
+        money = kind == _MONEY
+        self.money[g[money], c[money]] += value[money]
+
+        jail_card = kind == _JAIL_CARD
+        self.jail_cards[g[jail_card], c[jail_card]] += 1
+
+        jail = kind == _GO_TO_JAIL_CARD
+        self._send_to_jail(g[jail], c[jail])
+
+        move = kind == _MOVE
+        old = self.position[g[move], c[move]]
+        self.money[g[move], c[move]] += np.where(value[move] < old, 200, 0).astype(np.int32)
+        self.position[g[move], c[move]] = value[move]
+
+        back = kind == _MOVE_BACK
+        self.position[g[back], c[back]] = (self.position[g[back], c[back]] - value[back]) % 40
+
+        moved = move | back
+        return g[moved], c[moved]
+
+    def _buy_decision(self, g: np.ndarray):
+        if not g.size:
+            return
+        c = self.current[g]
+        pos = self.position[g, c]
+        # Declined properties go to an auction in which everybody passes
+        self.phase[g] = TURN_COMPLETE
+        buys = self.money[g, c] >= PRICE[pos] + self.buy_reserve
+        g, c, pos = g[buys], c[buys], pos[buys]
+        self.money[g, c] -= PRICE[pos]
+        self.owner[g, pos] = c
+
+    def _end_turn(self, g: np.ndarray):
+        if not g.size:
+            return
+        c = self.current[g]
+        self.doubles_count[g, c] = 0
+        self.bankrupt[g, c] |= self.money[g, c] < 0
+
+        over = (~self.bankrupt[g]).sum(axis=1) <= 1
+        self.phase[g[over]] = GAME_OVER
+        g, c = g[~over], c[~over]
+
+        nxt = (c + 1) % self.num_players
+        skip = self.bankrupt[g, nxt]
+        while skip.any():
+            nxt[skip] = (nxt[skip] + 1) % self.num_players
+            skip = self.bankrupt[g, nxt]
+
+        self.current[g] = nxt
+        self.turn[g] += 1
+        self.phase[g] = np.where(self.in_jail[g, nxt], JAIL, ROLL)
+
+    # ------------------------------------------------------------------ results
+
+    def results(self) -> Dict[str, Any]:
+        """Per-game outcome arrays; the winner is picked the same way as game_runner."""
+        props = (self.owner[:, :, None] == np.arange(self.num_players)).sum(axis=1)
+        net_worth = self.money + props * 100
+        solvent = ~self.bankrupt
+        sole = solvent.sum(axis=1) == 1
+        winner = np.where(sole, solvent.argmax(axis=1), net_worth.argmax(axis=1))
+        return {
+            "seeds": self.seeds, "winner": winner, "turns": self.turn,
+            "money": self.money, "position": self.position, "owner": self.owner,
+            "bankrupt": self.bankrupt, "game_over": self.phase == GAME_OVER,
+        }
+
+
+def run_batch(num_games: int, num_players: int = 2, seed: int = 0, **kwargs) -> Dict[str, Any]:
+    """Play num_games games to completion and return their outcome arrays."""
+    return BatchGame(num_games, num_players, seed, **kwargs).run()
+
+
+# ============================================================================
+# SCALAR REFERENCE
+# ============================================================================
+
+class StreamSeededGame(MonopolyGame):
+    """MonopolyGame drawing dice and shuffles from the batch engine's streams.
+
+    The stream counters are part of the undo state, and fork(seed=...) starts
+    the fork on the streams of the new seed. get_replay() records are rebuilt
+    with StreamSeededGame.replay().
+    """
+
+    def __init__(self, player_names: List[str], seed: int, dice_block: int = 0):
+        self._seed_streams(seed)
+        super().__init__(player_names, seed=seed, dice_block=dice_block)
+
+    def _seed_streams(self, seed: int):
+        self._dice_key = stream_keys(seed, DICE_STREAM)
+        self._card_key = stream_keys(seed, CARD_STREAM)
+        self._dice_ctr = 0
+        self._card_ctr = 0
+
+    def _roll_dice(self) -> tuple:
+        self._before_rng_draw(uses_rng=False)
+        ctr = np.arange(self._dice_ctr, self._dice_ctr + 2, dtype=np.uint64)
+        self._dice_ctr += 2
+        d1, d2 = _dice_from(stream_values(self._dice_key, ctr))
+        return int(d1), int(d2)
+
+    def _shuffled(self, size: int) -> bytearray:
+        self._before_rng_draw(uses_rng=False)
+        ctr = np.arange(self._card_ctr, self._card_ctr + size, dtype=np.uint64)
+        self._card_ctr += size
+        return bytearray(_shuffle_order(stream_values(self._card_key, ctr)).astype(np.uint8))
+
+    def _scalar_state(self) -> tuple:
+        return (*super()._scalar_state(), self._dice_ctr, self._card_ctr)
+
+    def _restore(self, token):
+        super()._restore(token)
+        self._dice_ctr, self._card_ctr = token.scalars[-2:]
+
+    def fork(self, seed: Optional[int] = None, capture_events: Optional[bool] = None,
+             record_actions: Optional[bool] = None) -> "StreamSeededGame":
+        clone = super().fork(seed, capture_events, record_actions)
+        if seed is not None:
+            clone._seed_streams(seed)
+        return clone
+
+
+def play_policy(game: MonopolyGame, max_turns: int = 100, buy_reserve: int = 0,
+                bail_threshold: int = 100) -> MonopolyGame:
+    """Play an initialized game to the end with the batch engine's fixed policy."""
+    while game.phase != GamePhase.GAME_OVER and game.turn_number < max_turns:
+        p = game.current_player
+        if game.phase == GamePhase.WAITING_FOR_ROLL:
+            game.roll_and_move()
+        elif game.phase == GamePhase.IN_JAIL:
+            if p.jail_cards > 0:
+                game.use_jail_card()
+            elif p.money > bail_threshold:
+                game.pay_bail()
+            else:
+                game.roll_for_doubles()
+        elif game.phase == GamePhase.WAITING_FOR_BUY_DECISION:
+            if p.money >= game.current_tile.price + buy_reserve:
+                game.buy_current_property()
+            else:
+                game.decline_purchase()
+                for name in game.player_order:
+                    if game.phase == GamePhase.AUCTION:
+                        game.pass_auction(name)
+        elif game.phase == GamePhase.TURN_COMPLETE:
+            game.end_turn()
+
+    return game
+
+
+def play_reference_game(num_players: int, seed: int, max_turns: int = 100,
+                        buy_reserve: int = 0, bail_threshold: int = 100) -> MonopolyGame:
+    """Play one game through MonopolyGame with the batch policy and streams."""
+    game = StreamSeededGame([f"P{i}" for i in range(num_players)], seed)
+    game.initialize()
+    return play_policy(game, max_turns, buy_reserve, bail_threshold)
@@ -0,0 +1,1506 @@
+#!/usr/bin/env python3
+"""
+Monopoly Benchmarks - Throughput and memory measurements for the engine
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tracemalloc
+from dataclasses import astuple
+
+from game_engine import MonopolyGame, GamePhase, TileType, COLOR_GROUPS, ACTIONS, merge_state
+from ai_agents import BaseAgent
+
+
+def bench_batch(args):
+    """Games per second of BatchGame vs the scalar MonopolyGame engine."""
+    from batch_engine import BatchGame, play_reference_game
+
+    start = time.perf_counter()
+    results = BatchGame(args.games, args.players, seed=args.seed, max_turns=args.max_turns).run()
+    batch_time = time.perf_counter() - start
+
+    scalar_games = max(1, args.games // 100)
+    start = time.perf_counter()
+    for i in range(scalar_games):
+        play_reference_game(args.players, args.seed + i, max_turns=args.max_turns)
+    scalar_time = time.perf_counter() - start
+
+    print(f"BatchGame:    {args.games} games in {batch_time:.2f}s → {args.games / batch_time:,.0f} games/s")
+    print(f"MonopolyGame: {scalar_games} games in {scalar_time:.2f}s → {scalar_games / scalar_time:,.0f} games/s")
+    print(f"Finished by bankruptcy: {int(results['game_over'].sum())}/{args.games}")
+
+    if args.verify:
+        names = [f"P{i}" for i in range(args.players)]
+        mismatches = 0
+        for i in range(min(args.verify, args.games)):
+            game = play_reference_game(args.players, args.seed + i, max_turns=args.max_turns)
+            owners = [names.index(t.owner) if t.owner else -1 for t in game.tiles.values()]
+            same = (
+                [game.players[n].money for n in names] == results["money"][i].tolist()
+                and [game.players[n].position for n in names] == results["position"][i].tolist()
+                and owners == results["owner"][i].tolist()
+                and game.turn_number == results["turns"][i]
+                and (game.phase == GamePhase.GAME_OVER) == results["game_over"][i]
+            )
+            mismatches += not same
+        print(f"Verified {min(args.verify, args.games)} games against MonopolyGame: {mismatches} mismatches")
+        if mismatches:
+            raise SystemExit(1)
+
+
+def bench_memory(args):
+    """Bytes held per live, freshly initialized MonopolyGame."""
+    names = [f"P{i}" for i in range(args.players)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    games = []
+    for _ in range(args.games):
+        game = MonopolyGame(list(names))
+        game.initialize()
+        games.append(game)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"{args.games} games of {args.players} players: {held / args.games:,.0f} bytes per live game")
+
+
+def _scan_buildable(game: MonopolyGame, p) -> list:
+    """Full-scan buildability check the ownership index replaced."""
+    props = p.properties
+    buildable = []
+    for pos in props:
+        tile = game.tiles[pos]
+        if tile.tile_type != TileType.PROPERTY or tile.houses >= 5 or tile.is_mortgaged:
+            continue
+        group = COLOR_GROUPS.get(tile.color_group, [])
+        if all(g in props for g in group):
+            min_houses = min(game.tiles[g].houses for g in group)
+            if tile.houses <= min_houses and p.money >= tile.house_cost:
+                buildable.append(pos)
+    return buildable
+
+
+def _scan_rent(game: MonopolyGame, tile, dice: int) -> int:
+    """Full-scan rent calculation the ownership index replaced."""
+    owner = game.players[tile.owner]
+    if tile.tile_type in (TileType.RAILROAD, TileType.UTILITY):
+        count = sum(1 for pos in owner.properties if game.tiles[pos].tile_type == tile.tile_type)
+        return tile.get_rent(dice_roll=dice, railroads_owned=count, utilities_owned=count)
+    return tile.get_rent()
+
+
+def _random_step(game: MonopolyGame, rng: random.Random):
+    """Apply one random, mostly legal action, favoring buys and builds."""
+    p = game.current_player
+    actions = [a.split()[0] for a in game.get_available_actions()["actions"]]
+    if "buy_property" in actions and rng.random() < 0.8:
+        game.buy_current_property()
+    elif "build_house" in actions and rng.random() < 0.7:
+        game.build_house(rng.choice(game._get_buildable_properties(p)))
+    elif p.properties and rng.random() < 0.05:
+        game.mortgage_property(rng.choice(p.properties))
+    elif p.properties and rng.random() < 0.05:
+        game.unmortgage_property(rng.choice(p.properties))
+    elif "place_bid" in actions and rng.random() < 0.5:
+        game.place_bid(p.name, game.auction.current_bid + rng.randint(1, 100))
+    elif "pass_auction" in actions:
+        for name in game.player_order:
+            if game.phase == GamePhase.AUCTION:
+                game.pass_auction(name)
+    else:
+        choice = rng.choice([a for a in actions if a != "build_house"] or ["end_turn"])
+        {"roll_dice_and_move": game.roll_and_move, "roll_for_doubles": game.roll_for_doubles,
+         "pay_jail_bail": game.pay_bail, "use_jail_card": game.use_jail_card,
+         "buy_property": game.buy_current_property, "decline_purchase": game.decline_purchase,
+         "end_turn": game.end_turn}[choice]()
+
+
+def bench_index(args):
+    """Cross-check the ownership index against full scans, then time get_available_actions."""
+    rng = random.Random(args.seed)
+    checks = mismatches = 0
+    for g in range(args.games):
+        game = MonopolyGame([f"P{i}" for i in range(args.players)])
+        game.initialize()
+        for _ in range(args.steps):
+            if game.phase == GamePhase.GAME_OVER:
+                break
+            _random_step(game, rng)
+            for p in game.players.values():
+                checks += 1
+                mismatches += game._get_buildable_properties(p) != _scan_buildable(game, p)
+            for tile in game.tiles.values():
+                if tile.owner is not None:
+                    checks += 1
+                    dice = rng.randint(2, 12)
+                    mismatches += game._calculate_rent(tile, dice) != _scan_rent(game, tile, dice)
+    print(f"Index cross-check: {checks} checks over {args.games} random games, {mismatches} mismatches")
+
+    calls = 20000
+    start = time.perf_counter()
+    for _ in range(calls):
+        game.get_available_actions()
+    print(f"get_available_actions: {(time.perf_counter() - start) / calls * 1e6:.1f} µs per call")
+    if mismatches:
+        raise SystemExit(1)
+
+
+def _state_signature(game: MonopolyGame) -> tuple:
+    """Every piece of mutable game state, for exact comparisons."""
+    return (
+        game.phase, game.current_player_idx, game.turn_number, game.last_dice,
+        bytes(game._money), bytes(game._pstate), bytes(game._owner), bytes(game._houses),
+        bytes(game._mortgaged), bytes(game.chance_deck), bytes(game.community_deck),
+        game.auction and astuple(game.auction), game.rng.getstate(), game.dice._faces[game.dice._next:],
+    )
+
+
+def bench_replay(args):
+    """Replay recorded seeded games and time bulk vs per-roll dice."""
+    rng = random.Random(args.seed)
+    mismatches = 0
+    for g in range(args.games):
+        game = MonopolyGame([f"P{i}" for i in range(args.players)], seed=args.seed + g, dice_block=args.dice_block)
+        game.initialize()
+        for _ in range(args.steps):
+            if game.phase == GamePhase.GAME_OVER:
+                break
+            _random_step(game, rng)
+        mismatches += _state_signature(MonopolyGame.replay(game.get_replay())) != _state_signature(game)
+    print(f"Replayed {args.games} recorded games: {mismatches} mismatches")
+
+    rolls = 200000
+    for block in (0, 1024):
+        game = MonopolyGame(["A", "B"], seed=args.seed, dice_block=block)
+        start = time.perf_counter()
+        for _ in range(rolls):
+            game._roll_dice()
+        label = f"block of {block}" if block else "two randint calls"
+        print(f"Dice ({label}): {rolls / (time.perf_counter() - start):,.0f} rolls/s")
+    if mismatches:
+        raise SystemExit(1)
+
+
+def bench_events(args):
+    """Headless turns per second with event capture on and off."""
+    from batch_engine import play_policy
+
+    for capture in (True, False):
+        turns = 0
+        start = time.perf_counter()
+        for seed in range(args.seed, args.seed + args.games):
+            game = MonopolyGame([f"P{i}" for i in range(args.players)], seed=seed, capture_events=capture)
+            game.initialize()
+            turns += play_policy(game, max_turns=args.max_turns).turn_number
+        elapsed = time.perf_counter() - start
+        print(f"Events {'on ' if capture else 'off'}: {turns / elapsed:,.0f} turns/s")
+
+
+def bench_fork(args):
+    """Forks per second, and a check that playing out forks never touches the parent."""
+    import copy
+
+    rng = random.Random(args.seed)
+    game = MonopolyGame([f"P{i}" for i in range(args.players)], seed=args.seed)
+    game.initialize()
+    for _ in range(args.warmup):
+        _random_step(game, rng)
+
+    for label, make in (("fork()", game.fork),
+                        ("fork(light)", lambda: game.fork(capture_events=False, record_actions=False)),
+                        ("copy.deepcopy", lambda: copy.deepcopy(game))):
+        count = 2000 if label == "copy.deepcopy" else args.forks
+        start = time.perf_counter()
+        for _ in range(count):
+            make()
+        print(f"{label:<14} {count / (time.perf_counter() - start):>12,.0f} forks/s")
+
+    parent = _state_signature(game), list(game.messages), list(game.action_log)
+    for i in range(args.playouts):
+        child = game.fork(seed=i if i % 2 else None)
+        for _ in range(200):
+            if child.phase == GamePhase.GAME_OVER:
+                break
+            _random_step(child, rng)
+    leaked = parent != (_state_signature(game), list(game.messages), list(game.action_log))
+    print(f"Played out {args.playouts} forks: parent {'CHANGED' if leaked else 'unchanged'}")
+    if leaked:
+        raise SystemExit(1)
+
+
+def bench_undo(args):
+    """Check apply()/undo() restores every action exactly, then time it against fork()."""
+    rng = random.Random(args.seed)
+    checked = mismatches = 0
+    for g in range(args.games):
+        game = MonopolyGame([f"P{i}" for i in range(args.players)], seed=args.seed + g, dice_block=args.dice_block)
+        game.initialize()
+        for _ in range(args.steps):
+            if game.phase == GamePhase.GAME_OVER:
+                break
+            before = _state_signature(game), list(game.messages), list(game.action_log)
+            probe = game.fork()
+            _random_step(probe, random.Random(rng.random()))
+            action, *values = probe.action_log[-1] if probe.action_log else ("end_turn",)
+            params = dict(zip((p for p, _ in ACTIONS[action][1]), values))
+            token = game.apply(action, params)
+            game.undo(token)
+            checked += 1
+            mismatches += before != (_state_signature(game), list(game.messages), list(game.action_log))
+            game.execute(action, params)
+    print(f"apply/undo on {checked} random actions: {mismatches} mismatches")
+
+    game = MonopolyGame([f"P{i}" for i in range(args.players)], seed=args.seed)
+    game.initialize()
+    for _ in range(args.warmup):
+        _random_step(game, rng)
+    game.phase, game.auction = GamePhase.WAITING_FOR_ROLL, None
+    count = args.iterations
+    start = time.perf_counter()
+    for _ in range(count):
+        game.undo(game.apply("roll_dice_and_move"))
+    print(f"apply+undo     {count / (time.perf_counter() - start):>12,.0f} /s")
+    start = time.perf_counter()
+    for _ in range(count):
+        game.fork().roll_and_move()
+    print(f"fork+roll      {count / (time.perf_counter() - start):>12,.0f} /s")
+    if mismatches:
+        raise SystemExit(1)
+
+
+def _policy_move(game: MonopolyGame, name: str) -> tuple:
+    """One move of the batch engine's fixed policy, as (action, params)."""
+    p = game.players[name]
+    if game.phase == GamePhase.WAITING_FOR_ROLL:
+        return "roll_dice_and_move", {}
+    if game.phase == GamePhase.IN_JAIL:
+        if p.jail_cards > 0:
+            return "use_jail_card", {}
+        return ("pay_jail_bail", {}) if p.money > 100 else ("roll_for_doubles", {})
+    if game.phase == GamePhase.WAITING_FOR_BUY_DECISION:
+        return ("buy_property", {}) if p.money >= game.current_tile.price else ("decline_purchase", {})
+    if game.phase == GamePhase.AUCTION:
+        return "pass_auction", {"player_name": name}
+    return "end_turn", {}
+
+
+def _policy_turn(game: MonopolyGame) -> tuple:
+    """_policy_move for whoever acts next; auctions go on with the bidders who have not passed."""
+    actor = game.current_player.name
+    if game.phase == GamePhase.AUCTION and actor in game.auction.passed_players:
+        actor = next(n for n in game.player_order if n not in game.auction.passed_players)
+    return _policy_move(game, actor)
+
+
+def bench_mcts(args):
+    """MCTSAgent against the fixed policy: win rate and decision latency."""
+    from ai_agents import MCTSAgent
+
+    agent = MCTSAgent("MCTS", budget_ms=args.budget_ms, workers=args.workers, seed=args.seed)
+    wins, latencies, iterations, reused = 0, [], 0, 0
+    try:
+        for g in range(args.games):
+            names = ["MCTS"] + [f"Policy{i}" for i in range(1, args.players)]
+            game = MonopolyGame(names[g % len(names):] + names[:g % len(names)], seed=args.seed + g)
+            game.initialize()
+            agent.attach(game)
+            while game.phase != GamePhase.GAME_OVER and game.turn_number < args.max_turns:
+                # Auctions go on with the bidders who have not passed
+                actor = game.current_player.name
+                if game.phase == GamePhase.AUCTION and actor in game.auction.passed_players:
+                    actor = next(n for n in game.player_order if n not in game.auction.passed_players)
+                if actor == "MCTS":
+                    decision = agent.decide({}, {})
+                    action, params = decision["action"], decision["params"]
+                    if agent.last_search:
+                        latencies.append(agent.last_search["elapsed_ms"])
+                        iterations += agent.last_search["iterations"]
+                        reused += agent.last_search["reused_visits"] > 0
+                        agent.last_search = {}
+                else:
+                    action, params = _policy_move(game, actor)
+                if "error" in game.execute(action, params):
+                    game.auction, game.phase = None, GamePhase.TURN_COMPLETE
+            alive = [p for p in game.players.values() if not p.bankrupt]
+            best = max(alive, key=lambda p: p.money + sum(game.tiles[pos].price for pos in p.properties))
+            wins += best.name == "MCTS"
+    finally:
+        agent.close()
+
+    latencies.sort()
+    print(f"MCTS won {wins}/{args.games} games against {args.players - 1} fixed-policy player(s)")
+    if latencies:
+        print(f"{len(latencies)} searched decisions: median {latencies[len(latencies) // 2]:.0f} ms, "
+              f"max {latencies[-1]:.0f} ms, {iterations / len(latencies):,.0f} iterations each, "
+              f"{reused} reused a subtree")
+
+
+def bench_markov(args):
+    """Landing odds of the Markov model against a long simulated game, and solve time."""
+    import numpy as np
+    import board_analytics
+
+    board_analytics._solve.cache_clear()
+    start = time.perf_counter()
+    model = board_analytics.landing_model(args.jail_strategy)
+    solve_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(1000):
+        board_analytics.landing_model(args.jail_strategy)
+    cached_time = (time.perf_counter() - start) / 1000
+
+    # Every ownable tile owned and both players too rich to go bankrupt, as the model assumes
+    game = MonopolyGame(["A", "B"], seed=args.seed, capture_events=False, record_actions=False)
+    game.initialize()
+    for tile in game.tiles.values():
+        if tile.price:
+            tile.owner = "B"
+    landings = np.zeros(40)
+    for _ in range(args.turns):
+        for p in game.players.values():
+            p.money, p.jail_cards = 10 ** 9, 0
+        while game.phase != GamePhase.TURN_COMPLETE:
+            if game.phase == GamePhase.IN_JAIL:
+                if args.jail_strategy == "pay":
+                    game.pay_bail()
+                else:
+                    game.roll_for_doubles()
+            else:
+                game.roll_and_move()
+                landings[game.current_player.position] += 1
+        game.end_turn()
+
+    simulated = landings / args.turns
+    error = np.abs(simulated - model.landings_per_turn).max()
+    worst = int(np.abs(simulated - model.landings_per_turn).argmax())
+    print(f"Solve: {solve_time * 1000:.1f} ms, cached lookup: {cached_time * 1e6:.1f} µs")
+    print(f"Rolls per turn: model {model.rolls_per_turn:.4f}")
+    print(f"Landings per turn over {args.turns} simulated turns: max abs error {error:.5f} "
+          f"(tile {worst}: model {model.landings_per_turn[worst]:.4f}, simulated {simulated[worst]:.4f})")
+
+
+def bench_state(args):
+    """Check merged deltas equal the full state, then compare time and size per decision."""
+    import json
+
+    rng = random.Random(args.seed)
+    checks = mismatches = 0
+    full_time = delta_time = full_bytes = delta_bytes = 0.0
+    for g in range(args.games):
+        game = MonopolyGame([f"P{i}" for i in range(args.players)], seed=args.seed + g)
+        game.initialize()
+        state = game.get_full_state()
+        for _ in range(args.steps):
+            if game.phase == GamePhase.GAME_OVER:
+                break
+            # Clients poll at different rates, so some deltas span several actions
+            # (and a rare one outruns the event buffer)
+            for _ in range(rng.choice((1, 1, 1, 2, 5) * 20 + (80,))):
+                _random_step(game, rng)
+
+            start = time.perf_counter()
+            delta = game.get_state_since(state["version"])
+            state = merge_state(state, delta)
+            delta_time += time.perf_counter() - start
+            start = time.perf_counter()
+            full = game.get_full_state()
+            full_time += time.perf_counter() - start
+
+            checks += 1
+            mismatches += full != state
+            full_bytes += len(json.dumps(full))
+            delta_bytes += len(json.dumps(delta))
+    print(f"Merged deltas vs full state: {checks} checks, {mismatches} mismatches")
+    print(f"get_full_state:  {full_time / checks * 1e6:6.1f} µs, {full_bytes / checks:6.0f} JSON bytes per call")
+    print(f"get_state_since: {delta_time / checks * 1e6:6.1f} µs, {delta_bytes / checks:6.0f} JSON bytes per call (incl. merge)")
+    if mismatches:
+        raise SystemExit(1)
+
+
+def bench_mcp(args):
+    """MCP tool calls per second for agent-like traffic on --games concurrent games, with and without the response cache."""
+    import asyncio
+    import mcp_server
+
+    async def call(tool: str, params: dict) -> dict:
+        return json.loads((await mcp_server.call_tool(tool, params))[0].text)
+
+    async def play(index: int, compact: bool, quota: int, totals: dict) -> None:
+        rng = random.Random(args.seed + index)
+        names = [f"P{i}" for i in range(args.players)]
+        game_id = (await call("start_game", {"players": names, "seed": rng.getrandbits(32)}))["game_id"]
+        reads = 0
+        while reads < quota:
+            game = mcp_server.registry.touch(mcp_server.registry.get(game_id))
+            if game.phase == GamePhase.GAME_OVER or game.turn_number >= 200:
+                await call("end_game", {"game_id": game_id})
+                game_id = (await call("start_game", {"players": names, "seed": rng.getrandbits(32)}))["game_id"]
+                continue
+            # Every decision: a few polls (often repeats from several clients), then one action
+            for _ in range(rng.randint(2, 5)):
+                tool, params = rng.choice([
+                    ("get_game_state", {}), ("get_available_actions", {}),
+                    ("get_my_status", {"player_name": game.current_player.name}),
+                    ("get_property_info", {"position": game.current_player.position}),
+                ])
+                result = await mcp_server.call_tool(tool, {**params, "game_id": game_id, "compact": compact})
+                totals["bytes"] += len(result[0].text)
+                reads += 1
+            actor = game.current_player.name
+            if game.phase == GamePhase.AUCTION and actor in game.auction.passed_players:
+                actor = next(n for n in game.player_order if n not in game.auction.passed_players)
+            action, params = _policy_move(game, actor)
+            await call(action, {**params, "game_id": game_id})
+            # Let the other games' clients in, as a transport would between requests
+            await asyncio.sleep(0)
+        totals["reads"] += reads
+        await call("end_game", {"game_id": game_id})
+
+    async def run(compact: bool) -> tuple:
+        totals = {"reads": 0, "bytes": 0}
+        quota = max(1, args.calls // args.games)
+        start = time.perf_counter()
+        await asyncio.gather(*(play(i, compact, quota, totals) for i in range(args.games)))
+        return time.perf_counter() - start, totals["reads"], totals["bytes"]
+
+    mcp_server.registry.capacity = max(mcp_server.registry.capacity, args.games)
+    for cache_size in (0, 32):
+        mcp_server.RESPONSE_CACHE_SIZE = cache_size
+        for compact in (False, True):
+            mcp_server.cache_stats.update(hits=0, misses=0)
+            elapsed, reads, size = asyncio.run(run(compact))
+            hits = mcp_server.cache_stats["hits"]
+            print(f"{args.games} games, cache {'on ' if cache_size else 'off'} {'compact' if compact else 'pretty '}: "
+                  f"{reads / elapsed:>9,.0f} reads/s, {size / reads:6.0f} bytes per read"
+                  + (f", {hits / reads:.0%} hits" if cache_size else ""))
+
+    # Memory held per hosted game at the configured capacity
+    async def host(count: int) -> None:
+        for i in range(count):
+            await call("start_game", {"players": [f"P{j}" for j in range(args.players)], "seed": i})
+
+    mcp_server.registry.sessions.clear()
+    mcp_server.registry.capacity = max(mcp_server.registry.capacity, args.hosted)
+    tracemalloc.start()
+    asyncio.run(host(args.hosted))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{len(mcp_server.registry)} hosted games: {current / len(mcp_server.registry) / 1024:.1f} KiB per game")
+    mcp_server.registry.close()
+
+
+def _policy_actor(game: MonopolyGame) -> str:
+    """Player the fixed policy moves for; auctions go on with the bidders who have not passed."""
+    actor = game.current_player.name
+    if game.phase == GamePhase.AUCTION and actor in game.auction.passed_players:
+        actor = next(n for n in game.player_order if n not in game.auction.passed_players)
+    return actor
+
+
+def _policy_step(game: MonopolyGame):
+    game.execute(*_policy_move(game, _policy_actor(game)))
+
+
+def bench_hibernate(args):
+    """Play many hosted games with few resident, checking each rehydrated game against a never-hibernated twin."""
+    import tempfile
+    from game_registry import GameRegistry
+
+    def play(max_resident: int, idle_seconds: float, verify: bool) -> tuple:
+        path = os.path.join(tempfile.mkdtemp(), "hibernate.db")
+        registry = GameRegistry(args.games, idle_seconds=idle_seconds, max_resident=max_resident, store_path=path)
+        rng = random.Random(args.seed)
+        names = [f"P{i}" for i in range(args.players)]
+        sessions, twins = [], []
+        for g in range(args.games):
+            sessions.append(registry.start(names, seed=args.seed + g))
+            registry.touch(sessions[-1]).initialize()
+            if verify:
+                twins.append(MonopolyGame(list(names), seed=args.seed + g))
+                twins[-1].initialize()
+        mismatches = 0
+        hot = max(1, args.games // 10)
+        start = time.perf_counter()
+        for step in range(args.steps):
+            # Most traffic goes to a few active games, the rest wake up now and then
+            g = rng.randrange(hot) if rng.random() < 0.8 else rng.randrange(args.games)
+            game = registry.touch(sessions[g])
+            if game.phase == GamePhase.GAME_OVER or game.turn_number >= 200:
+                continue
+            _policy_step(game)
+            if verify:
+                _policy_step(twins[g])
+                mismatches += _state_signature(game) != _state_signature(twins[g])
+                mismatches += game.get_full_state() != twins[g].get_full_state()
+            if step % 1000 == 0:
+                registry.hibernate_idle()
+        elapsed = time.perf_counter() - start
+        return registry, elapsed, mismatches
+
+    registry, elapsed, mismatches = play(args.max_resident, args.idle_seconds, verify=True)
+    metrics = registry.metrics()
+    registry.close()
+    print(f"{args.games} games, {args.max_resident} resident: {args.steps / elapsed:,.0f} actions/s, "
+          f"{mismatches} mismatches against never-hibernated twins")
+    print(f"  {metrics['hibernations']} hibernations of {metrics['mean_hibernated_bytes']} bytes, "
+          f"{metrics['rehydrations']} rehydrations, p50 {metrics['rehydrate_ms_p50']} ms, "
+          f"p99 {metrics['rehydrate_ms_p99']} ms")
+
+    # Everything resident against the hibernating configuration
+    for max_resident, idle_seconds in ((args.games, float("inf")), (args.max_resident, args.idle_seconds)):
+        gc.collect()
+        tracemalloc.start()
+        registry, _, _ = play(max_resident, idle_seconds, verify=False)
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"  {len(registry._resident):>5} resident / {args.games} hosted: {held / 1024 / 1024:6.1f} MiB in memory")
+        registry.close()
+
+
+def _persisted_server(args):
+    """Child side of bench_recovery: recover, then play games through the MCP tools until killed."""
+    import asyncio
+    import mcp_server
+    from game_registry import GameRegistry
+    from game_persistence import GamePersistence
+
+    persistence = GamePersistence(args.child, args.snapshot_every, args.fsync_interval)
+    registry = mcp_server.registry = GameRegistry(args.games, persistence=persistence)
+    registry.recover()
+    rng = random.Random(os.getpid())
+    names = [f"P{i}" for i in range(args.players)]
+
+    async def call(tool: str, params: dict) -> dict:
+        return json.loads((await mcp_server.call_tool(tool, params))[0].text)
+
+    async def serve():
+        while len(registry) < args.games:
+            await call("start_game", {"players": names, "seed": rng.getrandbits(32)})
+        synced = time.perf_counter()
+        while True:
+            for game_id in list(registry.sessions):
+                game = registry.touch(registry.get(game_id))
+                if game.phase == GamePhase.GAME_OVER or game.turn_number >= args.max_turns:
+                    await call("end_game", {"game_id": game_id})
+                    await call("start_game", {"players": names, "seed": rng.getrandbits(32)})
+                    continue
+                action, params = _policy_turn(game)
+                await call(action, {**params, "game_id": game_id})
+            if time.perf_counter() - synced >= args.fsync_interval:
+                # Everything reported here has been fsynced
+                persistence.sync()
+                print(json.dumps({gid: j.logged for gid, j in persistence.journals.items()}), flush=True)
+                synced = time.perf_counter()
+
+    asyncio.run(serve())
+
+
+def bench_recovery(args):
+    """Kill a journaling server mid-game repeatedly and check every game comes back intact."""
+    import select
+    import shutil
+    import signal
+    import tempfile
+    import subprocess
+    from game_persistence import GameJournal, GamePersistence
+
+    if args.child:
+        return _persisted_server(args)
+
+    directory = tempfile.mkdtemp(prefix="monopoly-state-")
+    rng = random.Random(args.seed)
+    lost = corrupt = checked = unreported = 0
+    timings = []
+    for kill in range(args.kills):
+        child = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "recovery", "--child", directory,
+             "--games", str(args.games), "--players", str(args.players), "--max-turns", str(args.max_turns),
+             "--snapshot-every", str(args.snapshot_every), "--fsync-interval", str(args.fsync_interval)],
+            stdout=subprocess.PIPE, text=True)
+        # The kill time is drawn once the child has reported durable actions, not
+        # from its start, since importing and recovering takes seconds
+        deadline = None
+        durable = {}
+        while deadline is None or time.perf_counter() < deadline:
+            wait = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            ready, _, _ = select.select([child.stdout], [], [], wait)
+            if ready:
+                line = child.stdout.readline()
+                if not line:
+                    break
+                if line.endswith("\n"):
+                    durable = json.loads(line)
+                    if deadline is None:
+                        deadline = time.perf_counter() + rng.uniform(0.0, args.max_run)
+        child.send_signal(signal.SIGKILL)
+        child.wait()
+        child.stdout.close()
+
+        persistence = GamePersistence(directory)
+        for game_id in persistence.game_ids():
+            start = time.perf_counter()
+            game = GameJournal(directory, game_id).load()
+            elapsed = time.perf_counter() - start
+            actions = game.action_log_start + len(game.action_log)
+            timings.append((actions, elapsed))
+            # A recovered game keeps no actions from before its snapshot, so the
+            # reference replays the child's deterministic policy from the seed
+            start = time.perf_counter()
+            replayed = MonopolyGame(list(game.player_order), seed=game.seed)
+            replayed.initialize()
+            for _ in range(actions):
+                replayed.execute(*_policy_turn(replayed))
+            timings[-1] += (time.perf_counter() - start,)
+            checked += 1
+            lost += actions < durable.get(game_id, 0)
+            corrupt += _state_signature(game) != _state_signature(replayed)
+        unreported += not durable
+        print(f"kill {kill + 1}: {len(persistence.game_ids())} games recovered, "
+              f"{sum(durable.values())} durable actions reported before the kill")
+
+    shutil.rmtree(directory)
+    print(f"{checked} recoveries: {lost} lost fsynced actions, {corrupt} differ from a full replay, "
+          f"{unreported} kills with no durable report")
+    timings.sort()
+    for half, label in ((timings[:len(timings) // 2], "shorter"), (timings[len(timings) // 2:], "longer ")):
+        if half:
+            print(f"  {label} half (up to {half[-1][0]:>5} actions): recovery "
+                  f"{sum(t[1] for t in half) / len(half) * 1000:.2f} ms, "
+                  f"full replay {sum(t[2] for t in half) / len(half) * 1000:.2f} ms")
+    if lost or corrupt or unreported:
+        raise SystemExit(1)
+
+
+async def _http_client(url: str, transport: str, deadline: float, stats: dict):
+    """One simulated agent session: plays games through the tools of a shared HTTP server until the deadline."""
+    from mcp import ClientSession
+    from mcp.client.sse import sse_client
+    from mcp.client.streamable_http import streamable_http_client
+
+    connect = sse_client(url) if transport == "sse" else streamable_http_client(url)
+    async with connect as streams, ClientSession(streams[0], streams[1]) as session:
+        await session.initialize()
+        latencies = stats["latencies"]
+
+        async def call(tool: str, params: dict) -> dict:
+            start = time.perf_counter()
+            result = await session.call_tool(tool, {**params, "compact": True})
+            latencies.append(time.perf_counter() - start)
+            return json.loads(result.content[0].text)
+
+        names = ["A", "B", "C"]
+        game_id, turns = (await call("start_game", {"players": names}))["game_id"], 0
+        while time.perf_counter() < deadline:
+            available = await call("get_available_actions", {"game_id": game_id})
+            actions = available.get("actions", [])
+            if available.get("phase") == "game_over" or turns >= 200:
+                await call("end_game", {"game_id": game_id})
+                game_id, turns = (await call("start_game", {"players": names}))["game_id"], 0
+            elif "place_bid" in actions:
+                for name in names:
+                    await call("pass_auction", {"game_id": game_id, "player_name": name})
+            elif "buy_property" in actions:
+                if "error" in await call("buy_property", {"game_id": game_id}):
+                    await call("decline_purchase", {"game_id": game_id})
+            elif "end_turn" in actions:
+                await call("end_turn", {"game_id": game_id})
+                turns += 1
+            elif actions:
+                await call(actions[0], {"game_id": game_id})
+        await call("end_game", {"game_id": game_id})
+
+
+def bench_http(args):
+    """Load-test the HTTP transport: many concurrent MCP client sessions sharing one server process."""
+    import socket
+    import asyncio
+    import subprocess
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import mcp_server"], cwd=here, check=True)
+    print(f"stdio: {(time.perf_counter() - start) * 1000:.0f} ms to start a server process per agent session")
+
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(here, "mcp_server.py"), "--transport", args.transport, "--port", str(args.port),
+         "--max-games", str(args.clients * 2), "--max-connections", str(args.clients * 4)], cwd=here)
+    try:
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", args.port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+        url = f"http://127.0.0.1:{args.port}" + ("/sse" if args.transport == "sse" else "/mcp")
+
+        async def run() -> tuple:
+            stats = {"latencies": []}
+            deadline = time.perf_counter() + args.seconds
+            start = time.perf_counter()
+            results = await asyncio.gather(*(_http_client(url, args.transport, deadline, stats)
+                                             for _ in range(args.clients)), return_exceptions=True)
+            failures = [r for r in results if isinstance(r, BaseException)]
+            return time.perf_counter() - start, stats["latencies"], failures
+
+        elapsed, latencies, failures = asyncio.run(run())
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    print(f"{args.transport}: {args.clients} concurrent clients, {len(latencies) / elapsed:,.0f} tool calls/s, "
+          f"p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms, "
+          f"{len(failures)} failed sessions")
+    for failure in failures[:3]:
+        print(f"  {type(failure).__name__}: {failure}")
+
+
+_DICE_ACTIONS = ("roll_dice_and_move", "roll_for_doubles")
+
+
+def _turn_plan(game: MonopolyGame, reserve: int) -> list:
+    """Policy moves up to the next dice roll, building houses above `reserve` cash before ending the turn."""
+    sim = game.fork(capture_events=False, record_actions=False)
+    plan = []
+    while sim.phase != GamePhase.GAME_OVER:
+        action, params = _policy_move(sim, _policy_actor(sim))
+        if action in _DICE_ACTIONS:
+            break
+        if action == "end_turn":
+            p = sim.current_player
+            buildable = sim._get_buildable_properties(p)
+            while buildable and p.money - sim.tiles[buildable[0]].house_cost > reserve:
+                plan.append(("build_house", {"property_position": buildable[0]}))
+                sim.build_house(buildable[0])
+                buildable = sim._get_buildable_properties(p)
+        plan.append((action, params))
+        sim.execute(action, params)
+        if action == "end_turn":
+            break
+    return plan
+
+
+def bench_execute(args):
+    """MCP round trips per turn: one call per action vs. each roll followed by one execute_actions batch.
+
+    Like an LLM agent, the client reads get_available_actions before every decision it sends.
+    """
+    import asyncio
+    import mcp_server
+
+    async def call(tool: str, params: dict) -> dict:
+        return json.loads((await mcp_server.call_tool(tool, {**params, "compact": True}))[0].text)
+
+    async def play(batched: bool) -> tuple:
+        calls = turns = builds = 0
+        signatures = []
+        start = time.perf_counter()
+        for g in range(args.games):
+            names = [f"P{i}" for i in range(args.players)]
+            game_id = (await call("start_game", {"players": names, "seed": args.seed + g}))["game_id"]
+            game = mcp_server.registry.touch(mcp_server.registry.get(game_id))
+            while game.phase != GamePhase.GAME_OVER and game.turn_number < args.max_turns:
+                action, params = _policy_move(game, _policy_actor(game))
+                if action in _DICE_ACTIONS:
+                    steps = [(action, params)]
+                else:
+                    steps = _turn_plan(game, args.reserve)
+                builds += sum(action == "build_house" for action, _ in steps)
+                if batched and len(steps) > 1:
+                    await call("get_available_actions", {"game_id": game_id})
+                    result = await call("execute_actions", {"game_id": game_id, "actions": [
+                        {"action": action, "params": params} for action, params in steps]})
+                    assert result["success"], result
+                    calls += 2
+                else:
+                    for action, params in steps:
+                        await call("get_available_actions", {"game_id": game_id})
+                        await call(action, {**params, "game_id": game_id})
+                        calls += 2
+            turns += game.turn_number
+            signatures.append(_state_signature(game))
+            await call("end_game", {"game_id": game_id})
+        return calls, turns, builds, time.perf_counter() - start, signatures
+
+    results = {}
+    for batched in (False, True):
+        calls, turns, builds, elapsed, signatures = asyncio.run(play(batched))
+        results[batched] = signatures
+        print(f"{'execute_actions' if batched else 'one call each  '}: {calls / turns:.2f} round trips per turn, "
+              f"{turns / elapsed:,.0f} turns/s ({builds / turns:.2f} houses built per turn)")
+    print(f"final states differ in {sum(a != b for a, b in zip(results[False], results[True]))} of {args.games} games")
+
+    # A failing step undoes the whole atomic batch
+    game = MonopolyGame([f"P{i}" for i in range(args.players)], seed=args.seed)
+    game.initialize()
+    rng = random.Random(args.seed)
+    unchanged = 0
+    for _ in range(args.rollbacks):
+        if game.phase == GamePhase.GAME_OVER:
+            break
+        before = _state_signature(game), len(game.action_log), tuple(game.events)
+        steps = []
+        sim = game.fork(capture_events=False, record_actions=False)
+        for _ in range(rng.randint(1, 8)):
+            action, params = _policy_move(sim, _policy_actor(sim))
+            sim.execute(action, params)
+            steps.append({"action": action, "params": params})
+        steps.append({"action": "build_house", "params": {"property_position": 0}})
+        game.execute_actions(steps)
+        unchanged += before == (_state_signature(game), len(game.action_log), tuple(game.events))
+        for step in steps[:-1]:
+            game.execute(step["action"], step["params"])
+    print(f"{unchanged} of {args.rollbacks} failed atomic batches left the game untouched")
+
+
+def bench_advance(args):
+    """Agent round trips per game: polling before every move vs. advance_until_decision between real choices."""
+    import asyncio
+    import mcp_server
+
+    async def call(tool: str, params: dict) -> dict:
+        return json.loads((await mcp_server.call_tool(tool, {**params, "compact": True}))[0].text)
+
+    async def play(advance: bool) -> tuple:
+        calls = decisions = 0
+        signatures = []
+        start = time.perf_counter()
+        for g in range(args.games):
+            names = [f"P{i}" for i in range(args.players)]
+            game_id = (await call("start_game", {"players": names, "seed": args.seed + g}))["game_id"]
+            game = mcp_server.registry.touch(mcp_server.registry.get(game_id))
+            while game.phase != GamePhase.GAME_OVER and game.turn_number < args.max_turns:
+                if advance:
+                    result = await call("advance_until_decision", {"game_id": game_id, "allow_jail_roll": True})
+                    calls += 1
+                    if result["stopped"] != "decision" or game.turn_number >= args.max_turns:
+                        continue
+                else:
+                    # An agent without it polls, and short-circuits lone rolls and end_turns
+                    actions = (await call("get_available_actions", {"game_id": game_id}))["actions"]
+                    calls += 1
+                    if actions in (["roll_dice_and_move"], ["end_turn"]):
+                        await call(actions[0], {"game_id": game_id})
+                        calls += 1
+                        continue
+                    if (actions == ["roll_for_doubles", "pay_jail_bail"] and game.current_player.money < 50):
+                        await call("roll_for_doubles", {"game_id": game_id})
+                        calls += 1
+                        continue
+                action, params = _policy_move(game, _policy_actor(game))
+                await call(action, {**params, "game_id": game_id})
+                calls += 1
+                decisions += 1
+            signatures.append(list(game.action_log))
+            await call("end_game", {"game_id": game_id})
+        return calls, decisions, time.perf_counter() - start, signatures
+
+    results = {}
+    for advance in (False, True):
+        calls, decisions, elapsed, signatures = asyncio.run(play(advance))
+        results[advance] = signatures
+        print(f"{'advance_until_decision' if advance else 'poll every move       '}: "
+              f"{calls / decisions:.2f} round trips per real decision, {elapsed / args.games * 1000:.1f} ms per game")
+    # advance_until_decision may run past the turn cap, so compare the moves both made
+    diverged = sum(a[:min(len(a), len(b))] != b[:min(len(a), len(b))] for a, b in zip(results[False], results[True]))
+    print(f"move sequences diverge in {diverged} of {args.games} games")
+
+
+class _Dashboard:
+    """Stand-in for a subscribed MCP client session that takes `delay` seconds to accept each notification."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.received = 0
+
+    async def send_resource_updated(self, uri):
+        await asyncio.sleep(self.delay)
+        self.received += 1
+
+
+def bench_watch(args):
+    """Game throughput with dashboards subscribed to every game, including a slow one, and what they receive."""
+    import mcp_server
+
+    async def play(dashboards: list) -> tuple:
+        names = [f"P{i}" for i in range(args.players)]
+        game_ids = [(await mcp_server.call_tool("start_game", {"players": names, "seed": args.seed + g}))[0].text
+                    for g in range(args.games)]
+        game_ids = [json.loads(text)["game_id"] for text in game_ids]
+        for dashboard in dashboards:
+            for game_id in game_ids:
+                mcp_server.hub.subscribe(dashboard, mcp_server.game_uri(game_id))
+        moves = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < args.seconds:
+            for game_id in game_ids:
+                game = mcp_server.registry.touch(mcp_server.registry.get(game_id))
+                if game.phase == GamePhase.GAME_OVER:
+                    continue
+                action, params = _policy_move(game, _policy_actor(game))
+                await mcp_server.call_tool(action, {**params, "game_id": game_id})
+                moves += 1
+            await asyncio.sleep(0)
+        elapsed = time.perf_counter() - start
+        await asyncio.sleep(0.2)
+        for game_id in game_ids:
+            await mcp_server.call_tool("end_game", {"game_id": game_id})
+        return moves / elapsed, elapsed
+
+    baseline, _ = asyncio.run(play([]))
+    print(f"{args.games} games, no subscribers: {baseline:,.0f} moves/s")
+    mcp_server.hub.stats.update(published=0, sent=0, coalesced=0, dropped=0)
+    fast, slow = _Dashboard(0.0), _Dashboard(args.slow_ms / 1000)
+    rate, elapsed = asyncio.run(play([fast, slow]))
+    stats = mcp_server.hub.stats
+    print(f"{args.games} games, fast + slow ({args.slow_ms} ms) dashboard: {rate:,.0f} moves/s")
+    print(f"  {stats['published']:,} changes published, fast dashboard got {fast.received:,}, "
+          f"slow one {slow.received:,} ({stats['coalesced']:,} coalesced)")
+    print(f"  notifications sent only when a game changed, {fast.received / elapsed:,.0f}/s to the fast dashboard "
+          f"at {rate / args.games:,.0f} moves/s per game; no polling requests")
+
+
+class _LatencyAgent(BaseAgent):
+    """Fixed-policy agent that waits `latency` seconds per real decision, like a model request."""
+
+    def __init__(self, name: str, latency: float, limiter: asyncio.Semaphore):
+        super().__init__(name)
+        self.latency = latency
+        self.limiter = limiter
+
+    def decide(self, game_state: dict, available_actions: dict) -> dict:
+        raise TypeError("_LatencyAgent only runs under the async runner")
+
+    async def adecide(self, game_state: dict, available_actions: dict) -> dict:
+        actions = available_actions.get("actions", [])
+        if actions in (["end_turn"], ["roll_dice_and_move"]):
+            return {"action": actions[0], "params": {}}
+        async with self.limiter:
+            await asyncio.sleep(self.latency)
+        action, params = _policy_move(self.game, _policy_actor(self.game))
+        return {"action": action, "params": params}
+
+
+def bench_async(args):
+    """Decisions per second of the async runner against simulated model latency, by in-flight request limit."""
+    from game_runner import run_games_async
+
+    names = [f"P{i}" for i in range(args.players)]
+    sequential = None
+    winners = set()
+    for limit in args.limits:
+        limiter = asyncio.Semaphore(limit)
+
+        def make_agents(i: int) -> dict:
+            return {name: _LatencyAgent(name, args.latency_ms / 1000, limiter) for name in names}
+
+        summary = asyncio.run(run_games_async(make_agents, args.games, args.max_turns, args.seed))
+        winners.add(tuple(g["winner"] for g in summary["games"]))
+        if sequential is None:
+            sequential = summary["decisions_per_second"]
+        print(f"{args.games} games, {limit:>3} requests in flight: {summary['decisions_per_second']:8,.1f} decisions/s "
+              f"({summary['decisions_per_second'] / sequential:.1f}x), {summary['elapsed']:.1f}s")
+    print(f"winners {'identical' if len(winners) == 1 else 'DIFFER'} across limits")
+
+
+def bench_tournament(args):
+    """Tournament throughput by worker count; results must not depend on it."""
+    import pickle
+    from tournament import run_tournament, play_game, lineup_for, _build_agents
+
+    game, _ = play_game(_build_agents(lineup_for(args.agents, args.players, 0), args.seed), args.seed, args.max_turns)
+    summary = None
+    base = None
+    for workers in args.workers:
+        summary = run_tournament(args.agents, args.games, args.players, args.seed, args.max_turns, workers)
+        results = summary["results"]
+        if base is None:
+            base = summary
+        same = results == base["results"]
+        print(f"{workers:>2} workers: {summary['games_per_second']:8.1f} games/s "
+              f"({summary['games_per_second'] / base['games_per_second']:.2f}x), "
+              f"results {'identical' if same else 'DIFFER'}")
+    print(f"per-game result sent back: {len(pickle.dumps(summary['results'][0]))} bytes "
+          f"(final state: {len(pickle.dumps(game.get_full_state()))} bytes) on {os.cpu_count()} CPUs")
+    for spec, r in summary["agents"].items():
+        print(f"  {spec:<24} win rate {r['win_rate']:.3f} [{r['ci_low']:.3f}, {r['ci_high']:.3f}]")
+
+
+def bench_runner(args):
+    """Turns per second of run_game by reporter, with fast local agents."""
+    import io
+    import tempfile
+    import contextlib
+    from ai_agents import PolicyAgent, RandomAgent
+    from game_runner import run_game, ConsoleReporter, JsonlReporter, NullReporter
+
+    class StatePolicyAgent(PolicyAgent):
+        reads_state = True
+
+    def agents(i: int, reads_state: bool) -> dict:
+        first = StatePolicyAgent if reads_state else PolicyAgent
+        second = RandomAgent("B", seed=args.seed + i)
+        second.reads_state = reads_state
+        return {"A": first("A"), "B": second}
+
+    jsonl = tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False)
+    modes = [
+        ("console (delay 0)", lambda: ConsoleReporter(0), True, io.StringIO),
+        ("jsonl", lambda: JsonlReporter(jsonl), True, None),
+        ("null, state kept", NullReporter, True, None),
+        ("headless", NullReporter, False, None),
+    ]
+    base = None
+    winners = set()
+    for label, reporter, reads_state, sink in modes:
+        turns = 0
+        games = []
+        start = time.perf_counter()
+        for i in range(args.games):
+            with contextlib.redirect_stdout(sink()) if sink else contextlib.nullcontext():
+                result = run_game(agents(i, reads_state), args.max_turns, seed=args.seed + i, reporter=reporter())
+            turns += result["turns"]
+            games.append(result["winner"])
+        elapsed = time.perf_counter() - start
+        winners.add(tuple(games))
+        rate = turns / elapsed
+        base = base or rate
+        print(f"{label:<18} {rate:10,.0f} turns/s ({rate / base:.1f}x)")
+    jsonl.close()
+    print(f"jsonl log: {os.path.getsize(jsonl.name) / args.games / 1024:.1f} KiB per game")
+    os.remove(jsonl.name)
+    print(f"winners {'identical' if len(winners) == 1 else 'DIFFER'} across modes")
+
+
+class _PolicyBackend:
+    """Stands in for an agent's model backend: answers with the fixed policy's move as JSON."""
+
+    def __init__(self, agent):
+        from ai_agents import PolicyAgent
+        self.agent = agent
+        self.policy = PolicyAgent(agent.name)
+        self.calls = 0
+
+    def complete(self, model, messages, temperature, max_tokens, deadline=None) -> str:
+        self.calls += 1
+        self.policy.game = self.agent.game
+        return json.dumps(self.policy.decide({}, {}))
+
+
+def bench_cache(args):
+    """Model calls saved by the decision cache over many games, and legality of cached decisions."""
+    import tempfile
+    from ai_agents import OpenAIAgent
+    from decision_cache import DecisionCache, fingerprint
+    from game_runner import run_game, NullReporter
+
+    class ErrorCount(NullReporter):
+        errors = 0
+
+        def action(self, game, player, action, params, result):
+            ErrorCount.errors += "error" in result
+
+    def play(cache, first_seed: int) -> int:
+        calls = 0
+        for i in range(args.games):
+            agents = {}
+            for name in ("A", "B"):
+                agent = OpenAIAgent(name, model="sim", api_key="sim", verbose=False, temperature=0, cache=cache)
+                agent.backend = _PolicyBackend(agent)
+                agents[name] = agent
+            run_game(agents, args.max_turns, seed=first_seed + i, reporter=ErrorCount())
+            calls += sum(a.backend.calls for a in agents.values())
+        return calls
+
+    path = os.path.join(tempfile.mkdtemp(), "decisions.db")
+    ErrorCount.errors = 0
+    uncached = play(None, args.seed)
+    base_errors = ErrorCount.errors
+    ErrorCount.errors = 0
+    cache = DecisionCache(args.capacity, path)
+    cached = play(cache, args.seed)
+    print(f"{args.games} games: {uncached:,} model calls uncached, {cached:,} with the cache "
+          f"({1 - cached / uncached:.0%} saved); invalid actions {base_errors} -> {ErrorCount.errors}")
+    print(f"  {cache.metrics()}")
+    cache.close()
+
+    warm = DecisionCache(args.capacity, path)
+    later = play(warm, args.seed + args.games)
+    print(f"next run, new seeds, shared store: {later:,} model calls, "
+          f"{warm.stats['disk_hits']:,} answered from disk, hit rate {warm.metrics()['hit_rate']:.0%}")
+    warm.close()
+
+    game = MonopolyGame(["A", "B"], seed=args.seed)
+    game.initialize()
+    state = game.get_full_state()
+    actions = game.get_available_actions()["actions"]
+    start = time.perf_counter()
+    for _ in range(10000):
+        fingerprint(state, "A", actions)
+    print(f"fingerprint: {(time.perf_counter() - start) / 10000 * 1e6:.1f} us")
+
+
+def bench_backend(args):
+    """Decision latency against a backend that stalls, with SDK-like defaults vs deadline, retries and breaker."""
+    from ai_agents import OpenAIAgent
+    from model_backends import ModelBackend, CircuitBreaker
+    from fake_model_server import FakeModelServer
+
+    game = MonopolyGame(["A", "B"], seed=args.seed)
+    game.initialize()
+    state = game.get_full_state()
+    available = {"actions": ["buy_property", "decline_purchase"]}
+    outage = range(args.decisions // 3, args.decisions // 3 + args.outage)
+
+    configs = [
+        ("SDK-like: 600 s timeout, 2 retries, no breaker",
+         dict(deadline=600.0, retries=2, breaker=CircuitBreaker(failure_threshold=10 ** 9))),
+        (f"deadline {args.deadline_ms:g} ms, 2 retries, breaker",
+         dict(deadline=args.deadline_ms / 1000, retries=2, breaker=CircuitBreaker(5, args.reset_seconds))),
+    ]
+    for label, options in configs:
+        server = FakeModelServer(("127.0.0.1", 0), latency=f"fixed:{args.latency_ms:g}", stall_rate=args.stall_rate,
+                                 stall_ms=args.stall_ms, seed=args.seed).start()
+        backend = ModelBackend(server.url, "sim", **options)
+        agent = OpenAIAgent("A", model="sim", verbose=False, backend=backend)
+        agent.attach(game)
+        latencies = []
+        for i in range(args.decisions):
+            server.outage = i in outage
+            start = time.perf_counter()
+            agent.decide(state, available)
+            latencies.append(time.perf_counter() - start)
+            time.sleep(args.gap_ms / 1000)
+        server.shutdown()
+        server.server_close()
+        backend.close()
+        latencies.sort()
+        m = backend.metrics()
+        pct = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+        print(f"{label}\n  decision ms p50 {pct(0.5):7.1f}  p95 {pct(0.95):7.1f}  p99 {pct(0.99):7.1f}  "
+              f"max {latencies[-1] * 1000:7.1f}  total {sum(latencies):5.1f}s")
+        print(f"  requests {m['requests']}, retries {m['retries']}, timeouts {m['timeouts']}, "
+              f"fallbacks {m['failures'] + m['short_circuited']}, breaker opened {m['opened']}x, "
+              f"short-circuited {m['short_circuited']}")
+
+
+def bench_offline(args):
+    """Async Ollama agents end to end against the fake model server: clean, messy, failing and cached."""
+    from ai_agents import AsyncOllamaAgent, get_action_prompt
+    from decision_cache import DecisionCache
+    from fake_model_server import FakeModelServer
+    from game_runner import run_games_async
+    from model_backends import ModelBackend
+
+    scenarios = [
+        ("clean JSON", dict(policy="valid=1"), False),
+        ("messy output", dict(policy="valid=0.7,fenced=0.1,prose=0.1,malformed=0.1"), False),
+        ("5xx/429 + stalls", dict(policy="valid=1", errors="500=0.05,429=0.02", stall_rate=0.01,
+                                  stall_ms=args.deadline_ms * 2), False),
+        ("clean JSON, cached", dict(policy="valid=1"), True),
+    ]
+    names = [f"P{i}" for i in range(args.players)]
+    for label, options, cached in scenarios:
+        server = FakeModelServer(("127.0.0.1", 0), latency=args.latency, seed=args.seed, **options).start()
+        host = server.url[:-len("/v1")]
+        backend = ModelBackend(server.url, "ollama", deadline=args.deadline_ms / 1000)
+        cache = DecisionCache() if cached else None
+        limiter = asyncio.Semaphore(args.limit)
+
+        def make_agents(i: int) -> dict:
+            return {name: AsyncOllamaAgent(name, model="fake", host=host, limiter=limiter, verbose=False,
+                                           temperature=0, cache=cache, backend=backend) for name in names}
+
+        summary = asyncio.run(run_games_async(make_agents, args.games, args.max_turns, args.seed))
+        m = backend.metrics()
+        s = server.stats
+        print(f"{label:<20} {summary['decisions_per_second']:7,.1f} decisions/s  "
+              f"requests {s['requests']:>5}  retries {m['retries']:>3}  fallbacks {m['failures'] + m['short_circuited']:>3}  "
+              f"malformed {s['policy_malformed']:>4}  p50 {m['latency_ms_p50']} ms  p99 {m['latency_ms_p99']} ms"
+              + (f"  cache hit rate {cache.metrics()['hit_rate']:.0%}" if cache else ""))
+        server.shutdown()
+        server.server_close()
+        backend.close()
+
+    # Streamed answers must carry the same text as plain ones
+    server = FakeModelServer(("127.0.0.1", 0), seed=args.seed).start()
+    client = ModelBackend(server.url, "ollama").client
+    game = MonopolyGame(["A", "B"], seed=args.seed)
+    game.initialize()
+    messages = [{"role": "user", "content": get_action_prompt(game.get_full_state(), "A",
+                                                              game.get_available_actions()["actions"])}]
+    plain = client.chat.completions.create(model="fake", messages=messages).choices[0].message.content
+    streamed = "".join(chunk.choices[0].delta.content or ""
+                       for chunk in client.chat.completions.create(model="fake", messages=messages, stream=True))
+    print(f"streaming: {'matches' if streamed == plain else 'DIFFERS from'} the plain answer {plain}")
+    server.shutdown()
+    server.server_close()
+
+
+def bench_cassette(args):
+    """Record games against the fake model server, replay them offline, and check they match exactly."""
+    import tempfile
+    from ai_agents import OllamaAgent
+    from cassette import Cassette, CassetteMismatch
+    from fake_model_server import FakeModelServer
+    from game_runner import run_game, NullReporter
+    from model_backends import ModelBackend
+
+    server = FakeModelServer(("127.0.0.1", 0), latency=args.latency, seed=args.seed,
+                             policy="valid=0.8,fenced=0.1,malformed=0.1", errors="500=0.05").start()
+    host = server.url[:-len("/v1")]
+    backend = ModelBackend(server.url, "ollama", deadline=5.0)
+    directory = tempfile.mkdtemp()
+
+    def play(seed: int, cassette: Cassette, temperature: float = 0.7) -> dict:
+        agents = {}
+        for name in ("A", "B"):
+            agent = OllamaAgent(name, model="fake", host=host, verbose=False, temperature=temperature)
+            agent.backend = cassette.backend(name, backend)
+            agents[name] = agent
+        result = run_game(agents, args.max_turns, seed=seed, reporter=NullReporter())
+        cassette.verify_complete()
+        return result
+
+    recorded = replayed = 0.0
+    same = 0
+    requests = 0
+    for i in range(args.games):
+        path = os.path.join(directory, f"game{i}.cassette")
+        cassette = Cassette(path, "record", seed=args.seed + i)
+        start = time.perf_counter()
+        live = play(cassette.seed, cassette)
+        recorded += time.perf_counter() - start
+        cassette.close()
+        requests += cassette.stats["recorded"]
+
+        cassette = Cassette(path, "replay")
+        start = time.perf_counter()
+        again = play(cassette.seed, cassette)
+        replayed += time.perf_counter() - start
+        same += again["replay"] == live["replay"] and again["final_state"] == live["final_state"]
+    server.shutdown()
+    server.server_close()
+    print(f"{args.games} games, {requests:,} model requests: recorded in {recorded:.2f}s, "
+          f"replayed in {replayed:.3f}s ({recorded / replayed:,.0f}x); {same}/{args.games} replays identical")
+
+    try:
+        play(args.seed, Cassette(os.path.join(directory, "game0.cassette"), "replay"), temperature=0.2)
+        print("changed request: NOT detected")
+    except CassetteMismatch as e:
+        print(f"changed request detected: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monopoly engine benchmarks")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    batch = sub.add_parser("batch", help="Vectorized batch engine throughput")
+    batch.add_argument("--games", type=int, default=20000)
+    batch.add_argument("--players", type=int, default=2)
+    batch.add_argument("--seed", type=int, default=0)
+    batch.add_argument("--max-turns", type=int, default=100)
+    batch.add_argument("--verify", type=int, default=0, help="Cross-check this many games against MonopolyGame")
+    batch.set_defaults(func=bench_batch)
+
+    memory = sub.add_parser("memory", help="Memory held per live game")
+    memory.add_argument("--games", type=int, default=2000)
+    memory.add_argument("--players", type=int, default=4)
+    memory.set_defaults(func=bench_memory)
+
+    index = sub.add_parser("index", help="Ownership index cross-check and timing")
+    index.add_argument("--games", type=int, default=50)
+    index.add_argument("--players", type=int, default=3)
+    index.add_argument("--steps", type=int, default=1500)
+    index.add_argument("--seed", type=int, default=0)
+    index.set_defaults(func=bench_index)
+
+    replay = sub.add_parser("replay", help="Deterministic replay check and dice stream throughput")
+    replay.add_argument("--games", type=int, default=50)
+    replay.add_argument("--players", type=int, default=3)
+    replay.add_argument("--steps", type=int, default=1000)
+    replay.add_argument("--seed", type=int, default=0)
+    replay.add_argument("--dice-block", type=int, default=256)
+    replay.set_defaults(func=bench_replay)
+
+    events = sub.add_parser("events", help="Turn throughput with event capture on and off")
+    events.add_argument("--games", type=int, default=300)
+    events.add_argument("--players", type=int, default=3)
+    events.add_argument("--seed", type=int, default=0)
+    events.add_argument("--max-turns", type=int, default=100)
+    events.set_defaults(func=bench_events)
+
+    fork = sub.add_parser("fork", help="Fork throughput and isolation check")
+    fork.add_argument("--forks", type=int, default=50000)
+    fork.add_argument("--playouts", type=int, default=200)
+    fork.add_argument("--players", type=int, default=3)
+    fork.add_argument("--warmup", type=int, default=300, help="Random actions before forking")
+    fork.add_argument("--seed", type=int, default=0)
+    fork.set_defaults(func=bench_fork)
+
+    undo = sub.add_parser("undo", help="apply/undo exactness check and throughput")
+    undo.add_argument("--games", type=int, default=30)
+    undo.add_argument("--players", type=int, default=3)
+    undo.add_argument("--steps", type=int, default=500)
+    undo.add_argument("--warmup", type=int, default=300, help="Random actions before timing")
+    undo.add_argument("--iterations", type=int, default=20000)
+    undo.add_argument("--seed", type=int, default=0)
+    undo.add_argument("--dice-block", type=int, default=64)
+    undo.set_defaults(func=bench_undo)
+
+    mcts = sub.add_parser("mcts", help="MCTSAgent strength and decision latency")
+    mcts.add_argument("--games", type=int, default=10)
+    mcts.add_argument("--players", type=int, default=2)
+    mcts.add_argument("--budget-ms", type=float, default=50)
+    mcts.add_argument("--workers", type=int, default=1)
+    mcts.add_argument("--max-turns", type=int, default=100)
+    mcts.add_argument("--seed", type=int, default=0)
+    mcts.set_defaults(func=bench_mcts)
+
+    markov = sub.add_parser("markov", help="Landing model accuracy against simulation")
+    markov.add_argument("--turns", type=int, default=200000)
+    markov.add_argument("--jail-strategy", choices=["roll", "pay"], default="roll")
+    markov.add_argument("--seed", type=int, default=0)
+    markov.set_defaults(func=bench_markov)
+
+    state = sub.add_parser("state", help="Versioned state deltas vs full snapshots")
+    state.add_argument("--games", type=int, default=30)
+    state.add_argument("--players", type=int, default=4)
+    state.add_argument("--steps", type=int, default=500)
+    state.add_argument("--seed", type=int, default=0)
+    state.set_defaults(func=bench_state)
+
+    mcp = sub.add_parser("mcp", help="MCP read traffic with and without the response cache")
+    mcp.add_argument("--calls", type=int, default=30000, help="Read tool calls per configuration")
+    mcp.add_argument("--players", type=int, default=3)
+    mcp.add_argument("--games", type=int, default=1, help="Games played concurrently, each by its own client")
+    mcp.add_argument("--hosted", type=int, default=500, help="Games to host for the memory figure")
+    mcp.add_argument("--seed", type=int, default=0)
+    mcp.set_defaults(func=bench_mcp)
+
+    hibernate = sub.add_parser("hibernate", help="Idle game hibernation: correctness, rehydration latency, memory")
+    hibernate.add_argument("--games", type=int, default=1000)
+    hibernate.add_argument("--max-resident", type=int, default=100)
+    hibernate.add_argument("--idle-seconds", type=float, default=1.0)
+    hibernate.add_argument("--players", type=int, default=3)
+    hibernate.add_argument("--steps", type=int, default=30000)
+    hibernate.add_argument("--seed", type=int, default=0)
+    hibernate.set_defaults(func=bench_hibernate)
+
+    recovery = sub.add_parser("recovery", help="Kill a journaling MCP server mid-game and verify recovery")
+    recovery.add_argument("--kills", type=int, default=5)
+    recovery.add_argument("--games", type=int, default=20)
+    recovery.add_argument("--players", type=int, default=3)
+    recovery.add_argument("--max-turns", type=int, default=2000)
+    recovery.add_argument("--max-run", type=float, default=3.0, help="Longest run, in seconds, before a kill")
+    recovery.add_argument("--snapshot-every", type=int, default=200)
+    recovery.add_argument("--fsync-interval", type=float, default=0.05)
+    recovery.add_argument("--seed", type=int, default=0)
+    recovery.add_argument("--child", help=argparse.SUPPRESS)
+    recovery.set_defaults(func=bench_recovery)
+
+    http = sub.add_parser("http", help="Load-test the MCP server over HTTP with many concurrent clients")
+    http.add_argument("--transport", choices=["http", "sse"], default="http")
+    http.add_argument("--clients", type=int, default=50)
+    http.add_argument("--seconds", type=float, default=10.0)
+    http.add_argument("--port", type=int, default=8765)
+    http.set_defaults(func=bench_http)
+
+    execute = sub.add_parser("execute", help="Round trips per turn with and without execute_actions")
+    execute.add_argument("--games", type=int, default=30)
+    execute.add_argument("--players", type=int, default=3)
+    execute.add_argument("--max-turns", type=int, default=300)
+    execute.add_argument("--reserve", type=int, default=300, help="Cash kept back when building houses")
+    execute.add_argument("--rollbacks", type=int, default=2000)
+    execute.add_argument("--seed", type=int, default=0)
+    execute.set_defaults(func=bench_execute)
+
+    advance = sub.add_parser("advance", help="Round trips per decision with and without advance_until_decision")
+    advance.add_argument("--games", type=int, default=30)
+    advance.add_argument("--players", type=int, default=3)
+    advance.add_argument("--max-turns", type=int, default=300)
+    advance.add_argument("--seed", type=int, default=0)
+    advance.set_defaults(func=bench_advance)
+
+    watch = sub.add_parser("watch", help="Resource subscriptions: game throughput and notifications with slow dashboards")
+    watch.add_argument("--games", type=int, default=50)
+    watch.add_argument("--players", type=int, default=3)
+    watch.add_argument("--seconds", type=float, default=5.0)
+    watch.add_argument("--slow-ms", type=float, default=50.0, help="Time the slow dashboard takes per notification")
+    watch.add_argument("--seed", type=int, default=0)
+    watch.set_defaults(func=bench_watch)
+
+    asyncrun = sub.add_parser("async", help="Async runner throughput against simulated model latency")
+    asyncrun.add_argument("--games", type=int, default=64)
+    asyncrun.add_argument("--players", type=int, default=2)
+    asyncrun.add_argument("--max-turns", type=int, default=30)
+    asyncrun.add_argument("--latency-ms", type=float, default=20.0, help="Simulated time per model request")
+    asyncrun.add_argument("--limits", type=int, nargs="+", default=[1, 8, 64])
+    asyncrun.add_argument("--seed", type=int, default=0)
+    asyncrun.set_defaults(func=bench_async)
+
+    runner = sub.add_parser("runner", help="run_game turns per second with each reporter")
+    runner.add_argument("--games", type=int, default=200)
+    runner.add_argument("--max-turns", type=int, default=100)
+    runner.add_argument("--seed", type=int, default=0)
+    runner.set_defaults(func=bench_runner)
+
+    cache = sub.add_parser("cache", help="Model calls saved by the decision cache")
+    cache.add_argument("--games", type=int, default=100)
+    cache.add_argument("--max-turns", type=int, default=100)
+    cache.add_argument("--capacity", type=int, default=10000)
+    cache.add_argument("--seed", type=int, default=0)
+    cache.set_defaults(func=bench_cache)
+
+    backend = sub.add_parser("backend", help="Decision tail latency against a stalling model backend")
+    backend.add_argument("--decisions", type=int, default=300)
+    backend.add_argument("--latency-ms", type=float, default=5.0, help="Normal response time")
+    backend.add_argument("--stall-rate", type=float, default=0.03, help="Share of requests that hang")
+    backend.add_argument("--stall-ms", type=float, default=500.0, help="How long a hung request takes")
+    backend.add_argument("--outage", type=int, default=40, help="Decisions during which every request hangs")
+    backend.add_argument("--deadline-ms", type=float, default=150.0)
+    backend.add_argument("--reset-seconds", type=float, default=0.5, help="Breaker open time before a probe")
+    backend.add_argument("--gap-ms", type=float, default=10.0, help="Game time between decisions")
+    backend.add_argument("--seed", type=int, default=0)
+    backend.set_defaults(func=bench_backend)
+
+    offline = sub.add_parser("offline", help="Model agents end to end against the fake model server")
+    offline.add_argument("--games", type=int, default=16)
+    offline.add_argument("--players", type=int, default=2)
+    offline.add_argument("--max-turns", type=int, default=30)
+    offline.add_argument("--latency", default="lognormal:20:0.5", help="Fake server latency distribution")
+    offline.add_argument("--limit", type=int, default=16, help="Model requests in flight")
+    offline.add_argument("--deadline-ms", type=float, default=500.0)
+    offline.add_argument("--seed", type=int, default=0)
+    offline.set_defaults(func=bench_offline)
+
+    cassette = sub.add_parser("cassette", help="Record model traffic of games and replay it offline")
+    cassette.add_argument("--games", type=int, default=5)
+    cassette.add_argument("--max-turns", type=int, default=40)
+    cassette.add_argument("--latency", default="lognormal:20:0.5", help="Fake server latency distribution")
+    cassette.add_argument("--seed", type=int, default=0)
+    cassette.set_defaults(func=bench_cassette)
+
+    tournament = sub.add_parser("tournament", help="Process-pool tournament scaling and determinism")
+    tournament.add_argument("--agents", nargs="+", default=["policy", "random"])
+    tournament.add_argument("--players", type=int, default=2)
+    tournament.add_argument("--games", type=int, default=2000)
+    tournament.add_argument("--max-turns", type=int, default=100)
+    tournament.add_argument("--workers", type=int, nargs="+", default=[0, 1, os.cpu_count() or 1])
+    tournament.add_argument("--seed", type=int, default=0)
+    tournament.set_defaults(func=bench_tournament)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Board Analytics - Steady-state landing odds, expected rent and payback per tile
+
+Movement is modelled as a Markov chain over dice rolls that follows the
+engine's rules: doubles roll again, a third double goes to jail, Go To Jail
+and the jail card send you there, and Chance/Community Chest move cards
+(including "Go back 3 spaces") resolve recursively. Two engine quirks are
+kept: a double that ends in jail still rolls again, and escaping jail by
+doubles or bail is followed by a normal roll in the same turn. Ownable tiles
+are assumed to be owned, so landing on one after doubles rolls again.
+
+The chain is solved once per board/deck configuration and jail strategy and
+cached; every number below comes from that cached solution.
+"""
+
+import functools
+from dataclasses import dataclass
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from game_engine import (
+    TileType, TILE_CATALOG, CHANCE_CARDS, COMMUNITY_CARDS, COLOR_GROUPS,
+    RAILROAD_RENT, UTILITY_MULTIPLIER
+)
+
+
+BOARD_SIZE = 40
+JAIL = 10
+# Column of the resolve matrix for "sent to jail"
+_JAILED = BOARD_SIZE
+
+# Jail strategies: "roll" stays in jail rolling for doubles (forced bail on the
+# third miss), "pay" leaves at the start of the next turn
+JAIL_STRATEGIES = ("roll", "pay")
+
+# Chain states: Roll(pos, doubles so far, jailed flag) then Jail(pos, jail turns)
+_ROLL_STATES = 2 * 3 * BOARD_SIZE
+_NUM_STATES = _ROLL_STATES + 3 * BOARD_SIZE
+
+
+def _roll_state(doubles: int, jailed: int) -> slice:
+    start = (jailed * 3 + doubles) * BOARD_SIZE
+    return slice(start, start + BOARD_SIZE)
+
+
+def _jail_state(turns: int) -> slice:
+    start = _ROLL_STATES + turns * BOARD_SIZE
+    return slice(start, start + BOARD_SIZE)
+
+
+@dataclass(frozen=True)
+class LandingModel:
+    """Solved chain for one configuration. Arrays are read-only and indexed by position."""
+    landings_per_turn: np.ndarray   # expected moves ending on each tile per turn (jail counts as 10)
+    dice_per_turn: np.ndarray       # same, weighted by the dice total of the move (utility rent)
+    rolls_per_turn: float
+
+    @property
+    def landing_probability(self) -> np.ndarray:
+        """Share of all landings that end on each tile."""
+        return self.landings_per_turn / self.landings_per_turn.sum()
+
+
+def _dice_weights() -> Tuple[np.ndarray, np.ndarray]:
+    """Probability of each dice total (index 0-12), split into doubles and non-doubles."""
+    doubles, other = np.zeros(13), np.zeros(13)
+    for a in range(1, 7):
+        for b in range(1, 7):
+            (doubles if a == b else other)[a + b] += 1 / 36
+    return doubles, other
+
+
+def _shift(weights: np.ndarray) -> np.ndarray:
+    """40x40 matrix moving a token forward by each total with the given weights."""
+    eye = np.eye(BOARD_SIZE)
+    return sum(w * np.roll(eye, total, axis=1) for total, w in enumerate(weights) if w)
+
+
+def _resolve_matrix(board: Tuple[str, ...], chance: tuple, community: tuple) -> np.ndarray:
+    """40x41 matrix: where a token landing on each tile finally ends up (column 40 = jail)."""
+    decks = {TileType.CHANCE.value: chance, TileType.COMMUNITY_CHEST.value: community}
+    resolve = np.zeros((BOARD_SIZE, BOARD_SIZE + 1))
+
+    def land(row: int, pos: int, prob: float, depth: int):
+        kind = board[pos]
+        if kind == TileType.GO_TO_JAIL.value:
+            resolve[row, _JAILED] += prob
+        elif kind in decks and depth < 4:
+            deck = decks[kind]
+            for card_type, arg in deck:
+                share = prob / len(deck)
+                if card_type == "move":
+                    land(row, arg, share, depth + 1)
+                elif card_type == "move_back":
+                    land(row, (pos - arg) % BOARD_SIZE, share, depth + 1)
+                elif card_type == "go_to_jail":
+                    resolve[row, _JAILED] += share
+                else:
+                    resolve[row, pos] += share
+        else:
+            resolve[row, pos] += prob
+
+    for pos in range(BOARD_SIZE):
+        land(pos, pos, 1.0, 0)
+    return resolve
+
+
+@functools.lru_cache(maxsize=None)
+def _solve(board: Tuple[str, ...], chance: tuple, community: tuple, jail_strategy: str) -> LandingModel:
+    doubles, other = _dice_weights()
+    totals = np.arange(13)
+    resolve = _resolve_matrix(board, chance, community)
+    # Outcome of one roll from every position: final tile (0-39) or jail (40)
+    on_doubles = _shift(doubles) @ resolve
+    on_other = _shift(other) @ resolve
+    dice_doubles = _shift(doubles * totals) @ resolve
+    dice_other = _shift(other * totals) @ resolve
+
+    P = np.zeros((_NUM_STATES, _NUM_STATES))      # roll-to-roll transitions
+    ends_turn = np.zeros(_NUM_STATES)             # probability the roll ends the turn
+    landing = np.zeros((_NUM_STATES, BOARD_SIZE))
+    dice = np.zeros((_NUM_STATES, BOARD_SIZE))
+    jail_col = _jail_state(0).start + JAIL
+    next_turn = _roll_state(0, 0)
+
+    for jailed in (0, 1):
+        for d in range(3):
+            rows = _roll_state(d, jailed)
+            landing[rows] = on_doubles[:, :BOARD_SIZE] + on_other[:, :BOARD_SIZE]
+            dice[rows] = dice_doubles[:, :BOARD_SIZE] + dice_other[:, :BOARD_SIZE]
+            landing[rows, JAIL] += on_doubles[:, _JAILED] + on_other[:, _JAILED]
+
+            if d == 2:
+                # Third double: straight to jail, no move and no roll again
+                P[rows, jail_col] += doubles.sum()
+                ends_turn[rows] += doubles.sum()
+                landing[rows] -= on_doubles[:, :BOARD_SIZE]
+                landing[rows, JAIL] += doubles.sum() - on_doubles[:, _JAILED]
+                dice[rows] -= dice_doubles[:, :BOARD_SIZE]
+            else:
+                P[rows, _roll_state(d + 1, jailed)] += on_doubles[:, :BOARD_SIZE]
+                # Sent to jail on a double still rolls again, now flagged as jailed
+                P[rows, _roll_state(0, 1).start + JAIL] += on_doubles[:, _JAILED]
+
+            after = _jail_state(0) if jailed else next_turn
+            P[rows, after] += on_other[:, :BOARD_SIZE]
+            P[rows, jail_col] += on_other[:, _JAILED]
+            ends_turn[rows] += on_other.sum(axis=1)
+
+    for turns in range(3):
+        rows = _jail_state(turns)
+        if jail_strategy == "pay":
+            # Bail is paid at once and the turn continues with a normal roll
+            P[rows] = P[next_turn]
+            ends_turn[rows] = ends_turn[next_turn]
+            landing[rows] = landing[next_turn]
+            dice[rows] = dice[next_turn]
+            continue
+        stay = other.sum()
+        P[rows, next_turn] += np.eye(BOARD_SIZE) * doubles.sum()
+        if turns < 2:
+            P[rows, _jail_state(turns + 1)] += np.eye(BOARD_SIZE) * stay
+            ends_turn[rows] += stay
+        else:
+            # Third miss: forced bail, then a normal roll
+            P[rows, next_turn] += np.eye(BOARD_SIZE) * stay
+
+    # Stationary distribution over rolls: pi (P - I) = 0 with sum(pi) = 1
+    A = P.T - np.eye(_NUM_STATES)
+    A[-1] = 1.0
+    b = np.zeros(_NUM_STATES)
+    b[-1] = 1.0
+    pi = np.linalg.lstsq(A, b, rcond=None)[0]
+
+    turns_per_roll = pi @ ends_turn
+    model = LandingModel(landings_per_turn=(pi @ landing) / turns_per_roll,
+                         dice_per_turn=(pi @ dice) / turns_per_roll,
+                         rolls_per_turn=float(1 / turns_per_roll))
+    model.landings_per_turn.setflags(write=False)
+    model.dice_per_turn.setflags(write=False)
+    return model
+
+
+def landing_model(jail_strategy: str = "roll") -> LandingModel:
+    """Solved chain for the current board and decks (cached)."""
+    if jail_strategy not in JAIL_STRATEGIES:
+        raise ValueError(f"Unknown jail strategy: {jail_strategy}")
+    board = tuple(info.tile_type.value for info in TILE_CATALOG)
+    chance = tuple((c["type"], c.get("to", c.get("spaces"))) for c in CHANCE_CARDS)
+    community = tuple((c["type"], c.get("to", c.get("spaces"))) for c in COMMUNITY_CARDS)
+    return _solve(board, chance, community, jail_strategy)
+
+
+# ============================================================================
+# RENT AND PAYBACK
+# ============================================================================
+
+def _levels(position: int) -> List[Tuple[int, str, int]]:
+    """(level, label, rent or dice multiplier) for each way a tile can be held."""
+    info = TILE_CATALOG[position]
+    if info.tile_type == TileType.PROPERTY:
+        labels = ["no houses", "1 house", "2 houses", "3 houses", "4 houses", "hotel"]
+        return [(h, labels[h], info.rent[h]) for h in range(len(info.rent))]
+    if info.tile_type == TileType.RAILROAD:
+        return [(n, f"{n} railroad{'s' if n > 1 else ''} owned", rent) for n, rent in RAILROAD_RENT.items()]
+    if info.tile_type == TileType.UTILITY:
+        return [(n, f"{n} utilit{'ies' if n > 1 else 'y'} owned", mult) for n, mult in UTILITY_MULTIPLIER.items()]
+    return []
+
+
+def expected_rent(position: int, level: int = 0, jail_strategy: str = "roll") -> float:
+    """Rent one opponent is expected to pay per turn on this tile at the given level.
+
+    The level is houses for properties and the number owned for railroads and utilities.
+    """
+    return _expected_rent(landing_model(jail_strategy), position, level)
+
+
+def _expected_rent(model: LandingModel, position: int, level: int) -> float:
+    info = TILE_CATALOG[position]
+    if info.tile_type == TileType.UTILITY:
+        return float(model.dice_per_turn[position] * UTILITY_MULTIPLIER.get(level, 4))
+    if info.tile_type == TileType.RAILROAD:
+        return float(model.landings_per_turn[position] * RAILROAD_RENT.get(level, 25))
+    if info.tile_type == TileType.PROPERTY:
+        return float(model.landings_per_turn[position] * info.rent[min(level, 5)])
+    return 0.0
+
+
+def tile_analytics(position: int, jail_strategy: str = "roll") -> Dict[str, Any]:
+    """Landing odds of one tile and, if ownable, expected rent and payback per level."""
+    if not 0 <= position < BOARD_SIZE:
+        return {"error": "Invalid position"}
+    return _tile_analytics(landing_model(jail_strategy), position)
+
+
+def _tile_analytics(model: LandingModel, position: int) -> Dict[str, Any]:
+    info = TILE_CATALOG[position]
+    result = {
+        "position": position, "name": info.name,
+        "landing_probability": round(float(model.landing_probability[position]), 5),
+        "landings_per_turn": round(float(model.landings_per_turn[position]), 5),
+    }
+    levels = []
+    for level, label, rent in _levels(position):
+        investment = info.price + (level * info.house_cost if info.tile_type == TileType.PROPERTY else 0)
+        per_turn = _expected_rent(model, position, level)
+        levels.append({
+            "level": level, "label": label,
+            "rent": f"{rent}x dice" if info.tile_type == TileType.UTILITY else rent,
+            "investment": investment,
+            "expected_rent_per_turn": round(per_turn, 2),
+            "payback_turns": round(investment / per_turn, 1) if per_turn else None,
+        })
+    if levels:
+        result["levels"] = levels
+    return result
+
+
+def group_analytics(color: str, jail_strategy: str = "roll") -> Dict[str, Any]:
+    """Expected rent and payback of a whole color group built evenly to each level."""
+    if color not in COLOR_GROUPS:
+        return {"error": f"Unknown color group: {color}"}
+    return _group_analytics(landing_model(jail_strategy), color)
+
+
+def _group_analytics(model: LandingModel, color: str) -> Dict[str, Any]:
+    group = COLOR_GROUPS[color]
+    levels = []
+    for level in range(6):
+        investment = sum(TILE_CATALOG[pos].price + level * TILE_CATALOG[pos].house_cost for pos in group)
+        per_turn = sum(_expected_rent(model, pos, level) for pos in group)
+        levels.append({"level": level, "investment": investment,
+                       "expected_rent_per_turn": round(per_turn, 2),
+                       "payback_turns": round(investment / per_turn, 1) if per_turn else None})
+    return {"color": color, "positions": list(group),
+            "landing_probability": round(float(model.landing_probability[list(group)].sum()), 5),
+            "levels": levels}
+
+
+def board_analytics(jail_strategy: str = "roll") -> Dict[str, Any]:
+    """Every ownable tile and color group, with groups ranked by payback at 3 houses."""
+    model = landing_model(jail_strategy)
+    groups = [_group_analytics(model, color) for color in COLOR_GROUPS]
+    groups.sort(key=lambda g: g["levels"][3]["payback_turns"])
+    return {
+        "jail_strategy": jail_strategy,
+        "rolls_per_turn": round(model.rolls_per_turn, 4),
+        "tiles": [_tile_analytics(model, info.position) for info in TILE_CATALOG
+                  if info.tile_type in (TileType.PROPERTY, TileType.RAILROAD, TileType.UTILITY)],
+        "groups_by_payback": groups,
+        "note": "Rent and payback are per opponent turn; payback_turns = investment / expected rent.",
+    }
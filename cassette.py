@@ -0,0 +1,177 @@
+"""
+Cassettes - Record model conversations of a game and replay them without the model
+
+In record mode an agent's backend is wrapped so every chat-completion request
+and its answer (or error) is appended to a JSON lines file, after a header
+holding the game seed. In replay mode the wrapped backend answers from the
+file instantly, so the same seed gives the same game at engine speed.
+Every live request must equal the next one recorded for that agent; any
+difference raises CassetteMismatch rather than quietly diverging.
+
+    cassette = Cassette("game.cassette", "record", seed=7)
+    agent.backend = cassette.backend(agent.name, agent.backend)
+"""
+
+import json
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from model_backends import ModelBackend, BackendUnavailable
+
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMismatch(Exception):
+    """A live request differs from the recording, or the recording ran out or was not used up."""
+
+
+class RecordedError(Exception):
+    """Replays an error the backend raised while recording, so the agent takes the same fallback."""
+
+
+def _request(model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> Dict[str, Any]:
+    return {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens}
+
+
+def _difference(recorded: Dict[str, Any], live: Dict[str, Any]) -> str:
+    """The first field where two requests differ, down to the first differing message line."""
+    for field in ("model", "temperature", "max_tokens"):
+        if recorded[field] != live[field]:
+            return f"{field} {live[field]!r}, recorded {recorded[field]!r}"
+    if len(recorded["messages"]) != len(live["messages"]):
+        return f"{len(live['messages'])} messages, recorded {len(recorded['messages'])}"
+    for i, (old, new) in enumerate(zip(recorded["messages"], live["messages"])):
+        old_lines = old["content"].splitlines()
+        new_lines = new["content"].splitlines()
+        for j, (a, b) in enumerate(zip(old_lines, new_lines)):
+            if a != b:
+                return f"message {i} line {j}: {b.strip()!r}, recorded {a.strip()!r}"
+        if old != new:
+            return f"message {i} differs ({len(new_lines)} lines, recorded {len(old_lines)})"
+    return "requests differ"
+
+
+class Cassette:
+    """One game's model traffic in a JSON lines file; mode is 'record' or 'replay'.
+
+    Recording writes through, so a game that crashes still leaves the calls
+    made so far. meta is stored in the header (players, models, max turns)
+    and read back in replay.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", seed: Optional[int] = None,
+                 meta: Optional[Dict[str, Any]] = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.stats = {"recorded": 0, "replayed": 0}
+        self._served: Dict[str, int] = {}
+        self._tapes: Dict[str, Deque[Dict[str, Any]]] = {}
+        if mode == "record":
+            if seed is None:
+                raise ValueError("Recording needs the game seed so the game can be replayed")
+            self.seed = seed
+            self.meta = meta or {}
+            self._out = open(path, "w")
+            self._write({"cassette": CASSETTE_VERSION, "seed": seed, "meta": self.meta})
+        else:
+            self._out = None
+            with open(path) as f:
+                header = json.loads(f.readline())
+                if header.get("cassette") != CASSETTE_VERSION:
+                    raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+                self.seed = header["seed"]
+                self.meta = header.get("meta", {})
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._tapes.setdefault(entry["agent"], deque()).append(entry)
+
+    def backend(self, agent: str, inner: Optional[ModelBackend] = None) -> "CassetteBackend":
+        """A backend for agent's requests; recording forwards them to inner."""
+        if self.mode == "record" and inner is None:
+            raise ValueError("Recording needs the backend that answers the requests")
+        return CassetteBackend(self, agent, inner)
+
+    def remaining(self) -> int:
+        """Recorded requests not replayed yet."""
+        return sum(len(tape) for tape in self._tapes.values())
+
+    def verify_complete(self):
+        """Raise CassetteMismatch if a replayed game made fewer requests than were recorded."""
+        if self.mode == "replay" and self.remaining():
+            left = {agent: len(tape) for agent, tape in self._tapes.items() if tape}
+            raise CassetteMismatch(f"{self.remaining()} recorded requests were never made: {left}")
+
+    def close(self):
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+    def _write(self, entry: Dict[str, Any]):
+        self._out.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._out.flush()
+
+    def _record(self, agent: str, request: Dict[str, Any], response: Optional[str] = None,
+                error: Optional[Exception] = None):
+        entry = {"agent": agent, "request": request}
+        if error is None:
+            entry["response"] = response
+        else:
+            entry["error"] = {"type": type(error).__name__, "message": str(error)}
+        self._write(entry)
+        self.stats["recorded"] += 1
+
+    def _replay(self, agent: str, request: Dict[str, Any]) -> str:
+        tape = self._tapes.get(agent)
+        call = self._served[agent] = self._served.get(agent, 0) + 1
+        if not tape:
+            raise CassetteMismatch(f"{agent} made request {call} but only {call - 1} were recorded for it")
+        entry = tape.popleft()
+        self.stats["replayed"] += 1
+        if entry["request"] != request:
+            raise CassetteMismatch(f"{agent}'s request {call} does not match the recording: "
+                                   f"{_difference(entry['request'], request)}")
+        error = entry.get("error")
+        if error is None:
+            return entry["response"]
+        if error["type"] == BackendUnavailable.__name__:
+            raise BackendUnavailable(error["message"])
+        raise RecordedError(f"{error['type']}: {error['message']}")
+
+
+class CassetteBackend:
+    """Stands in for an agent's ModelBackend; see Cassette."""
+
+    def __init__(self, cassette: Cassette, agent: str, inner: Optional[ModelBackend] = None):
+        self.cassette = cassette
+        self.agent = agent
+        self.inner = inner
+
+    def complete(self, model: str, messages: List[Dict[str, str]], temperature: float,
+                 max_tokens: int, deadline: Optional[float] = None) -> str:
+        request = _request(model, messages, temperature, max_tokens)
+        if self.cassette.mode == "replay":
+            return self.cassette._replay(self.agent, request)
+        try:
+            response = self.inner.complete(model, messages, temperature, max_tokens, deadline)
+        except Exception as e:
+            self.cassette._record(self.agent, request, error=e)
+            raise
+        self.cassette._record(self.agent, request, response)
+        return response
+
+    async def acomplete(self, model: str, messages: List[Dict[str, str]], temperature: float,
+                        max_tokens: int, deadline: Optional[float] = None) -> str:
+        request = _request(model, messages, temperature, max_tokens)
+        if self.cassette.mode == "replay":
+            return self.cassette._replay(self.agent, request)
+        try:
+            response = await self.inner.acomplete(model, messages, temperature, max_tokens, deadline)
+        except Exception as e:
+            self.cassette._record(self.agent, request, error=e)
+            raise
+        self.cassette._record(self.agent, request, response)
+        return response
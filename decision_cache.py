@@ -0,0 +1,164 @@
+"""
+Decision Cache - Reuse model decisions for game situations that repeat
+
+Situations are keyed by a fingerprint of the features a decision depends on
+(phase, legal actions, the tile in play, cash bands, colour sets held)
+rather than the prompt text, whose recent messages and exact cash amounts
+make every prompt unique. Keys are namespaced by model and temperature.
+Entries live in an in-memory LRU, optionally backed by a SQLite file that
+later runs and other processes share.
+"""
+
+import json
+import bisect
+import sqlite3
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from game_engine import TILE_CATALOG, COLOR_GROUPS, TileType
+
+
+DEFAULT_CAPACITY = 10000
+# Upper edges of the cash bands a fingerprint sees instead of exact amounts
+MONEY_BANDS = (0, 50, 100, 150, 200, 300, 400, 500, 700, 1000, 1500, 2000)
+
+_POSITION_OF = {tile.name: tile.position for tile in TILE_CATALOG}
+
+
+def money_band(amount: int) -> int:
+    return bisect.bisect_left(MONEY_BANDS, amount)
+
+
+def _group_of(position: int) -> str:
+    tile = TILE_CATALOG[position]
+    if tile.tile_type == TileType.RAILROAD:
+        return "railroad"
+    if tile.tile_type == TileType.UTILITY:
+        return "utility"
+    return tile.color_group
+
+
+def _complete_sets(positions: List[int]) -> int:
+    owned = set(positions)
+    return sum(owned.issuperset(tiles) for tiles in COLOR_GROUPS.values())
+
+
+def situation(game_state: Dict, player_name: str, actions: List[str]) -> Dict[str, Any]:
+    """The features of a decision that its fingerprint is made from.
+
+    Holdings are summarized as complete colour sets, plus who holds how much
+    of the group of the tile in play; exact cash becomes a band.
+    """
+    players = game_state["players"]
+    me = players[player_name]
+    others = [p for name, p in players.items() if name != player_name and not p.get("bankrupt")]
+    mine = me.get("property_positions", [])
+
+    features = {
+        "phase": game_state.get("phase"),
+        "actions": sorted(actions),
+        "money": money_band(me["money"]),
+        "in_jail": me.get("in_jail", False),
+        "jail_turns": me.get("jail_turns", 0) if me.get("in_jail") else 0,
+        "jail_card": me.get("jail_cards", 0) > 0,
+        "sets": _complete_sets(mine),
+        "their_sets": max((_complete_sets(p.get("property_positions", [])) for p in others), default=0),
+        "opponents": len(others),
+    }
+    auction = game_state.get("auction")
+    tile = TILE_CATALOG[_POSITION_OF[auction["property"]]] if auction else TILE_CATALOG[me["position"]]
+    if tile.price:
+        group = _group_of(tile.position)
+        features["tile"] = tile.position
+        features["after_price"] = money_band(me["money"] - tile.price)
+        features["group_mine"] = sum(_group_of(pos) == group for pos in mine)
+        features["group_theirs"] = max((sum(_group_of(pos) == group for pos in p.get("property_positions", []))
+                                        for p in others), default=0)
+    if auction:
+        features["bid"] = money_band(auction["current_bid"])
+        features["leading"] = auction["current_bidder"] == player_name
+    return features
+
+
+def fingerprint(game_state: Dict, player_name: str, actions: List[str]) -> str:
+    features = situation(game_state, player_name, actions)
+    return hashlib.blake2b(json.dumps(features, sort_keys=True, separators=(",", ":")).encode(),
+                           digest_size=16).hexdigest()
+
+
+class DecisionCache:
+    """LRU of decisions by (model, temperature, fingerprint), with an optional shared SQLite store.
+
+    Decisions sampled above max_temperature are neither served nor stored, so
+    a cache can be limited to near-deterministic models.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, path: Optional[str] = None,
+                 max_temperature: Optional[float] = None):
+        self.capacity = capacity
+        self.path = path
+        self.max_temperature = max_temperature
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "bypassed": 0,
+                      "rejected": 0}
+        self.db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self.db = sqlite3.connect(path, isolation_level=None, timeout=30, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS decisions (key TEXT PRIMARY KEY, decision TEXT NOT NULL)")
+
+    def key(self, model: str, temperature: float, game_state: Dict, player_name: str,
+            actions: List[str]) -> Optional[str]:
+        """Cache key of a decision, or None if this model and temperature are not cached."""
+        if self.max_temperature is not None and temperature > self.max_temperature:
+            self.stats["bypassed"] += 1
+            return None
+        return f"{model}|{temperature:g}|{fingerprint(game_state, player_name, actions)}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        decision = self._entries.get(key)
+        if decision is not None:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return decision
+        if self.db is not None:
+            row = self.db.execute("SELECT decision FROM decisions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                decision = json.loads(row[0])
+                self._remember(key, decision)
+                self.stats["hits"] += 1
+                self.stats["disk_hits"] += 1
+                return decision
+        self.stats["misses"] += 1
+        return None
+
+    def reject(self):
+        """Count a hit the caller could not use (a stale bid amount) as a miss instead."""
+        self.stats["hits"] -= 1
+        self.stats["misses"] += 1
+        self.stats["rejected"] += 1
+
+    def put(self, key: str, decision: Dict[str, Any]):
+        self._remember(key, decision)
+        self.stats["stores"] += 1
+        if self.db is not None:
+            self.db.execute("INSERT OR REPLACE INTO decisions VALUES (?, ?)",
+                            (key, json.dumps(decision, separators=(",", ":"))))
+
+    def _remember(self, key: str, decision: Dict[str, Any]):
+        self._entries[key] = decision
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {"entries": len(self._entries), "capacity": self.capacity, **self.stats,
+                "hit_rate": self.stats["hits"] / lookups if lookups else None}
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
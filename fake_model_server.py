@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Fake Model Server - A local OpenAI-compatible chat-completions endpoint for offline load tests
+
+Standard library only. Point OllamaAgent(host=...) or OpenAIAgent(base_url=...)
+at it to exercise agents, concurrency, caching and fallbacks without a real
+model. Answers are chosen from the AVAILABLE ACTIONS in the prompt and
+wrapped according to a response policy (plain JSON, fenced code block, JSON
+inside prose, or malformed text). Latency follows a configurable distribution,
+a share of requests can fail with HTTP errors or hang, and "stream": true
+requests get server-sent event chunks.
+
+    python fake_model_server.py --port 11434 --latency lognormal:200:0.5 \\
+        --policy valid=0.85,fenced=0.05,malformed=0.1 --errors 500=0.02,429=0.01
+"""
+
+import ast
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Dict, List, Optional, Tuple
+
+
+POLICIES = ("valid", "fenced", "prose", "malformed")
+# Actions the answers prefer when several are legal
+PREFERENCE = ("buy_property", "pay_jail_bail", "roll_dice_and_move", "roll_for_doubles",
+              "pass_auction", "end_turn", "decline_purchase")
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """'a=0.8,b=0.2' to {'a': 0.8, 'b': 0.2}."""
+    mix = {}
+    for item in filter(None, spec.split(",")):
+        key, _, weight = item.partition("=")
+        mix[key.strip()] = float(weight)
+    return mix
+
+
+class Latency:
+    """Response time distribution: 'fixed:MS', 'uniform:LOW:HIGH' or 'lognormal:MEDIAN:SIGMA' (milliseconds)."""
+
+    def __init__(self, spec: str = "fixed:0"):
+        kind, *values = spec.split(":")
+        if kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+        self.kind = kind
+        self.values = [float(v) for v in values]
+        self.spec = spec
+
+    def sample(self, rng: random.Random) -> float:
+        """Seconds."""
+        if self.kind == "fixed":
+            ms = self.values[0]
+        elif self.kind == "uniform":
+            ms = rng.uniform(*self.values)
+        else:
+            median, sigma = self.values
+            ms = median * math.exp(rng.gauss(0, sigma))
+        return ms / 1000
+
+
+def choose_action(prompt: str) -> Dict[str, Any]:
+    """A legal decision for the prompt built by get_action_prompt."""
+    actions: List[str] = []
+    name = ""
+    for line in prompt.splitlines():
+        if line.startswith("AVAILABLE ACTIONS:"):
+            try:
+                actions = ast.literal_eval(line.split(":", 1)[1].strip())
+            except (ValueError, SyntaxError):
+                actions = []
+        elif line.startswith("- Your name:"):
+            name = line.split(":", 1)[1].strip()
+    bases = {a.split(" ")[0]: a for a in actions}
+    action = next((a for a in PREFERENCE if a in bases), None)
+    if action is None:
+        if not actions:
+            return {"action": "end_turn", "params": {}}
+        action = actions[0].split(" ")[0]
+    params: Dict[str, Any] = {}
+    if action in ("pass_auction", "place_bid"):
+        params["player_name"] = name
+    elif action == "build_house":
+        positions = ast.literal_eval(bases[action].split("positions:", 1)[1].rstrip(")").strip())
+        params["property_position"] = positions[0]
+    return {"action": action, "params": params}
+
+
+def render(decision: Dict[str, Any], policy: str) -> str:
+    """The model's text for a decision under a response policy."""
+    body = json.dumps(decision)
+    if policy == "fenced":
+        return f"```json\n{body}\n```"
+    if policy == "prose":
+        return f"Looking at my cash and the board, this is my move: {body} Good luck!"
+    if policy == "malformed":
+        return "I would probably " + decision["action"].replace("_", " ") + ", it seems like a good idea."
+    return body
+
+
+class FakeModelServer(ThreadingHTTPServer):
+    """The HTTP server; its attributes can be changed while it runs (outage, policies, errors)."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency: str = "fixed:0", policy: str = "valid=1",
+                 errors: str = "", stall_rate: float = 0.0, stall_ms: float = 0.0,
+                 seed: Optional[int] = None, model: str = "fake"):
+        super().__init__(address, _Handler)
+        self.latency = Latency(latency)
+        self.policies = parse_mix(policy)
+        unknown = set(self.policies) - set(POLICIES)
+        if unknown:
+            raise ValueError(f"Unknown response policies: {sorted(unknown)}")
+        self.errors = {int(status): rate for status, rate in parse_mix(errors).items()}
+        self.stall_rate = stall_rate
+        self.stall_ms = stall_ms
+        # While True every request hangs for stall_ms, like a backend that stopped answering
+        self.outage = False
+        self.model = model
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "streamed": 0, "errors": 0, "stalls": 0,
+                      **{f"policy_{p}": 0 for p in POLICIES}}
+
+    @property
+    def url(self) -> str:
+        """Base URL for OpenAI(base_url=...); OllamaAgent takes the part before /v1."""
+        return f"http://{self.server_address[0]}:{self.server_address[1]}/v1"
+
+    def plan(self) -> Tuple[float, Optional[int], str]:
+        """(delay seconds, error status or None, response policy) for one request."""
+        with self._lock:
+            self.stats["requests"] += 1
+            rng = self.rng
+            if self.outage or rng.random() < self.stall_rate:
+                self.stats["stalls"] += 1
+                delay = self.stall_ms / 1000
+            else:
+                delay = self.latency.sample(rng)
+            roll = rng.random()
+            status = None
+            for code, rate in self.errors.items():
+                if roll < rate:
+                    status = code
+                    self.stats["errors"] += 1
+                    break
+                roll -= rate
+            policy = rng.choices(list(self.policies), weights=list(self.policies.values()))[0]
+            self.stats[f"policy_{policy}"] += 1
+        return delay, status, policy
+
+    def start(self) -> "FakeModelServer":
+        """Serve from a daemon thread; shutdown() stops it."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: FakeModelServer
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._json(200, {"object": "list", "data": [{"id": self.server.model, "object": "model"}]})
+        elif self.path.rstrip("/").endswith("/stats"):
+            self._json(200, self.server.stats)
+        else:
+            self._json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        delay, status, policy = self.server.plan()
+        time.sleep(delay)
+        if status is not None:
+            self._json(status, {"error": {"message": f"Simulated {status}", "type": "server_error"}})
+            return
+        prompt = next((m["content"] for m in reversed(request.get("messages", [])) if m.get("role") == "user"), "")
+        content = render(choose_action(prompt), policy)
+        model = request.get("model", self.server.model)
+        if request.get("stream"):
+            self._stream(model, content)
+            return
+        self._json(200, {
+            "id": f"chatcmpl-{self.server.stats['requests']}", "object": "chat.completion",
+            "created": int(time.time()), "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                      "total_tokens": (len(prompt) + len(content)) // 4},
+        })
+
+    def _stream(self, model: str, content: str):
+        with self.server._lock:
+            self.server.stats["streamed"] += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        created = int(time.time())
+        pieces = [content[i:i + 16] for i in range(0, len(content), 16)]
+        try:
+            for i, piece in enumerate(pieces + [None]):
+                delta = {"content": piece} if piece is not None else {}
+                if i == 0:
+                    delta["role"] = "assistant"
+                chunk = {"id": "chatcmpl-stream", "object": "chat.completion.chunk", "created": created,
+                         "model": model, "choices": [{"index": 0, "delta": delta,
+                                                      "finish_reason": None if piece is not None else "stop"}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+        except OSError:
+            pass
+
+    def _json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass  # the client stopped waiting
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible chat-completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434, help="11434 stands in for Ollama's default host")
+    parser.add_argument("--latency", default="fixed:0",
+                        help="fixed:MS, uniform:LOW:HIGH or lognormal:MEDIAN:SIGMA (milliseconds)")
+    parser.add_argument("--policy", default="valid=1",
+                        help=f"Response mix, e.g. valid=0.8,fenced=0.1,malformed=0.1 (of {', '.join(POLICIES)})")
+    parser.add_argument("--errors", default="", help="HTTP error mix, e.g. 500=0.02,429=0.01")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="Share of requests that hang")
+    parser.add_argument("--stall-ms", type=float, default=30000.0, help="How long a hung request takes")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = FakeModelServer((args.host, args.port), args.latency, args.policy, args.errors,
+                             args.stall_rate, args.stall_ms, args.seed)
+    print(f"Fake model server at {server.url} (latency {args.latency}, policy {args.policy})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,14 @@
 Monopoly Game Engine - Core game logic for MCP server
 """
 
+import copy
 import random
-from enum import Enum
-from typing import Dict, List, Any, Optional
+import functools
+from array import array
+from collections.abc import Mapping
+from collections import deque
+from enum import Enum, IntEnum
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
 
@@ -30,47 +35,6 @@ class TileType(Enum):
     GO_TO_JAIL = "go_to_jail"
 
 
-@dataclass
-class Property:
-    position: int
-    name: str
-    tile_type: TileType
-    price: int = 0
-    mortgage_value: int = 0
-    color_group: str = ""
-    house_cost: int = 0
-    rent: List[int] = field(default_factory=list)
-    owner: Optional[str] = None
-    houses: int = 0
-    is_mortgaged: bool = False
-
-    def get_rent(self, dice_roll: int = 0, railroads_owned: int = 1, utilities_owned: int = 1) -> int:
-        if self.is_mortgaged:
-            return 0
-        if self.tile_type == TileType.PROPERTY:
-            return self.rent[min(self.houses, 5)]
-        elif self.tile_type == TileType.RAILROAD:
-            rr_rent = {1: 25, 2: 50, 3: 100, 4: 200}
-            return rr_rent.get(railroads_owned, 25)
-        elif self.tile_type == TileType.UTILITY:
-            multiplier = 10 if utilities_owned == 2 else 4
-            return dice_roll * multiplier
-        return 0
-
-
-@dataclass
-class Player:
-    name: str
-    money: int = 1500
-    position: int = 0
-    in_jail: bool = False
-    jail_turns: int = 0
-    jail_cards: int = 0
-    properties: List[int] = field(default_factory=list)
-    bankrupt: bool = False
-    doubles_count: int = 0
-
-
 @dataclass 
 class Auction:
     property_pos: int
@@ -79,6 +43,22 @@ class Auction:
     passed_players: List[str] = field(default_factory=list)
 
 
+@dataclass
+class UndoToken:
+    """Reversible delta of one action applied with MonopolyGame.apply()."""
+    action: str
+    params: Dict[str, Any]
+    result: Dict[str, Any] = field(default_factory=dict)
+    writes: List[tuple] = field(default_factory=list)   # (buffer, index, old value)
+    scalars: tuple = ()
+    rng: Optional[tuple] = None                         # (draws, rng state) before the first draw
+
+
+UNDO_HISTORY = 256
+# Versions handed out to clients that get_state_since() can still diff against
+STATE_HISTORY = 32
+
+
 TILE_DATA = {
     0: {"name": "GO", "type": TileType.GO},
     1: {"name": "Mediterranean Avenue", "type": TileType.PROPERTY, "price": 60, "mortgage": 30, "color": "brown", "house_cost": 50, "rent": [2, 10, 30, 90, 160, 250]},
@@ -128,6 +108,11 @@ COLOR_GROUPS = {
     "green": [31, 32, 34], "dark_blue": [37, 39]
 }
 
+# Bitmasks over board positions used by the ownership index
+_RAILROAD_MASK = sum(1 << pos for pos, data in TILE_DATA.items() if data["type"] == TileType.RAILROAD)
+_UTILITY_MASK = sum(1 << pos for pos, data in TILE_DATA.items() if data["type"] == TileType.UTILITY)
+_GROUP_MASKS = {color: sum(1 << pos for pos in group) for color, group in COLOR_GROUPS.items()}
+
 CHANCE_CARDS = [
     {"type": "move", "to": 0, "text": "Advance to GO"},
     {"type": "move", "to": 24, "text": "Advance to Illinois Avenue"},
@@ -154,45 +139,720 @@ COMMUNITY_CARDS = [
     {"type": "money", "amount": -150, "text": "Pay school fees $150"},
 ]
 
+# Rent of a railroad by railroads owned, and utility dice multiplier by utilities owned
+RAILROAD_RENT = {1: 25, 2: 50, 3: 100, 4: 200}
+UTILITY_MULTIPLIER = {1: 4, 2: 10}
+
+
+@dataclass(frozen=True, slots=True)
+class TileInfo:
+    """Static data of one board tile, shared by every game."""
+    position: int
+    name: str
+    tile_type: TileType
+    price: int = 0
+    mortgage_value: int = 0
+    color_group: str = ""
+    house_cost: int = 0
+    rent: Tuple[int, ...] = ()
+    tax: int = 0
+
+
+TILE_CATALOG: Tuple[TileInfo, ...] = tuple(
+    TileInfo(
+        position=pos,
+        name=data["name"],
+        tile_type=data["type"],
+        price=data.get("price", 0),
+        mortgage_value=data.get("mortgage", 0),
+        color_group=data.get("color", ""),
+        house_cost=data.get("house_cost", 0),
+        rent=tuple(data.get("rent", ())),
+        tax=data.get("amount", 0)
+    )
+    for pos, data in sorted(TILE_DATA.items())
+)
+
+
+# ============================================================================
+# PER-GAME STATE VIEWS
+# ============================================================================
+# A game keeps its mutable state in flat arrays (see MonopolyGame.initialize).
+# Property and Player are lightweight views over one slot of those arrays, so
+# the usual attribute API keeps working without allocating per-game objects.
+# All writes go through MonopolyGame._write so apply()/undo() can journal them.
+
+# Byte offsets of the per-player fields in MonopolyGame._pstate
+_POSITION, _IN_JAIL, _JAIL_TURNS, _JAIL_CARDS, _BANKRUPT, _DOUBLES = range(6)
+_PLAYER_FIELDS = 6
+
+
+def _catalog_field(name: str) -> property:
+    return property(lambda self: getattr(self._info, name))
+
+
+def _player_field(offset: int, as_bool: bool = False) -> property:
+    def fget(self):
+        value = self._game._pstate[self._idx * _PLAYER_FIELDS + offset]
+        return bool(value) if as_bool else value
+
+    def fset(self, value):
+        self._game._write(self._game._pstate, self._idx * _PLAYER_FIELDS + offset, value)
+
+    return property(fget, fset)
+
+
+class Property:
+    """A board tile of one game."""
+    __slots__ = ("_game", "_info")
+
+    def __init__(self, game: "MonopolyGame", position: int):
+        self._game = game
+        self._info = TILE_CATALOG[position]
+
+    position = _catalog_field("position")
+    name = _catalog_field("name")
+    tile_type = _catalog_field("tile_type")
+    price = _catalog_field("price")
+    mortgage_value = _catalog_field("mortgage_value")
+    color_group = _catalog_field("color_group")
+    house_cost = _catalog_field("house_cost")
+    rent = _catalog_field("rent")
+
+    @property
+    def owner(self) -> Optional[str]:
+        idx = self._game._owner[self._info.position]
+        return self._game.player_order[idx - 1] if idx else None
+
+    @owner.setter
+    def owner(self, name: Optional[str]):
+        game, pos = self._game, self._info.position
+        old = game._owner[pos]
+        if old:
+            game._write(game._owned, old - 1, game._owned[old - 1] & ~(1 << pos))
+        new = 0 if name is None else game._player_index[name] + 1
+        if new:
+            game._write(game._owned, new - 1, game._owned[new - 1] | 1 << pos)
+        game._write(game._owner, pos, new)
+
+    @property
+    def houses(self) -> int:
+        return self._game._houses[self._info.position]
+
+    @houses.setter
+    def houses(self, value: int):
+        game, bit = self._game, 1 << self._info.position
+        game._write(game._houses, self._info.position, value)
+        for level in range(1, 6):
+            built = game._built[level] | bit if value >= level else game._built[level] & ~bit
+            if built != game._built[level]:
+                game._write(game._built, level, built)
+
+    @property
+    def is_mortgaged(self) -> bool:
+        return bool(self._game._mortgaged[self._info.position])
+
+    @is_mortgaged.setter
+    def is_mortgaged(self, value: bool):
+        self._game._write(self._game._mortgaged, self._info.position, value)
+
+    def __repr__(self) -> str:
+        return f"Property({self.position}, {self.name!r}, owner={self.owner!r}, houses={self.houses})"
+
+    def get_rent(self, dice_roll: int = 0, railroads_owned: int = 1, utilities_owned: int = 1) -> int:
+        if self.is_mortgaged:
+            return 0
+        if self.tile_type == TileType.PROPERTY:
+            return self.rent[min(self.houses, 5)]
+        elif self.tile_type == TileType.RAILROAD:
+            return RAILROAD_RENT.get(railroads_owned, 25)
+        elif self.tile_type == TileType.UTILITY:
+            return dice_roll * UTILITY_MULTIPLIER.get(utilities_owned, 4)
+        return 0
+
+
+class Player:
+    """A player of one game."""
+    __slots__ = ("_game", "_idx")
+
+    def __init__(self, game: "MonopolyGame", idx: int):
+        self._game = game
+        self._idx = idx
+
+    position = _player_field(_POSITION)
+    in_jail = _player_field(_IN_JAIL, as_bool=True)
+    jail_turns = _player_field(_JAIL_TURNS)
+    jail_cards = _player_field(_JAIL_CARDS)
+    bankrupt = _player_field(_BANKRUPT, as_bool=True)
+    doubles_count = _player_field(_DOUBLES)
+
+    @property
+    def name(self) -> str:
+        return self._game.player_order[self._idx]
+
+    @property
+    def money(self) -> int:
+        return self._game._money[self._idx]
+
+    @money.setter
+    def money(self, value: int):
+        self._game._write(self._game._money, self._idx, value)
+
+    @property
+    def properties(self) -> List[int]:
+        owned = self._game._owned[self._idx]
+        return [pos for pos in range(len(self._game._owner)) if owned >> pos & 1]
+
+    def __repr__(self) -> str:
+        return f"Player({self.name!r}, money={self.money}, position={self.position})"
+
+
+class _PlayerMap(Mapping):
+    """Read-only name -> Player mapping over a game's player arrays."""
+    __slots__ = ("_game",)
+
+    def __init__(self, game: "MonopolyGame"):
+        self._game = game
+
+    def __getitem__(self, name: str) -> Player:
+        return Player(self._game, self._game._player_index[name])
+
+    def __contains__(self, name) -> bool:
+        return name in self._game._player_index
+
+    def __iter__(self):
+        return iter(self._game._player_index)
+
+    def __len__(self) -> int:
+        return len(self._game._player_index)
+
+
+class _TileMap(Mapping):
+    """Read-only position -> Property mapping over a game's board arrays."""
+    __slots__ = ("_game",)
+
+    def __init__(self, game: "MonopolyGame"):
+        self._game = game
+
+    def __getitem__(self, position: int) -> Property:
+        if type(position) is not int or not 0 <= position < len(self._game._owner):
+            raise KeyError(position)
+        return Property(self._game, position)
+
+    def __contains__(self, position) -> bool:
+        return type(position) is int and 0 <= position < len(self._game._owner)
+
+    def __iter__(self):
+        return iter(range(len(self._game._owner)))
+
+    def __len__(self) -> int:
+        return len(self._game._owner)
+
+
+# ============================================================================
+# GAME EVENTS
+# ============================================================================
+# The engine records what happens as small integer tuples (kind, a, b, c) in a
+# ring buffer and only renders them to text when somebody reads messages.
+
+EVENT_BUFFER_SIZE = 50
+
+
+class EventKind(IntEnum):
+    GAME_STARTED = 0        # -
+    ROLLED = 1              # player, die 1, die 2
+    PASSED_GO = 2           # player
+    LANDED = 3              # player, position
+    PAID_TAX = 4            # player, amount
+    PAID_RENT = 5           # player, owner, amount
+    DREW_CARD = 6           # player, deck (0 chance, 1 community chest), card index
+    SENT_TO_JAIL = 7        # player, reason index into JAIL_REASONS
+    BOUGHT = 8              # player, position, price
+    AUCTION_STARTED = 9     # position
+    BID = 10                # player, amount
+    PASSED_AUCTION = 11     # player
+    AUCTION_WON = 12        # player, position, price
+    AUCTION_NO_BIDS = 13    # position
+    PAID_BAIL = 14          # player
+    USED_JAIL_CARD = 15     # player
+    JAIL_ROLL = 16          # player, die 1, die 2
+    ESCAPED_JAIL = 17       # player
+    FORCED_BAIL = 18        # player
+    BUILT = 19              # player, position, houses
+    MORTGAGED = 20          # player, position, amount
+    UNMORTGAGED = 21        # player, position, cost
+    BANKRUPT = 22           # player
+
+
+JAIL_REASONS = ("three doubles", "landed on Go To Jail", "card")
+
+
+def _building(houses: int) -> str:
+    return "hotel" if houses == 5 else f"{houses} house(s)"
+
+
+_EVENT_TEXT = {
+    EventKind.GAME_STARTED: lambda n, a, b, c: f"Game started with players: {', '.join(n)}",
+    EventKind.ROLLED: lambda n, a, b, c: f"{n[a]} rolled [{b}][{c}] = {b + c}" + (" DOUBLES!" if b == c else ""),
+    EventKind.PASSED_GO: lambda n, a, b, c: f"{n[a]} passed GO and collected $200",
+    EventKind.LANDED: lambda n, a, b, c: f"{n[a]} landed on {TILE_CATALOG[b].name}",
+    EventKind.PAID_TAX: lambda n, a, b, c: f"{n[a]} paid ${b} tax",
+    EventKind.PAID_RENT: lambda n, a, b, c: f"{n[a]} paid ${c} rent to {n[b]}",
+    EventKind.DREW_CARD: lambda n, a, b, c: f"{n[a]} drew: {(COMMUNITY_CARDS if b else CHANCE_CARDS)[c]['text']}",
+    EventKind.SENT_TO_JAIL: lambda n, a, b, c: f"{n[a]} sent to jail ({JAIL_REASONS[b]})",
+    EventKind.BOUGHT: lambda n, a, b, c: f"{n[a]} bought {TILE_CATALOG[b].name} for ${c}",
+    EventKind.AUCTION_STARTED: lambda n, a, b, c: f"Auction started for {TILE_CATALOG[a].name}",
+    EventKind.BID: lambda n, a, b, c: f"{n[a]} bid ${b}",
+    EventKind.PASSED_AUCTION: lambda n, a, b, c: f"{n[a]} passed on auction",
+    EventKind.AUCTION_WON: lambda n, a, b, c: f"{n[a]} won {TILE_CATALOG[b].name} for ${c}",
+    EventKind.AUCTION_NO_BIDS: lambda n, a, b, c: f"No bids for {TILE_CATALOG[a].name}",
+    EventKind.PAID_BAIL: lambda n, a, b, c: f"{n[a]} paid $50 bail",
+    EventKind.USED_JAIL_CARD: lambda n, a, b, c: f"{n[a]} used Get Out of Jail Free card",
+    EventKind.JAIL_ROLL: lambda n, a, b, c: f"{n[a]} rolled [{b}][{c}] trying for doubles",
+    EventKind.ESCAPED_JAIL: lambda n, a, b, c: f"{n[a]} rolled doubles and escaped jail!",
+    EventKind.FORCED_BAIL: lambda n, a, b, c: f"{n[a]} forced to pay $50 after 3 turns",
+    EventKind.BUILT: lambda n, a, b, c: f"{n[a]} built on {TILE_CATALOG[b].name} - now has {_building(c)}",
+    EventKind.MORTGAGED: lambda n, a, b, c: f"{n[a]} mortgaged {TILE_CATALOG[b].name} for ${c}",
+    EventKind.UNMORTGAGED: lambda n, a, b, c: f"{n[a]} unmortgaged {TILE_CATALOG[b].name} for ${c}",
+    EventKind.BANKRUPT: lambda n, a, b, c: f"{n[a]} is BANKRUPT!",
+}
+
+
+# ============================================================================
+# RANDOMNESS AND ACTION RECORDING
+# ============================================================================
+
+# Random bytes below 252 map uniformly onto die faces; the rest are rejected
+_FACE_TABLE = bytes(b % 6 + 1 for b in range(256))
+_REJECTED_BYTES = bytes(range(252, 256))
+
+
+class DiceStream:
+    """Two-dice rolls from a game's RNG, optionally pre-generated in blocks."""
+
+    def __init__(self, rng: random.Random, block: int = 0):
+        self.rng = rng
+        self.block = block
+        self._faces = b""
+        self._next = 0
+
+    def roll(self) -> tuple:
+        if not self.block:
+            return self.rng.randint(1, 6), self.rng.randint(1, 6)
+        if self._next + 2 > len(self._faces):
+            self._refill()
+        i = self._next
+        self._next = i + 2
+        return self._faces[i], self._faces[i + 1]
+
+    def _refill(self):
+        faces = self._faces[self._next:]
+        while len(faces) < 2 * self.block:
+            faces += self.rng.randbytes(2 * self.block).translate(_FACE_TABLE, _REJECTED_BYTES)
+        self._faces = faces
+        self._next = 0
+
+
+# Public actions by tool name: engine method and its (param, default) pairs
+ACTIONS: Dict[str, Tuple[str, Tuple[Tuple[str, Any], ...]]] = {
+    "roll_dice_and_move": ("roll_and_move", ()),
+    "buy_property": ("buy_current_property", ()),
+    "decline_purchase": ("decline_purchase", ()),
+    "place_bid": ("place_bid", (("player_name", ""), ("amount", 0))),
+    "pass_auction": ("pass_auction", (("player_name", ""),)),
+    "pay_jail_bail": ("pay_bail", ()),
+    "use_jail_card": ("use_jail_card", ()),
+    "roll_for_doubles": ("roll_for_doubles", ()),
+    "build_house": ("build_house", (("property_position", 0),)),
+    "mortgage_property": ("mortgage_property", (("property_position", 0),)),
+    "unmortgage_property": ("unmortgage_property", (("property_position", 0),)),
+    "end_turn": ("end_turn", ()),
+}
+
+
+def _step_error(step: Any) -> Optional[str]:
+    """Why a batch step cannot run, checked against ACTIONS before any step runs; None if it can."""
+    if not isinstance(step, dict) or "action" not in step:
+        return "expected {\"action\": ..., \"params\": {...}}"
+    if step["action"] not in ACTIONS:
+        return f"Unknown action: {step['action']}"
+    params = step.get("params")
+    if params is None:
+        return None
+    if not isinstance(params, dict):
+        return "params must be an object"
+    for name, default in ACTIONS[step["action"]][1]:
+        value = params.get(name, default)
+        if type(value) is not type(default):
+            return f"{name} must be {type(default).__name__}, got {type(value).__name__}"
+    return None
+
+
+def _recorded(action: str):
+    """Append every call of a public action to the game's action log.
+
+    A call that raises is taken out of the log again, so replays and journals
+    only see actions that completed.
+    """
+    def decorate(method):
+        params = method.__code__.co_varnames[1:method.__code__.co_argcount]
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if kwargs:
+                args += tuple(kwargs[name] for name in params[len(args):])
+            log = self.action_log
+            if log is not None:
+                length = len(log)
+                log.append((action, *args))
+            try:
+                result = method(self, *args)
+            except BaseException:
+                if log is not None:
+                    del log[length:]
+                raise
+            if "error" not in result:
+                self.version += 1
+            return result
+        return wrapper
+    return decorate
+
 
 class MonopolyGame:
-    def __init__(self, player_names: List[str]):
-        self.players: Dict[str, Player] = {}
+    # Mutable per-game buffers; fork() copies these and shares everything static
+    _BUFFERS = ("_money", "_pstate", "_owner", "_houses", "_mortgaged", "_owned", "_built",
+                "chance_deck", "community_deck")
+    # Set on the instance only when used, so a fresh game stays within the
+    # attributes CPython stores inline instead of in a full __dict__:
+    # (version, snapshot) pairs for get_state_since(), from the first _issue_version()
+    _snapshots: Optional[deque] = None
+    # Write journal and token of the apply() in progress
+    _journal: Optional[List[tuple]] = None
+    _applying: Optional["UndoToken"] = None
+    # Actions taken before action_log[0]; games restored from a persistence
+    # snapshot keep only the actions since it
+    action_log_start = 0
+
+    def __init__(self, player_names: List[str], seed: Optional[int] = None,
+                 rng: Optional[random.Random] = None, dice_block: int = 0, record_actions: bool = True,
+                 capture_events: bool = True):
         self.player_order: List[str] = player_names
         self.current_player_idx: int = 0
         self.phase: GamePhase = GamePhase.WAITING_FOR_ROLL
-        self.tiles: Dict[int, Property] = {}
         self.last_dice: tuple = (0, 0)
         self.auction: Optional[Auction] = None
         self.turn_number: int = 0
-        self.messages: List[str] = []
-        
-        self.chance_deck = CHANCE_CARDS.copy()
-        self.community_deck = COMMUNITY_CARDS.copy()
-        random.shuffle(self.chance_deck)
-        random.shuffle(self.community_deck)
+        # Ring buffer of (kind, a, b, c) events; None switches capture off
+        self.events: Optional[deque] = deque(maxlen=EVENT_BUFFER_SIZE) if capture_events else None
+        self._event_seq = 0
+        # Bumped by every successful action
+        self.version = 0
+
+        # Every game owns its RNG; without an explicit one it is seeded so the
+        # game can be replayed later
+        if rng is None and seed is None:
+            seed = random.getrandbits(63)
+        self.seed: Optional[int] = seed if rng is None else None
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.dice = DiceStream(self.rng, dice_block)
+        # Engine draws go through _roll_dice/_shuffled, which count them here;
+        # fork() keeps the last (draws, rng state) it captured
+        self._rng_draws = 0
+        self._rng_snapshot: Optional[tuple] = None
+        # Tokens that can be undone
+        self._undo_stack: deque = deque(maxlen=UNDO_HISTORY)
+        self.action_log: Optional[List[tuple]] = [] if record_actions else None
+
+        # Decks hold indices into CHANCE_CARDS / COMMUNITY_CARDS, top card first
+        self.chance_deck = self._shuffled(len(CHANCE_CARDS))
+        self.community_deck = self._shuffled(len(COMMUNITY_CARDS))
+
+        # Struct-of-arrays state, allocated by initialize()
+        self._player_index: Dict[str, int] = {}
+        self._money = array("l")
+        self._pstate = bytearray()
+        self._owner = bytearray()
+        self._houses = bytearray()
+        self._mortgaged = bytearray()
+
+        # Ownership index: owned-position bitmask per player, and for each
+        # house level the bitmask of tiles built up to at least that level
+        self._owned = array("Q")
+        self._built = array("Q", [0] * 6)
+        self.players = _PlayerMap(self)
+        self.tiles = _TileMap(self)
+
+    def _write(self, buffer, index: int, value):
+        if self._journal is not None:
+            self._journal.append((buffer, index, buffer[index]))
+        buffer[index] = value
+
+    def _before_rng_draw(self, uses_rng: bool = True):
+        self._rng_draws += 1
+        if uses_rng and self._applying is not None and self._applying.rng is None:
+            self._applying.rng = self._capture_rng(self._rng_draws - 1)
+
+    def _capture_rng(self, draws: int) -> tuple:
+        if self._rng_snapshot is None or self._rng_snapshot[0] != draws:
+            self._rng_snapshot = (draws, self.rng.getstate())
+        return self._rng_snapshot
+
+    def _roll_dice(self) -> tuple:
+        dice = self.dice
+        self._before_rng_draw(uses_rng=not dice.block or dice._next + 2 > len(dice._faces))
+        return dice.roll()
+
+    def _shuffled(self, size: int) -> bytearray:
+        self._before_rng_draw()
+        order = bytearray(range(size))
+        self.rng.shuffle(order)
+        return order
+
+    def fork(self, seed: Optional[int] = None, capture_events: Optional[bool] = None,
+             record_actions: Optional[bool] = None) -> "MonopolyGame":
+        """Independent copy of this game for what-if evaluation.
+
+        The fork continues this game's RNG stream unless a new seed is given.
+        capture_events/record_actions default to this game's settings.
+        """
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        for name in self._BUFFERS:
+            setattr(clone, name, getattr(self, name)[:])
+        clone.player_order = list(self.player_order)
+        clone.players = _PlayerMap(clone)
+        clone.tiles = _TileMap(clone)
+
+        if self.auction:
+            clone.auction = Auction(self.auction.property_pos, self.auction.current_bid,
+                                    self.auction.current_bidder, list(self.auction.passed_players))
+
+        capture = self.events is not None if capture_events is None else capture_events
+        clone.events = deque(self.events or (), maxlen=EVENT_BUFFER_SIZE) if capture else None
+        if self._snapshots is not None:
+            clone._snapshots = deque(self._snapshots, maxlen=STATE_HISTORY)
+        record = self.action_log is not None if record_actions is None else record_actions
+        clone.action_log = list(self.action_log or ()) if record else None
+
+        if seed is not None:
+            # A reseeded fork can no longer be rebuilt by replaying from a seed
+            clone.seed = None
+            clone.rng = random.Random(seed)
+        elif type(self.rng) is random.Random:
+            # Capturing the Mersenne Twister state is the expensive part of a
+            # fork, so reuse the last capture while the RNG has not moved
+            clone._rng_snapshot = self._capture_rng(self._rng_draws)
+            clone.rng = random.Random.__new__(random.Random)
+            clone.rng.setstate(clone._rng_snapshot[1])
+        else:
+            clone.rng = copy.deepcopy(self.rng)
+        clone.dice = DiceStream(clone.rng, self.dice.block)
+        if seed is None:
+            clone.dice._faces, clone.dice._next = self.dice._faces, self.dice._next
+        clone._journal = clone._applying = None
+        clone._undo_stack = deque(maxlen=UNDO_HISTORY)
+        return clone
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pickled games drop their undo history and cached RNG capture, which
+        # dominate the size; tokens from before pickling cannot be undone anyway
+        if self._applying is not None:
+            raise RuntimeError("Cannot pickle a game during apply()")
+        state = self.__dict__.copy()
+        state["_undo_stack"] = None
+        state["_rng_snapshot"] = None
+        # Views over the arrays, rebuilt on load
+        del state["players"], state["tiles"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._undo_stack = deque(maxlen=UNDO_HISTORY)
+        self.players = _PlayerMap(self)
+        self.tiles = _TileMap(self)
+
+    # ------------------------------------------------------------------ make / unmake
+
+    def _scalar_state(self) -> tuple:
+        auction = self.auction and Auction(self.auction.property_pos, self.auction.current_bid,
+                                           self.auction.current_bidder, list(self.auction.passed_players))
+        return (self.phase, self.current_player_idx, self.turn_number, self.last_dice, auction,
+                bytes(self.chance_deck), bytes(self.community_deck),
+                None if self.events is None else tuple(self.events), self._event_seq,
+                None if self.action_log is None else len(self.action_log),
+                self._rng_draws, self.dice._faces, self.dice._next)
+
+    def apply(self, action: str, params: Optional[Dict[str, Any]] = None) -> UndoToken:
+        """Run a public action like execute() and return a token that undo() reverses."""
+        if self._applying is not None:
+            raise RuntimeError("apply() cannot be nested")
+        token = UndoToken(action, params or {}, scalars=self._scalar_state())
+        self._journal, self._applying = token.writes, token
+        try:
+            token.result = self.execute(action, params)
+        except BaseException:
+            # Leave no half-applied action behind
+            self._journal = self._applying = None
+            self._restore(token)
+            raise
+        finally:
+            self._journal = self._applying = None
+        self._undo_stack.append(token)
+        return token
+
+    def undo(self, token: UndoToken):
+        """Restore the exact state from before the most recent apply()."""
+        if not self._undo_stack or self._undo_stack[-1] is not token:
+            raise ValueError("Only the most recently applied action can be undone")
+        self._undo_stack.pop()
+        self._restore(token)
+        self.version += 1
+
+    def _restore(self, token: UndoToken):
+        for buffer, index, old in reversed(token.writes):
+            buffer[index] = old
+        # Subclasses may append their own state after these
+        (self.phase, self.current_player_idx, self.turn_number, self.last_dice, self.auction,
+         chance, community, events, self._event_seq, log_length, self._rng_draws,
+         self.dice._faces, self.dice._next, *_) = token.scalars
+        self.chance_deck[:] = chance
+        self.community_deck[:] = community
+        if events is not None:
+            self.events.clear()
+            self.events.extend(events)
+        if log_length is not None:
+            del self.action_log[log_length:]
+        if token.rng is not None:
+            self.rng.setstate(token.rng[1])
+        self._rng_snapshot = token.rng
+
+    def execute(self, action: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a public action by its tool name, e.g. ("place_bid", {"player_name": ..., "amount": ...})."""
+        if action not in ACTIONS:
+            return {"error": f"Unknown action: {action}"}
+        method, spec = ACTIONS[action]
+        params = params or {}
+        return getattr(self, method)(*(params.get(name, default) for name, default in spec))
+
+    def execute_actions(self, steps: List[Dict[str, Any]], atomic: bool = True) -> Dict[str, Any]:
+        """Run [{"action": ..., "params": {...}}, ...] in order, stopping at the first error.
+
+        Every step is checked against ACTIONS before any runs. With atomic, an
+        error, or an exception from a step, also undoes the steps before it,
+        leaving the game exactly as it was before the batch.
+        """
+        if len(steps) > UNDO_HISTORY:
+            return {"error": f"At most {UNDO_HISTORY} actions per batch"}
+        for i, step in enumerate(steps):
+            problem = _step_error(step)
+            if problem:
+                return {"error": f"Step {i}: {problem}"}
+        results, tokens = [], []
+        try:
+            for step in steps:
+                if atomic:
+                    tokens.append(self.apply(step["action"], step.get("params")))
+                    result = tokens[-1].result
+                else:
+                    result = self.execute(step["action"], step.get("params"))
+                results.append({"action": step["action"], **result})
+                if "error" in result:
+                    break
+        except BaseException:
+            # apply() has already restored the step that raised
+            for token in reversed(tokens):
+                self.undo(token)
+            raise
+        failed = "error" in results[-1] if results else False
+        if failed and atomic:
+            for token in reversed(tokens):
+                self.undo(token)
+        return {"success": not failed, "completed": len(results) - failed, "rolled_back": failed and atomic,
+                "results": results, "version": self.version}
+
+    def _forced_action(self, allow_jail_roll: bool) -> Optional[str]:
+        """The action to take when the current player has no real choice, else None."""
+        actions = self.get_available_actions()["actions"]
+        if actions in (["roll_dice_and_move"], ["end_turn"]):
+            return actions[0]
+        # Rolling for doubles is the only way out without bail money or a card
+        if allow_jail_roll and actions == ["roll_for_doubles", "pay_jail_bail"] and self.current_player.money < 50:
+            return "roll_for_doubles"
+        return None
+
+    def advance_until_decision(self, allow_jail_roll: bool = False, max_steps: int = 200) -> Dict[str, Any]:
+        """Take forced actions (lone rolls and end_turns) until a player has a real choice or the game ends.
+
+        allow_jail_roll also rolls for doubles for a jailed player who can neither
+        pay bail nor use a card. Returns the steps taken and the events they logged.
+        """
+        steps, messages = [], []
+        stopped = "max_steps"
+        while len(steps) < max_steps:
+            if self.phase == GamePhase.GAME_OVER:
+                stopped = "game_over"
+                break
+            action = self._forced_action(allow_jail_roll)
+            if action is None:
+                stopped = "decision"
+                break
+            player, seq = self.current_player.name, self._event_seq
+            result = self.execute(action)
+            steps.append({"action": action, "player": player, **result})
+            if self.events is not None:
+                new = min(self._event_seq - seq, len(self.events))
+                messages.extend(self.format_event(self.events[i]) for i in range(len(self.events) - new, len(self.events)))
+            if "error" in result:
+                stopped = "error"
+                break
+        return {"stopped": stopped, "steps": steps, "events": messages, "phase": self.phase.value,
+                "current_player": self.current_player.name,
+                "available_actions": self.get_available_actions()["actions"], "version": self.version}
+
+    def get_replay(self) -> Dict[str, Any]:
+        """Everything needed to rebuild this game with MonopolyGame.replay()."""
+        if self.action_log is None:
+            raise ValueError("Game was created with record_actions=False")
+        if self.action_log_start:
+            raise ValueError(f"Game was restored from a snapshot; its first {self.action_log_start} actions were not kept")
+        actions = []
+        for action, *args in self.action_log:
+            names = [name for name, _ in ACTIONS[action][1]]
+            actions.append({"action": action, "params": dict(zip(names, args))})
+        return {"engine": type(self).__name__, "players": list(self.player_order), "seed": self.seed,
+                "dice_block": self.dice.block, "actions": actions}
+
+    @classmethod
+    def replay(cls, record: Dict[str, Any]) -> "MonopolyGame":
+        """Rebuild a game from get_replay() output by re-running its actions."""
+        if record.get("seed") is None:
+            raise ValueError("Recording has no seed; games built from an explicit rng cannot be replayed")
+        engine = record.get("engine", "MonopolyGame")
+        if engine != cls.__name__:
+            # Another engine draws different dice and cards from the same seed
+            raise ValueError(f"Recording was made by {engine}; rebuild it with {engine}.replay()")
+        game = cls(list(record["players"]), seed=record["seed"], dice_block=record.get("dice_block", 0))
+        game.initialize()
+        for step in record["actions"]:
+            game.execute(step["action"], step.get("params"))
+        return game
 
     def initialize(self) -> Dict[str, Any]:
         # Create players
-        for name in self.player_order:
-            self.players[name] = Player(name=name)
-        
-        # Create tiles
-        for pos, data in TILE_DATA.items():
-            prop = Property(
-                position=pos,
-                name=data["name"],
-                tile_type=data["type"],
-                price=data.get("price", 0),
-                mortgage_value=data.get("mortgage", 0),
-                color_group=data.get("color", ""),
-                house_cost=data.get("house_cost", 0),
-                rent=data.get("rent", [])
-            )
-            self.tiles[pos] = prop
-        
-        self.messages.append(f"Game started with players: {', '.join(self.player_order)}")
-        return {"status": "success", "message": f"Game initialized with {len(self.players)} players", "players": self.player_order}
+        self._player_index = {name: i for i, name in enumerate(self.player_order)}
+        self._money = array("l", [1500] * len(self.player_order))
+        self._pstate = bytearray(_PLAYER_FIELDS * len(self.player_order))
+
+        # Create tiles: owner holds player index + 1, 0 when unowned
+        self._owner = bytearray(len(TILE_CATALOG))
+        self._houses = bytearray(len(TILE_CATALOG))
+        self._mortgaged = bytearray(len(TILE_CATALOG))
+        self._owned = array("Q", [0] * len(self.player_order))
+        self._built = array("Q", [0] * 6)
+        self.version += 1
+        
+        self._log(EventKind.GAME_STARTED)
+        return {"status": "success", "message": f"Game initialized with {len(self.players)} players", "players": self.player_order, "seed": self.seed}
 
     @property
     def current_player(self) -> Player:
@@ -202,20 +862,38 @@ class MonopolyGame:
     def current_tile(self) -> Property:
         return self.tiles[self.current_player.position]
 
-    def _log(self, msg: str):
-        self.messages.append(msg)
-        if len(self.messages) > 50:
-            self.messages = self.messages[-50:]
+    def _log(self, kind: EventKind, a: int = 0, b: int = 0, c: int = 0):
+        if self.events is not None:
+            self.events.append((kind, a, b, c))
+            self._event_seq += 1
+
+    def format_event(self, event: tuple) -> str:
+        kind, a, b, c = event
+        return _EVENT_TEXT[kind](self.player_order, a, b, c)
+
+    @property
+    def messages(self) -> List[str]:
+        """Buffered events rendered as text, oldest first."""
+        if not self.events:
+            return []
+        return [self.format_event(e) for e in self.events]
+
+    def recent_messages(self, count: int = 10) -> List[str]:
+        if not self.events:
+            return []
+        start = max(0, len(self.events) - count)
+        return [self.format_event(self.events[i]) for i in range(start, len(self.events))]
 
     def get_full_state(self) -> Dict[str, Any]:
         return {
+            "version": self._issue_version(),
             "phase": self.phase.value,
             "current_player": self.current_player.name,
             "turn_number": self.turn_number,
             "players": {name: self._player_to_dict(p) for name, p in self.players.items()},
             "last_dice": self.last_dice,
             "auction": self._auction_to_dict() if self.auction else None,
-            "recent_messages": self.messages[-10:]
+            "recent_messages": self.recent_messages()
         }
 
     def _player_to_dict(self, p: Player) -> Dict:
@@ -231,9 +909,95 @@ class MonopolyGame:
             "property": self.tiles[self.auction.property_pos].name,
             "current_bid": self.auction.current_bid,
             "current_bidder": self.auction.current_bidder,
-            "passed_players": self.auction.passed_players
+            "passed_players": list(self.auction.passed_players)
         }
 
+    # ------------------------------------------------------------------ state deltas
+
+    def _issue_version(self) -> int:
+        """Current version, remembering the state it stands for so later deltas can diff against it."""
+        if self._snapshots is None:
+            self._snapshots = deque(maxlen=STATE_HISTORY)
+        if not self._snapshots or self._snapshots[-1][0] != self.version:
+            auction = self.auction and (self.auction.property_pos, self.auction.current_bid,
+                                        self.auction.current_bidder, tuple(self.auction.passed_players))
+            self._snapshots.append((self.version, (
+                self._money[:], bytes(self._pstate), bytes(self._owner), bytes(self._houses),
+                bytes(self._mortgaged), self.phase, self.current_player_idx, self.turn_number,
+                self.last_dice, auction, self._event_seq)))
+        return self.version
+
+    def get_state_since(self, version: int) -> Dict[str, Any]:
+        """Only what changed since a version from get_full_state() or an earlier delta.
+
+        Players list only their changed fields and tiles their owner/houses/mortgage.
+        If that version is no longer remembered the full state is returned with "full": True.
+        """
+        base = next((snap for v, snap in reversed(self._snapshots or ()) if v == version), None)
+        if base is None:
+            return {**self.get_full_state(), "full": True}
+        delta: Dict[str, Any] = {"version": self._issue_version(), "since": version, "full": False}
+        if self.version == version:
+            return delta
+
+        money, pstate, owner, houses, mortgaged, phase, player_idx, turn, dice, auction, event_seq = base
+        if phase != self.phase:
+            delta["phase"] = self.phase.value
+        if player_idx != self.current_player_idx:
+            delta["current_player"] = self.current_player.name
+        if turn != self.turn_number:
+            delta["turn_number"] = self.turn_number
+        if dice != self.last_dice:
+            delta["last_dice"] = self.last_dice
+        current_auction = self.auction and (self.auction.property_pos, self.auction.current_bid,
+                                            self.auction.current_bidder, tuple(self.auction.passed_players))
+        if auction != current_auction:
+            delta["auction"] = self._auction_to_dict() if self.auction else None
+
+        tiles, new_owners = {}, set()
+        if owner != self._owner or houses != self._houses or mortgaged != self._mortgaged:
+            for pos in range(len(owner)):
+                if owner[pos] != self._owner[pos]:
+                    new_owners.update((owner[pos] - 1, self._owner[pos] - 1))
+                elif houses[pos] == self._houses[pos] and mortgaged[pos] == self._mortgaged[pos]:
+                    continue
+                t = self.tiles[pos]
+                tiles[pos] = {"owner": t.owner, "houses": t.houses, "is_mortgaged": t.is_mortgaged}
+
+        players = {}
+        for i, name in enumerate(self.player_order):
+            fields = {}
+            if money[i] != self._money[i]:
+                fields["money"] = self._money[i]
+            first = i * _PLAYER_FIELDS
+            if pstate[first:first + _PLAYER_FIELDS] != self._pstate[first:first + _PLAYER_FIELDS]:
+                p = self.players[name]
+                if pstate[first + _POSITION] != p.position:
+                    fields["position"], fields["tile_name"] = p.position, TILE_CATALOG[p.position].name
+                for key, offset in (("in_jail", _IN_JAIL), ("jail_turns", _JAIL_TURNS),
+                                    ("jail_cards", _JAIL_CARDS), ("bankrupt", _BANKRUPT)):
+                    if pstate[first + offset] != self._pstate[first + offset]:
+                        fields[key] = getattr(p, key)
+            if i in new_owners:
+                positions = self.players[name].properties
+                fields["properties"] = [TILE_CATALOG[pos].name for pos in positions]
+                fields["property_positions"] = positions
+            if fields:
+                players[name] = fields
+        if players:
+            delta["players"] = players
+        if tiles:
+            delta["tiles"] = tiles
+
+        new_events = self._event_seq - event_seq
+        if new_events and self.events:
+            shown = min(new_events, len(self.events))
+            delta["new_messages"] = [self.format_event(self.events[i])
+                                     for i in range(len(self.events) - shown, len(self.events))]
+            if shown < new_events:
+                delta["messages_truncated"] = True
+        return delta
+
     def get_player_status(self, name: str) -> Dict[str, Any]:
         if name not in self.players:
             return {"error": f"Player {name} not found"}
@@ -269,6 +1033,7 @@ class MonopolyGame:
         
         return {"current_player": p.name, "phase": self.phase.value, "actions": actions}
 
+    @_recorded("roll_dice_and_move")
     def roll_and_move(self) -> Dict[str, Any]:
         if self.phase == GamePhase.IN_JAIL:
             return {"error": "You are in jail. Use jail actions instead."}
@@ -276,12 +1041,12 @@ class MonopolyGame:
             return {"error": f"Cannot roll now. Current phase: {self.phase.value}"}
         
         p = self.current_player
-        d1, d2 = random.randint(1, 6), random.randint(1, 6)
+        d1, d2 = self._roll_dice()
         self.last_dice = (d1, d2)
         total = d1 + d2
         is_doubles = d1 == d2
         
-        self._log(f"{p.name} rolled [{d1}][{d2}] = {total}" + (" DOUBLES!" if is_doubles else ""))
+        self._log(EventKind.ROLLED, p._idx, d1, d2)
         
         if is_doubles:
             p.doubles_count += 1
@@ -296,10 +1061,10 @@ class MonopolyGame:
         
         if p.position < old_pos and p.position != 10:
             p.money += 200
-            self._log(f"{p.name} passed GO and collected $200")
+            self._log(EventKind.PASSED_GO, p._idx)
         
         tile = self.current_tile
-        self._log(f"{p.name} landed on {tile.name}")
+        self._log(EventKind.LANDED, p._idx, tile.position)
         
         result = self._handle_landing(p, tile, total)
         result["dice"] = [d1, d2]
@@ -320,9 +1085,9 @@ class MonopolyGame:
             return {"result": "Go to Jail!"}
         
         if tile.tile_type == TileType.TAX:
-            amount = TILE_DATA[tile.position].get("amount", 0)
+            amount = TILE_CATALOG[tile.position].tax
             p.money -= amount
-            self._log(f"{p.name} paid ${amount} tax")
+            self._log(EventKind.PAID_TAX, p._idx, amount)
             self.phase = GamePhase.TURN_COMPLETE
             return {"result": f"Paid ${amount} tax"}
         
@@ -337,7 +1102,7 @@ class MonopolyGame:
                 rent = self._calculate_rent(tile, dice_total)
                 p.money -= rent
                 self.players[tile.owner].money += rent
-                self._log(f"{p.name} paid ${rent} rent to {tile.owner}")
+                self._log(EventKind.PAID_RENT, p._idx, self._owner[tile.position] - 1, rent)
                 self.phase = GamePhase.TURN_COMPLETE
                 return {"result": f"Paid ${rent} rent to {tile.owner}"}
             else:
@@ -348,23 +1113,22 @@ class MonopolyGame:
         return {"result": "Nothing happens"}
 
     def _calculate_rent(self, tile: Property, dice: int) -> int:
-        owner = self.players[tile.owner]
+        owned = self._owned[self._owner[tile.position] - 1]
         if tile.tile_type == TileType.RAILROAD:
-            count = sum(1 for pos in owner.properties if self.tiles[pos].tile_type == TileType.RAILROAD)
-            return tile.get_rent(railroads_owned=count)
+            return tile.get_rent(railroads_owned=(owned & _RAILROAD_MASK).bit_count())
         elif tile.tile_type == TileType.UTILITY:
-            count = sum(1 for pos in owner.properties if self.tiles[pos].tile_type == TileType.UTILITY)
-            return tile.get_rent(dice_roll=dice, utilities_owned=count)
+            return tile.get_rent(dice_roll=dice, utilities_owned=(owned & _UTILITY_MASK).bit_count())
         return tile.get_rent()
 
     def _draw_card(self, p: Player, card_type: TileType) -> Dict:
+        cards = CHANCE_CARDS if card_type == TileType.CHANCE else COMMUNITY_CARDS
         deck = self.chance_deck if card_type == TileType.CHANCE else self.community_deck
         if not deck:
-            deck = (CHANCE_CARDS if card_type == TileType.CHANCE else COMMUNITY_CARDS).copy()
-            random.shuffle(deck)
+            deck = self._shuffled(len(cards))
         
-        card = deck.pop(0)
-        self._log(f"{p.name} drew: {card['text']}")
+        card_idx = deck.pop(0)
+        card = cards[card_idx]
+        self._log(EventKind.DREW_CARD, p._idx, card_type == TileType.COMMUNITY_CHEST, card_idx)
         
         if card["type"] == "money":
             p.money += card["amount"]
@@ -398,8 +1162,9 @@ class MonopolyGame:
         p.jail_turns = 0
         p.doubles_count = 0
         self.phase = GamePhase.TURN_COMPLETE
-        self._log(f"{p.name} sent to jail ({reason})")
+        self._log(EventKind.SENT_TO_JAIL, p._idx, JAIL_REASONS.index(reason))
 
+    @_recorded("buy_property")
     def buy_current_property(self) -> Dict[str, Any]:
         if self.phase != GamePhase.WAITING_FOR_BUY_DECISION:
             return {"error": "No property available to buy"}
@@ -412,12 +1177,12 @@ class MonopolyGame:
         
         p.money -= tile.price
         tile.owner = p.name
-        p.properties.append(tile.position)
-        self._log(f"{p.name} bought {tile.name} for ${tile.price}")
+        self._log(EventKind.BOUGHT, p._idx, tile.position, tile.price)
         self.phase = GamePhase.TURN_COMPLETE
         
         return {"success": True, "property": tile.name, "price": tile.price, "remaining_money": p.money}
 
+    @_recorded("decline_purchase")
     def decline_purchase(self) -> Dict[str, Any]:
         if self.phase != GamePhase.WAITING_FOR_BUY_DECISION:
             return {"error": "No property to decline"}
@@ -425,10 +1190,11 @@ class MonopolyGame:
         tile = self.current_tile
         self.auction = Auction(property_pos=tile.position)
         self.phase = GamePhase.AUCTION
-        self._log(f"Auction started for {tile.name}")
+        self._log(EventKind.AUCTION_STARTED, tile.position)
         
         return {"success": True, "auction_started": True, "property": tile.name}
 
+    @_recorded("place_bid")
     def place_bid(self, player_name: str, amount: int) -> Dict[str, Any]:
         if self.phase != GamePhase.AUCTION or not self.auction:
             return {"error": "No auction in progress"}
@@ -445,18 +1211,21 @@ class MonopolyGame:
         
         self.auction.current_bid = amount
         self.auction.current_bidder = player_name
-        self._log(f"{player_name} bid ${amount}")
+        self._log(EventKind.BID, p._idx, amount)
         
         return {"success": True, "bid": amount, "property": self.tiles[self.auction.property_pos].name}
 
+    @_recorded("pass_auction")
     def pass_auction(self, player_name: str) -> Dict[str, Any]:
         if self.phase != GamePhase.AUCTION or not self.auction:
             return {"error": "No auction in progress"}
         if player_name in self.auction.passed_players:
             return {"error": "Already passed"}
+        if player_name not in self.players:
+            return {"error": "Invalid player"}
         
         self.auction.passed_players.append(player_name)
-        self._log(f"{player_name} passed on auction")
+        self._log(EventKind.PASSED_AUCTION, self._player_index[player_name])
         
         active = [n for n in self.player_order if n not in self.auction.passed_players and not self.players[n].bankrupt]
         
@@ -472,17 +1241,17 @@ class MonopolyGame:
             winner = self.players[self.auction.current_bidder]
             winner.money -= self.auction.current_bid
             tile.owner = winner.name
-            winner.properties.append(tile.position)
-            self._log(f"{winner.name} won {tile.name} for ${self.auction.current_bid}")
+            self._log(EventKind.AUCTION_WON, winner._idx, tile.position, self.auction.current_bid)
             result = {"auction_winner": winner.name, "price": self.auction.current_bid}
         else:
-            self._log(f"No bids for {tile.name}")
+            self._log(EventKind.AUCTION_NO_BIDS, tile.position)
             result = {"auction_winner": None, "message": "No bids placed"}
         
         self.auction = None
         self.phase = GamePhase.TURN_COMPLETE
         return result
 
+    @_recorded("pay_jail_bail")
     def pay_bail(self) -> Dict[str, Any]:
         p = self.current_player
         if not p.in_jail:
@@ -494,9 +1263,10 @@ class MonopolyGame:
         p.in_jail = False
         p.jail_turns = 0
         self.phase = GamePhase.WAITING_FOR_ROLL
-        self._log(f"{p.name} paid $50 bail")
+        self._log(EventKind.PAID_BAIL, p._idx)
         return {"success": True, "remaining_money": p.money}
 
+    @_recorded("use_jail_card")
     def use_jail_card(self) -> Dict[str, Any]:
         p = self.current_player
         if not p.in_jail:
@@ -508,23 +1278,24 @@ class MonopolyGame:
         p.in_jail = False
         p.jail_turns = 0
         self.phase = GamePhase.WAITING_FOR_ROLL
-        self._log(f"{p.name} used Get Out of Jail Free card")
+        self._log(EventKind.USED_JAIL_CARD, p._idx)
         return {"success": True}
 
+    @_recorded("roll_for_doubles")
     def roll_for_doubles(self) -> Dict[str, Any]:
         p = self.current_player
         if not p.in_jail:
             return {"error": "Not in jail"}
         
-        d1, d2 = random.randint(1, 6), random.randint(1, 6)
+        d1, d2 = self._roll_dice()
         self.last_dice = (d1, d2)
-        self._log(f"{p.name} rolled [{d1}][{d2}] trying for doubles")
+        self._log(EventKind.JAIL_ROLL, p._idx, d1, d2)
         
         if d1 == d2:
             p.in_jail = False
             p.jail_turns = 0
             self.phase = GamePhase.WAITING_FOR_ROLL
-            self._log(f"{p.name} rolled doubles and escaped jail!")
+            self._log(EventKind.ESCAPED_JAIL, p._idx)
             return {"success": True, "dice": [d1, d2], "escaped": True}
         
         p.jail_turns += 1
@@ -533,28 +1304,36 @@ class MonopolyGame:
             p.in_jail = False
             p.jail_turns = 0
             self.phase = GamePhase.WAITING_FOR_ROLL
-            self._log(f"{p.name} forced to pay $50 after 3 turns")
+            self._log(EventKind.FORCED_BAIL, p._idx)
             return {"dice": [d1, d2], "escaped": False, "forced_bail": True}
         
         self.phase = GamePhase.TURN_COMPLETE
         return {"dice": [d1, d2], "escaped": False, "turns_remaining": 3 - p.jail_turns}
 
+    def _owns(self, p: Player, position: int) -> bool:
+        return position in self.tiles and bool(self._owned[p._idx] >> position & 1)
+
+    def _monopolies(self, p: Player) -> List[str]:
+        owned = self._owned[p._idx]
+        return [color for color, mask in _GROUP_MASKS.items() if owned & mask == mask]
+
     def _get_buildable_properties(self, p: Player) -> List[int]:
         buildable = []
-        for pos in p.properties:
-            tile = self.tiles[pos]
-            if tile.tile_type != TileType.PROPERTY or tile.houses >= 5 or tile.is_mortgaged:
+        for color in self._monopolies(p):
+            group, mask = COLOR_GROUPS[color], _GROUP_MASKS[color]
+            if p.money < TILE_CATALOG[group[0]].house_cost:
                 continue
-            group = COLOR_GROUPS.get(tile.color_group, [])
-            if all(g in p.properties for g in group):
-                min_houses = min(self.tiles[g].houses for g in group)
-                if tile.houses <= min_houses and p.money >= tile.house_cost:
+            for pos in group:
+                houses = self._houses[pos]
+                # Even building: every tile in the group has at least as many houses
+                if houses < 5 and not self._mortgaged[pos] and (houses == 0 or self._built[houses] & mask == mask):
                     buildable.append(pos)
         return buildable
 
+    @_recorded("build_house")
     def build_house(self, position: int) -> Dict[str, Any]:
         p = self.current_player
-        if position not in p.properties:
+        if not self._owns(p, position):
             return {"error": "You don't own this property"}
         
         tile = self.tiles[position]
@@ -563,14 +1342,14 @@ class MonopolyGame:
         
         p.money -= tile.house_cost
         tile.houses += 1
-        building = "hotel" if tile.houses == 5 else f"{tile.houses} house(s)"
-        self._log(f"{p.name} built on {tile.name} - now has {building}")
+        self._log(EventKind.BUILT, p._idx, position, tile.houses)
         
         return {"success": True, "property": tile.name, "houses": tile.houses, "cost": tile.house_cost}
 
+    @_recorded("mortgage_property")
     def mortgage_property(self, position: int) -> Dict[str, Any]:
         p = self.current_player
-        if position not in p.properties:
+        if not self._owns(p, position):
             return {"error": "You don't own this property"}
         
         tile = self.tiles[position]
@@ -581,13 +1360,14 @@ class MonopolyGame:
         
         tile.is_mortgaged = True
         p.money += tile.mortgage_value
-        self._log(f"{p.name} mortgaged {tile.name} for ${tile.mortgage_value}")
+        self._log(EventKind.MORTGAGED, p._idx, position, tile.mortgage_value)
         
         return {"success": True, "property": tile.name, "received": tile.mortgage_value}
 
+    @_recorded("unmortgage_property")
     def unmortgage_property(self, position: int) -> Dict[str, Any]:
         p = self.current_player
-        if position not in p.properties:
+        if not self._owns(p, position):
             return {"error": "You don't own this property"}
         
         tile = self.tiles[position]
@@ -600,10 +1380,11 @@ class MonopolyGame:
         
         p.money -= cost
         tile.is_mortgaged = False
-        self._log(f"{p.name} unmortgaged {tile.name} for ${cost}")
+        self._log(EventKind.UNMORTGAGED, p._idx, position, cost)
         
         return {"success": True, "property": tile.name, "cost": cost}
 
+    @_recorded("end_turn")
     def end_turn(self) -> Dict[str, Any]:
         if self.phase not in [GamePhase.TURN_COMPLETE]:
             return {"error": f"Cannot end turn in phase: {self.phase.value}"}
@@ -614,7 +1395,7 @@ class MonopolyGame:
         # Check bankruptcy
         if p.money < 0:
             p.bankrupt = True
-            self._log(f"{p.name} is BANKRUPT!")
+            self._log(EventKind.BANKRUPT, p._idx)
         
         # Move to next player
         active = [n for n in self.player_order if not self.players[n].bankrupt]
@@ -641,5 +1422,46 @@ class MonopolyGame:
             "position": position, "name": t.name, "type": t.tile_type.value,
             "price": t.price, "owner": t.owner, "houses": t.houses,
             "mortgage_value": t.mortgage_value, "is_mortgaged": t.is_mortgaged,
-            "color_group": t.color_group, "rent": t.rent, "house_cost": t.house_cost
-        }
\ No newline at end of file
+            "color_group": t.color_group, "rent": t.rent, "house_cost": t.house_cost,
+            **self._property_analytics(t)
+        }
+
+    def _property_analytics(self, t: Property) -> Dict[str, Any]:
+        """Landing odds, and expected rent per opponent turn at the tile's current level."""
+        from board_analytics import tile_analytics
+
+        stats = tile_analytics(t.position)
+        if "levels" not in stats:
+            return {"landing_probability": stats["landing_probability"]}
+        if t.tile_type == TileType.PROPERTY:
+            level = t.houses
+        else:
+            owned = self._owned[self._owner[t.position] - 1] if t.owner else 0
+            mask = _RAILROAD_MASK if t.tile_type == TileType.RAILROAD else _UTILITY_MASK
+            level = max(1, (owned & mask).bit_count())
+        current = next(entry for entry in stats["levels"] if entry["level"] == level)
+        return {
+            "landing_probability": stats["landing_probability"],
+            "expected_rent_per_turn": 0.0 if t.is_mortgaged else current["expected_rent_per_turn"],
+            "payback_turns": None if t.is_mortgaged else current["payback_turns"],
+            "rent_levels": stats["levels"],
+        }
+
+def merge_state(state: Dict[str, Any], delta: Dict[str, Any], messages: int = 10) -> Dict[str, Any]:
+    """Bring a client copy of get_full_state() up to date with a get_state_since() delta.
+
+    The result equals a fresh get_full_state(). Tile changes in the delta are
+    already reflected in the players' properties, so they are not merged.
+    """
+    if delta.get("full"):
+        return {key: value for key, value in delta.items() if key != "full"}
+    for key in ("version", "phase", "current_player", "turn_number", "last_dice", "auction"):
+        if key in delta:
+            state[key] = delta[key]
+    for name, fields in delta.get("players", {}).items():
+        state["players"][name].update(fields)
+    if "new_messages" in delta:
+        # With messages_truncated the older messages are no longer contiguous with the new ones
+        earlier = [] if delta.get("messages_truncated") else state["recent_messages"]
+        state["recent_messages"] = (earlier + delta["new_messages"])[-messages:]
+    return state
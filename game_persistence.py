@@ -0,0 +1,214 @@
+"""
+Game Persistence - Crash-safe journal and snapshots so hosted games survive a restart
+
+Each game has a snapshot file (the pickled game, which knows how many actions
+it has taken) and an append-only journal of the actions taken since.
+Snapshots leave out the game's action log, so recovery loads a snapshot of
+fixed size and replays the journal tail: it costs at most SNAPSHOT_EVERY
+actions however long the game has run. A recovered game's action_log starts
+at its snapshot.
+"""
+
+import os
+import json
+import pickle
+from typing import Dict, List, Optional, IO
+
+from game_engine import MonopolyGame, ACTIONS
+
+
+# Actions between full snapshots; bounds the journal replayed on recovery
+SNAPSHOT_EVERY = 200
+# Seconds between group fsyncs of the journals; 0 fsyncs after every action
+FSYNC_INTERVAL = 0.05
+
+
+def _fsync_dir(directory: str):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class GameJournal:
+    """Snapshot plus action journal of one game.
+
+    Journal lines are JSON arrays [index, action, *args], where index counts
+    the game's actions from its start, action_log_start included. Lines from
+    before the latest snapshot are skipped on load, so truncating the journal
+    after a snapshot is safe to interrupt.
+    """
+
+    def __init__(self, directory: str, game_id: str):
+        self.snapshot_path = os.path.join(directory, f"{game_id}.snapshot")
+        self.journal_path = os.path.join(directory, f"{game_id}.journal")
+        self.directory = directory
+        self.logged = 0
+        self.snapshot_at = 0
+        self.dirty = False
+        self._file: Optional[IO[str]] = None
+
+    def snapshot(self, game: MonopolyGame):
+        """Write the game without its action log durably, then start an empty journal."""
+        actions = game.action_log_start + len(game.action_log)
+        state = game.__getstate__()
+        state["action_log"] = []
+        state["action_log_start"] = actions
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"class": type(game), "state": state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        _fsync_dir(self.directory)
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.journal_path, "w", encoding="utf-8")
+        self.logged = self.snapshot_at = actions
+        self.dirty = False
+
+    def record(self, game: MonopolyGame, snapshot_every: int = SNAPSHOT_EVERY):
+        """Append the actions taken since the last call, or snapshot when due."""
+        log, start = game.action_log, game.action_log_start
+        actions = start + len(log)
+        if self._file is None or actions < self.logged or actions - self.snapshot_at >= snapshot_every:
+            # A shorter log means actions were undone after being journaled
+            self.snapshot(game)
+            return
+        if actions == self.logged:
+            return
+        self._file.write("".join(json.dumps([start + i, *log[i]], separators=(",", ":")) + "\n"
+                                 for i in range(self.logged - start, len(log))))
+        self.logged = actions
+        self.dirty = True
+
+    def sync(self):
+        if self.dirty:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.dirty = False
+
+    def close(self):
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        for path in (self.snapshot_path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def load(self) -> MonopolyGame:
+        """Rebuild the game from its snapshot and the intact prefix of its journal."""
+        with open(self.snapshot_path, "rb") as f:
+            data = f.read()
+        game = self._unpickle(data)
+        tail = self._read_tail(game.action_log_start)
+        done = self._execute(game, tail)
+        if done < len(tail):
+            # An entry the engine rejects ends the journal like a torn write. The
+            # action may have been half done, so replay the ones before it on a
+            # fresh copy of the snapshot
+            game = self._unpickle(data)
+            self._execute(game, tail[:done])
+        self.logged = self.snapshot_at = game.action_log_start + len(game.action_log)
+        return game
+
+    def _read_tail(self, expected: int) -> List[tuple]:
+        """(action, params) of the journal entries from index expected on, up to the first bad one."""
+        tail = []
+        if not os.path.exists(self.journal_path):
+            return tail
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    index, action, *args = json.loads(line)
+                except ValueError:
+                    break  # torn write at the crash point
+                if index < expected:
+                    continue
+                if index != expected or action not in ACTIONS:
+                    break
+                tail.append((action, dict(zip((name for name, _ in ACTIONS[action][1]), args))))
+                expected += 1
+        return tail
+
+    @staticmethod
+    def _unpickle(data: bytes) -> MonopolyGame:
+        saved = pickle.loads(data)
+        game = saved["class"].__new__(saved["class"])
+        game.__setstate__(saved["state"])
+        return game
+
+    @staticmethod
+    def _execute(game: MonopolyGame, tail: List[tuple]) -> int:
+        """Run the tail through execute(), which keeps no undo history; returns how many ran."""
+        for done, (action, params) in enumerate(tail):
+            try:
+                game.execute(action, params)
+            except Exception:
+                return done
+        return len(tail)
+
+
+class GamePersistence:
+    """Journals of every hosted game in one directory, fsynced together."""
+
+    def __init__(self, directory: str, snapshot_every: int = SNAPSHOT_EVERY,
+                 fsync_interval: float = FSYNC_INTERVAL):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync_interval = fsync_interval
+        self.journals: Dict[str, GameJournal] = {}
+
+    def record(self, game_id: str, game: MonopolyGame):
+        journal = self.journals.get(game_id)
+        if journal is None:
+            journal = self.journals[game_id] = GameJournal(self.directory, game_id)
+        journal.record(game, self.snapshot_every)
+        if not self.fsync_interval:
+            journal.sync()
+
+    def sync(self) -> int:
+        """Fsync every journal with unsynced actions; returns how many there were."""
+        dirty = [j for j in self.journals.values() if j.dirty]
+        for journal in dirty:
+            journal.sync()
+        return len(dirty)
+
+    def drop(self, game_id: str):
+        journal = self.journals.pop(game_id, None) or GameJournal(self.directory, game_id)
+        journal.remove()
+
+    def game_ids(self) -> List[str]:
+        return sorted(name[:-len(".snapshot")] for name in os.listdir(self.directory)
+                      if name.endswith(".snapshot"))
+
+    def quarantine(self, game_id: str):
+        """Set a game's files aside as .failed so recovery no longer picks them up."""
+        journal = self.journals.pop(game_id, None) or GameJournal(self.directory, game_id)
+        if journal._file is not None:
+            journal._file.close()
+            journal._file = None
+        for path in (journal.snapshot_path, journal.journal_path):
+            if os.path.exists(path):
+                os.replace(path, path + ".failed")
+
+    def recover(self, game_id: str) -> MonopolyGame:
+        journal = GameJournal(self.directory, game_id)
+        game = journal.load()
+        # Start a fresh snapshot so the replayed tail is not replayed again next time
+        journal.snapshot(game)
+        self.journals[game_id] = journal
+        return game
+
+    def close(self):
+        for journal in self.journals.values():
+            journal.close()
+        self.journals.clear()
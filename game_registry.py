@@ -0,0 +1,263 @@
+"""
+Game Registry - Many concurrent games in one server process, addressed by game_id
+
+Games left idle are hibernated: pickled, compressed and moved to a SQLite file,
+then rehydrated on their next tool call.
+"""
+
+import os
+import sys
+import time
+import uuid
+import zlib
+import pickle
+import sqlite3
+import asyncio
+import tempfile
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional
+
+from game_engine import MonopolyGame
+from game_persistence import GamePersistence
+
+
+DEFAULT_CAPACITY = 500
+# Hibernate games idle this long, and the least recently used ones beyond
+# MAX_RESIDENT games in memory
+IDLE_SECONDS = 300.0
+MAX_RESIDENT = 200
+# Rehydration latencies kept for the metrics
+LATENCY_SAMPLES = 1000
+
+
+@dataclass
+class GameSession:
+    """One hosted game with the lock that serializes its tool calls.
+
+    game is None while the session is hibernated; summary then comes from the
+    copy taken when it was put to sleep.
+    """
+    game_id: str
+    game: Optional[MonopolyGame]
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    created: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    # Serialized read-tool responses of the server's cache, for this game only
+    responses: "OrderedDict[tuple, str]" = field(default_factory=OrderedDict)
+    dormant: Optional[Dict[str, Any]] = None
+
+    def summary(self) -> Dict[str, Any]:
+        if self.game is None:
+            info = dict(self.dormant, hibernated=True)
+        else:
+            game = self.game
+            info = {"game_id": self.game_id, "players": list(game.player_order),
+                    "phase": game.phase.value, "turn_number": game.turn_number, "version": game.version,
+                    "hibernated": False}
+        info["idle_seconds"] = round(time.time() - self.last_used, 1)
+        return info
+
+
+class HibernationStore:
+    """Compressed pickles of hibernated games in a SQLite file."""
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            path = os.path.join(tempfile.gettempdir(), f"monopoly-hibernate-{os.getpid()}.db")
+        self.path = path
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=OFF")
+        self.db.execute("CREATE TABLE IF NOT EXISTS games (game_id TEXT PRIMARY KEY, data BLOB NOT NULL)")
+        self.db.execute("DELETE FROM games")
+
+    def put(self, game_id: str, game: MonopolyGame) -> int:
+        data = zlib.compress(pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        self.db.execute("INSERT OR REPLACE INTO games VALUES (?, ?)", (game_id, data))
+        return len(data)
+
+    def take(self, game_id: str) -> MonopolyGame:
+        row = self.db.execute("SELECT data FROM games WHERE game_id = ?", (game_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Hibernated game {game_id} is missing from {self.path}")
+        # Deleted only once it has loaded, so a failed load does not lose the game
+        game = pickle.loads(zlib.decompress(row[0]))
+        self.delete(game_id)
+        return game
+
+    def delete(self, game_id: str):
+        self.db.execute("DELETE FROM games WHERE game_id = ?", (game_id,))
+
+    def close(self):
+        self.db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+
+class GameRegistry:
+    """Games keyed by game_id, up to a fixed capacity.
+
+    At most max_resident games stay in memory; the rest sleep in the
+    hibernation store until they are asked for again. With persistence, every
+    committed action is journaled so games can be recovered after a restart.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, idle_seconds: float = IDLE_SECONDS,
+                 max_resident: int = MAX_RESIDENT, store_path: Optional[str] = None,
+                 persistence: Optional[GamePersistence] = None):
+        self.capacity = capacity
+        self.persistence = persistence
+        self.idle_seconds = idle_seconds
+        self.max_resident = max_resident
+        self.store_path = store_path
+        self._store: Optional[HibernationStore] = None
+        self.sessions: Dict[str, GameSession] = {}
+        # Resident sessions, least recently used first
+        self._resident: "OrderedDict[str, GameSession]" = OrderedDict()
+        self.stats = {"hibernations": 0, "rehydrations": 0, "hibernated_bytes": 0, "recovery_failures": 0}
+        self._latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def start(self, players: List[str], seed: Optional[int] = None) -> GameSession:
+        if len(self.sessions) >= self.capacity:
+            raise ValueError(f"Server is at capacity ({self.capacity} games). End a game first.")
+        game = MonopolyGame(players, seed=seed)
+        session = GameSession(uuid.uuid4().hex[:12], game)
+        self.sessions[session.game_id] = session
+        self._resident[session.game_id] = session
+        self._enforce_budget()
+        return session
+
+    def get(self, game_id: Optional[str]) -> GameSession:
+        """The session for game_id; may be omitted while exactly one game is hosted."""
+        if game_id is None:
+            if len(self.sessions) == 1:
+                return next(iter(self.sessions.values()))
+            if not self.sessions:
+                raise ValueError("Game not initialized. Call 'start_game' first.")
+            raise ValueError("Several games are running. Pass the 'game_id' returned by start_game.")
+        session = self.sessions.get(game_id)
+        if session is None:
+            raise ValueError(f"Unknown game_id: {game_id}")
+        return session
+
+    def touch(self, session: GameSession) -> MonopolyGame:
+        """The session's game, rehydrated if it was hibernated, marked most recently used."""
+        if self.sessions.get(session.game_id) is not session:
+            raise ValueError(f"Game {session.game_id} has ended")
+        session.last_used = time.time()
+        if session.game is None:
+            start = time.perf_counter()
+            session.game = self._store.take(session.game_id)
+            session.dormant = None
+            self._latencies.append(time.perf_counter() - start)
+            self.stats["rehydrations"] += 1
+            self._resident[session.game_id] = session
+            self._enforce_budget()
+        else:
+            self._resident.move_to_end(session.game_id)
+        return session.game
+
+    def commit(self, session: GameSession):
+        """Journal the actions the session's game took since its last commit."""
+        if self.persistence is not None and session.game is not None:
+            self.persistence.record(session.game_id, session.game)
+
+    def end(self, game_id: str) -> Dict[str, Any]:
+        session = self.get(game_id)
+        del self.sessions[session.game_id]
+        if self._resident.pop(session.game_id, None) is None:
+            self._store.delete(session.game_id)
+        if self.persistence is not None:
+            self.persistence.drop(session.game_id)
+        return {"success": True, "ended": session.summary()}
+
+    def recover(self) -> int:
+        """Host every game found in the persistence directory; returns how many.
+
+        A game that cannot be loaded is quarantined and reported on stderr, so
+        one bad game does not keep the others from being hosted.
+        """
+        recovered = 0
+        for game_id in self.persistence.game_ids():
+            if game_id in self.sessions:
+                continue
+            try:
+                game = self.persistence.recover(game_id)
+            except Exception as e:
+                self.persistence.quarantine(game_id)
+                self.stats["recovery_failures"] += 1
+                print(f"Could not recover game {game_id} ({type(e).__name__}: {e}); "
+                      f"its files were renamed to *.failed", file=sys.stderr)
+                continue
+            session = GameSession(game_id, game)
+            self.sessions[game_id] = session
+            self._resident[game_id] = session
+            self._enforce_budget()
+            recovered += 1
+        return recovered
+
+    def list(self) -> Dict[str, Any]:
+        return {"games": [s.summary() for s in self.sessions.values()],
+                "count": len(self.sessions), "capacity": self.capacity, "metrics": self.metrics()}
+
+    # ------------------------------------------------------------------ hibernation
+
+    def hibernate(self, session: GameSession) -> bool:
+        """Move a resident, unlocked session's game to the store; False if it is busy."""
+        if session.game is None or session.lock.locked():
+            return False
+        if self._store is None:
+            self._store = HibernationStore(self.store_path)
+        summary = session.summary()
+        self.stats["hibernated_bytes"] += self._store.put(session.game_id, session.game)
+        del summary["idle_seconds"], summary["hibernated"]
+        session.dormant = summary
+        session.game = None
+        session.responses.clear()
+        del self._resident[session.game_id]
+        self.stats["hibernations"] += 1
+        return True
+
+    def hibernate_idle(self) -> int:
+        """Hibernate every session idle past idle_seconds; returns how many went to sleep."""
+        cutoff = time.time() - self.idle_seconds
+        idle = [s for s in self._resident.values() if s.last_used <= cutoff]
+        return sum(self.hibernate(s) for s in idle)
+
+    def _enforce_budget(self):
+        # Least recently used first; the session just touched is last and stays
+        for session in list(self._resident.values())[:-1]:
+            if len(self._resident) <= self.max_resident:
+                break
+            self.hibernate(session)
+
+    def metrics(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        return {
+            "resident": len(self._resident), "hibernated": len(self.sessions) - len(self._resident),
+            "max_resident": self.max_resident, "idle_seconds": self.idle_seconds,
+            "hibernations": self.stats["hibernations"], "rehydrations": self.stats["rehydrations"],
+            "mean_hibernated_bytes": (self.stats["hibernated_bytes"] // self.stats["hibernations"]
+                                      if self.stats["hibernations"] else None),
+            "rehydrate_ms_p50": _percentile_ms(latencies, 0.5),
+            "rehydrate_ms_p99": _percentile_ms(latencies, 0.99),
+            "recovery_failures": self.stats["recovery_failures"],
+        }
+
+    def close(self):
+        if self.persistence is not None:
+            self.persistence.close()
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+
+def _percentile_ms(latencies: List[float], q: float) -> Optional[float]:
+    if not latencies:
+        return None
+    return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 3)
@@ -5,12 +5,20 @@ Can run standalone or connect to MCP server
 """
 
 import os
+import sys
+import json
 import time
+import random
+import asyncio
 import argparse
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional
 
-from game_engine import MonopolyGame, GamePhase
-from ai_agents import create_agent, BaseAgent, OpenAIAgent, OllamaAgent
+from game_engine import MonopolyGame, GamePhase, merge_state
+from decision_cache import DecisionCache
+from model_backends import ModelBackend, backend_metrics
+from cassette import Cassette, CassetteMismatch
+from ai_agents import (create_agent, BaseAgent, OpenAIAgent, OllamaAgent, MCTSAgent,
+                       AsyncOpenAIAgent, AsyncOllamaAgent)
 
 
 def print_banner():
@@ -51,20 +59,135 @@ def print_all_players(game: MonopolyGame, current: str):
         print(f"  {marker} {name}: ${p.money} │ {len(p.properties)} props {status}")
 
 
-def run_game(agents: Dict[str, BaseAgent], max_turns: int = 100, delay: float = 1.0) -> Dict[str, Any]:
-    """Run a full game with AI agents."""
+# ============================================================================
+# REPORTERS
+# ============================================================================
+
+class Reporter:
+    """Observer of a game played by run_game; every hook does nothing by default."""
+    
+    def game_started(self, game: MonopolyGame, max_turns: int):
+        pass
+    
+    def turn_started(self, game: MonopolyGame, turn: int, player: str):
+        pass
+    
+    def action(self, game: MonopolyGame, player: str, action: str, params: Dict, result: Dict):
+        pass
+    
+    def turn_ended(self, game: MonopolyGame):
+        pass
+    
+    def turn_forced(self, game: MonopolyGame, player: str):
+        pass
+    
+    def game_over(self, game: MonopolyGame, result: Dict[str, Any]):
+        pass
+    
+    def close(self):
+        pass
+
+
+class NullReporter(Reporter):
+    """Reports nothing and never sleeps: the headless mode."""
+
+
+class ConsoleReporter(Reporter):
+    """The interactive terminal output, paced by delay seconds per turn."""
+    
+    def __init__(self, delay: float = 1.0):
+        self.delay = delay
+    
+    def game_started(self, game: MonopolyGame, max_turns: int):
+        print(f"\n🎮 Game started with {len(game.player_order)} players!")
+        print(f"   Players: {', '.join(game.player_order)}")
+        print(f"   Seed: {game.seed}")
+        print(f"   Max turns: {max_turns}")
+        print_all_players(game, game.current_player.name)
+    
+    def turn_started(self, game: MonopolyGame, turn: int, player: str):
+        print_turn_header(turn, player, game.phase.value)
+        print_player_status(game, player)
+    
+    def action(self, game: MonopolyGame, player: str, action: str, params: Dict, result: Dict):
+        print(f"\n  🎯 {player} chose: {action}")
+        if params:
+            print(f"     params: {params}")
+        if "error" in result:
+            print(f"  ❌ Error: {result['error']}")
+        else:
+            print_action_result(action, result)
+        time.sleep(self.delay * 0.3)
+    
+    def turn_ended(self, game: MonopolyGame):
+        print_all_players(game, game.current_player.name)
+        time.sleep(self.delay)
+    
+    def turn_forced(self, game: MonopolyGame, player: str):
+        print(f"  ⚠️ Too many actions, forcing turn end")
+    
+    def game_over(self, game: MonopolyGame, result: Dict[str, Any]):
+        print("\n" + "🏁" * 25)
+        print("\n  GAME OVER!")
+        if sum(not p.bankrupt for p in game.players.values()) == 1:
+            print(f"\n  🏆 WINNER: {result['winner']}! 🏆")
+        else:
+            # Determine winner by net worth
+            print(f"\n  🏆 WINNER (by net worth): {result['winner']}! 🏆")
+        print_final_results(game)
+
+
+class JsonlReporter(Reporter):
+    """One JSON object per line for every event, to a path or an open text file."""
+    
+    def __init__(self, out):
+        self._owned = isinstance(out, str)
+        self.out = open(out, "w", encoding="utf-8") if self._owned else out
+    
+    def _write(self, event: str, **fields):
+        self.out.write(json.dumps({"event": event, **fields}, default=str, separators=(",", ":")) + "\n")
+    
+    def game_started(self, game: MonopolyGame, max_turns: int):
+        self._write("game_started", players=list(game.player_order), seed=game.seed, max_turns=max_turns)
+    
+    def turn_started(self, game: MonopolyGame, turn: int, player: str):
+        self._write("turn_started", turn=turn, player=player, phase=game.phase.value)
+    
+    def action(self, game: MonopolyGame, player: str, action: str, params: Dict, result: Dict):
+        self._write("action", player=player, action=action, params=params, result=result,
+                    version=game.version)
+    
+    def turn_forced(self, game: MonopolyGame, player: str):
+        self._write("turn_forced", player=player)
+    
+    def game_over(self, game: MonopolyGame, result: Dict[str, Any]):
+        self._write("game_over", winner=result["winner"], turns=result["turns"], seed=result["seed"],
+                    money={n: p.money for n, p in game.players.items()})
+        self.out.flush()
+    
+    def close(self):
+        if self._owned:
+            self.out.close()
+
+
+def run_game(agents: Dict[str, BaseAgent], max_turns: int = 100, delay: float = 1.0,
+             seed: Optional[int] = None, reporter: Optional[Reporter] = None) -> Dict[str, Any]:
+    """Run a full game with AI agents, reporting to the console unless another reporter is given."""
+    if reporter is None:
+        reporter = ConsoleReporter(delay)
     
     player_names = list(agents.keys())
-    game = MonopolyGame(player_names)
+    game = MonopolyGame(player_names, seed=seed)
     game.initialize()
+    for agent in agents.values():
+        agent.attach(game)
     
-    print(f"\n🎮 Game started with {len(player_names)} players!")
-    print(f"   Players: {', '.join(player_names)}")
-    print(f"   Max turns: {max_turns}")
-    print_all_players(game, game.current_player.name)
+    reporter.game_started(game, max_turns)
     
     turn = 0
     actions_this_turn = 0
+    # Only kept current while some agent reads it
+    game_state = game.get_full_state() if any(a.reads_state for a in agents.values()) else None
     max_actions_per_turn = 20  # Prevent infinite loops
     
     while game.phase != GamePhase.GAME_OVER and turn < max_turns:
@@ -77,11 +200,11 @@ def run_game(agents: Dict[str, BaseAgent], max_turns: int = 100, delay: float =
         # New turn started
         if available["phase"] in ["waiting_for_roll", "in_jail"] and actions_this_turn == 0:
             turn += 1
-            print_turn_header(turn, current_name, available["phase"])
-            print_player_status(game, current_name)
+            reporter.turn_started(game, turn, current_name)
         
-        # Get agent's decision
-        game_state = game.get_full_state()
+        # Get agent's decision, refreshing our copy of the state with only what changed
+        if agent.reads_state:
+            game_state = merge_state(game_state, game.get_state_since(game_state["version"]))
         decision = agent.decide(game_state, available)
         
         action = decision.get("action", "").replace(" ", "_")
@@ -91,78 +214,140 @@ def run_game(agents: Dict[str, BaseAgent], max_turns: int = 100, delay: float =
         if "(" in action:
             action = action.split("(")[0].strip()
         
-        print(f"\n  🎯 {current_name} chose: {action}")
-        if params:
-            print(f"     params: {params}")
-        
         # Execute the action
         result = execute_action(game, action, params)
-        
-        # Print result
-        if "error" in result:
-            print(f"  ❌ Error: {result['error']}")
-        else:
-            print_action_result(action, result)
+        reporter.action(game, current_name, action, params, result)
         
         actions_this_turn += 1
         
         # Check if turn ended
         if action == "end_turn" or game.phase == GamePhase.GAME_OVER:
             actions_this_turn = 0
-            print_all_players(game, game.current_player.name)
-            time.sleep(delay)
+            reporter.turn_ended(game)
         
         # Safety check
         if actions_this_turn > max_actions_per_turn:
-            print(f"  ⚠️ Too many actions, forcing turn end")
-            game.end_turn()
+            reporter.turn_forced(game, current_name)
+            force_turn_end(game)
             actions_this_turn = 0
-        
-        # Small delay between actions
-        time.sleep(delay * 0.3)
-    
-    # Game over
-    print("\n" + "🏁" * 25)
-    print("\n  GAME OVER!")
     
+    result = {
+        "winner": game_winner(game),
+        "turns": turn,
+        "seed": game.seed,
+        "final_state": game.get_full_state(),
+        "replay": game.get_replay()
+    }
+    reporter.game_over(game, result)
+    return result
+
+
+def force_turn_end(game: MonopolyGame):
+    """End the current turn whatever it is waiting for: auctions are passed, purchases declined."""
+    if game.phase == GamePhase.AUCTION:
+        for name in game.player_order:
+            if game.phase == GamePhase.AUCTION and name not in game.auction.passed_players:
+                game.pass_auction(name)
+    if game.phase == GamePhase.WAITING_FOR_BUY_DECISION:
+        game.decline_purchase()
+        force_turn_end(game)
+    elif game.phase != GamePhase.GAME_OVER:
+        game.end_turn()
+
+
+def final_score(game: MonopolyGame, name: str) -> int:
+    """Money plus 100 per property, which decides games that reach the turn limit."""
+    p = game.players[name]
+    return p.money + len(p.properties) * 100
+
+
+def game_winner(game: MonopolyGame) -> str:
+    """The last player standing, else the best final_score; the tournament scores games the same way."""
     active = [n for n, p in game.players.items() if not p.bankrupt]
     if len(active) == 1:
-        winner = active[0]
-        print(f"\n  🏆 WINNER: {winner}! 🏆")
-    else:
-        # Determine winner by net worth
-        winner = max(game.players.items(), key=lambda x: x[1].money + len(x[1].properties) * 100)[0]
-        print(f"\n  🏆 WINNER (by net worth): {winner}! 🏆")
+        return active[0]
+    return max(game.players, key=lambda name: final_score(game, name))
+
+
+async def run_game_async(agents: Dict[str, BaseAgent], max_turns: int = 100,
+                         seed: Optional[int] = None) -> Dict[str, Any]:
+    """Play one game quietly, awaiting each agent's adecide() so other games run meanwhile."""
+    game = MonopolyGame(list(agents.keys()), seed=seed)
+    game.initialize()
+    for agent in agents.values():
+        agent.attach(game)
     
-    print_final_results(game)
+    turn = 0
+    decisions = 0
+    actions_this_turn = 0
+    game_state = game.get_full_state()
+    max_actions_per_turn = 20  # Prevent infinite loops
     
-    return {
-        "winner": winner,
-        "turns": turn,
-        "final_state": game.get_full_state()
-    }
+    while game.phase != GamePhase.GAME_OVER and turn < max_turns:
+        available = game.get_available_actions()
+        if available["phase"] in ["waiting_for_roll", "in_jail"] and actions_this_turn == 0:
+            turn += 1
+        
+        game_state = merge_state(game_state, game.get_state_since(game_state["version"]))
+        decision = await agents[game.current_player.name].adecide(game_state, available)
+        decisions += 1
+        
+        action = decision.get("action", "").replace(" ", "_")
+        if "(" in action:
+            action = action.split("(")[0].strip()
+        execute_action(game, action, decision.get("params", {}))
+        
+        actions_this_turn += 1
+        if action == "end_turn" or game.phase == GamePhase.GAME_OVER:
+            actions_this_turn = 0
+        if actions_this_turn > max_actions_per_turn:
+            force_turn_end(game)
+            actions_this_turn = 0
+    
+    return {"winner": game_winner(game), "turns": turn, "seed": game.seed, "decisions": decisions,
+            "finished": game.phase == GamePhase.GAME_OVER}
+
+
+async def run_games_async(make_agents: Callable[[int], Dict[str, BaseAgent]], games: int,
+                          max_turns: int = 100, seed: Optional[int] = None,
+                          on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Play many games at once in this process; make_agents(i) builds the agents of game i.
+
+    Concurrency is bounded by the semaphore the agents share, not by the number
+    of games. Returns the per-game results and decisions per second.
+    """
+    start = time.perf_counter()
+    backends: Dict[int, ModelBackend] = {}
+    
+    async def play(i: int) -> Dict[str, Any]:
+        agents = make_agents(i)
+        for agent in agents.values():
+            backend = getattr(agent, "backend", None)
+            if isinstance(backend, ModelBackend):
+                backends[id(backend)] = backend
+        result = await run_game_async(agents, max_turns, None if seed is None else seed + i)
+        if on_result is not None:
+            on_result(result)
+        return result
+    
+    try:
+        results = await asyncio.gather(*(play(i) for i in range(games)))
+    finally:
+        # Their async clients belong to this event loop, which ends with the run
+        for backend in backends.values():
+            await backend.aclose()
+    elapsed = time.perf_counter() - start
+    decisions = sum(r["decisions"] for r in results)
+    wins: Dict[str, int] = {}
+    for r in results:
+        wins[r["winner"]] = wins.get(r["winner"], 0) + 1
+    return {"games": results, "wins": wins, "elapsed": elapsed, "decisions": decisions,
+            "decisions_per_second": decisions / elapsed if elapsed else 0.0}
 
 
 def execute_action(game: MonopolyGame, action: str, params: Dict) -> Dict[str, Any]:
     """Execute a game action."""
-    action_map = {
-        "roll_dice_and_move": lambda: game.roll_and_move(),
-        "buy_property": lambda: game.buy_current_property(),
-        "decline_purchase": lambda: game.decline_purchase(),
-        "place_bid": lambda: game.place_bid(params.get("player_name", ""), params.get("amount", 0)),
-        "pass_auction": lambda: game.pass_auction(params.get("player_name", "")),
-        "pay_jail_bail": lambda: game.pay_bail(),
-        "use_jail_card": lambda: game.use_jail_card(),
-        "roll_for_doubles": lambda: game.roll_for_doubles(),
-        "build_house": lambda: game.build_house(params.get("property_position", 0)),
-        "mortgage_property": lambda: game.mortgage_property(params.get("property_position", 0)),
-        "unmortgage_property": lambda: game.unmortgage_property(params.get("property_position", 0)),
-        "end_turn": lambda: game.end_turn(),
-    }
-    
-    if action in action_map:
-        return action_map[action]()
-    return {"error": f"Unknown action: {action}"}
+    return game.execute(action, params)
 
 
 def print_action_result(action: str, result: Dict):
@@ -224,62 +409,225 @@ def print_final_results(game: MonopolyGame):
     print("=" * 60)
 
 
+PLAYER_TYPES = ["openai", "ollama", "human", "mcts", "policy", "random"]
+
+
 def main():
     parser = argparse.ArgumentParser(description="Monopoly AI Game")
     parser.add_argument("--player1", default="ChatGPT", help="Name of player 1")
-    parser.add_argument("--player1-type", default="openai", choices=["openai", "ollama", "human"])
+    parser.add_argument("--player1-type", default="openai", choices=PLAYER_TYPES)
     parser.add_argument("--player1-model", default="gpt-4o-mini", help="Model for player 1")
     parser.add_argument("--player2", default="Llama", help="Name of player 2")
-    parser.add_argument("--player2-type", default="ollama", choices=["openai", "ollama", "human"])
+    parser.add_argument("--player2-type", default="ollama", choices=PLAYER_TYPES)
     parser.add_argument("--player2-model", default="llama3.1", help="Model for player 2")
     parser.add_argument("--max-turns", type=int, default=100, help="Maximum turns")
     parser.add_argument("--delay", type=float, default=0.5, help="Delay between actions (seconds)")
     parser.add_argument("--openai-key", help="OpenAI API key (or set OPENAI_API_KEY env var)")
     parser.add_argument("--ollama-host", default="http://localhost:11434", help="Ollama host URL")
+    parser.add_argument("--seed", type=int, help="Seed for dice and card shuffles (reproducible games)")
+    parser.add_argument("--mcts-budget-ms", type=float, default=200, help="Thinking time per MCTS decision")
+    parser.add_argument("--mcts-workers", type=int, default=1, help="Processes running MCTS rollouts")
+    parser.add_argument("--games", type=int, default=1,
+                        help="Games to play at once in this process with async agents (no per-move output)")
+    parser.add_argument("--max-concurrent-requests", type=int, default=16,
+                        help="Model requests in flight at once across all games (with --games)")
+    parser.add_argument("--reporter", default="console", choices=["console", "jsonl", "null"],
+                        help="How the game is reported: terminal output, JSON lines or nothing")
+    parser.add_argument("--jsonl", default="-", help="File for --reporter jsonl ('-' for stdout)")
+    parser.add_argument("--headless", action="store_true",
+                        help="No banner, prompt, output or delays; only the result is printed")
+    parser.add_argument("--temperature", type=float, default=0.7, help="Sampling temperature of model agents")
+    parser.add_argument("--decision-cache", nargs="?", const="", default=None, metavar="PATH",
+                        help="Reuse model decisions for repeated situations; with PATH they are kept "
+                             "in a SQLite file shared across runs")
+    parser.add_argument("--cache-size", type=int, default=10000, help="Decisions kept in memory by the cache")
+    parser.add_argument("--decision-deadline", type=float, default=None,
+                        help="Seconds a model decision may take, retries included, before the fallback "
+                             "policy decides (default 20)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="Record the game's model requests and answers, with its seed, to a cassette file")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="Replay a recorded game: model answers come from the cassette, and requests that "
+                             "differ from the recording are an error")
     args = parser.parse_args()
+    if args.record and args.replay:
+        raise SystemExit("Use either --record or --replay")
+    if args.record or args.replay:
+        if args.games > 1:
+            raise SystemExit("Cassettes hold a single game; drop --games")
+        # A replay must make exactly the recorded requests from the same moves
+        if args.decision_cache is not None:
+            raise SystemExit("Cassettes cannot be used with --decision-cache: cached decisions skip "
+                             "model requests, so a replay would not make the recorded ones")
+        if "mcts" in (args.player1_type, args.player2_type):
+            raise SystemExit("MCTS players search within a time budget and do not play the same "
+                             "game twice; they cannot be recorded or replayed")
+    args.cache = (DecisionCache(args.cache_size, args.decision_cache or None)
+                  if args.decision_cache is not None else None)
     
-    print_banner()
+    if args.headless:
+        args.reporter = "null" if args.reporter == "console" else args.reporter
+        args.delay = 0
+        if "human" in (args.player1_type, args.player2_type):
+            raise SystemExit("Human players cannot play headless")
+    else:
+        print_banner()
     
     # Set up API key
     if args.openai_key:
         os.environ["OPENAI_API_KEY"] = args.openai_key
     
+    try:
+        if args.games > 1:
+            run_many(args)
+        else:
+            run_one(args)
+    finally:
+        if args.cache is not None:
+            if not args.headless:
+                print(f"🗃️  Decision cache: {args.cache.metrics()}")
+            args.cache.close()
+        if not args.headless:
+            for metrics in backend_metrics():
+                print(f"🔌 Backend: {metrics}")
+
+
+def run_one(args):
+    """Play a single game with the --playerN agents."""
+    
     # Create agents
-    print("\n🤖 Initializing AI Agents...")
+    players = [(args.player1, args.player1_type, args.player1_model),
+               (args.player2, args.player2_type, args.player2_model)]
+    cassette = open_cassette(args, players)
+    
+    if not args.headless:
+        print("\n🤖 Initializing AI Agents...")
     
     agents = {}
+    for name, kind, model in players:
+        agents[name], description = make_player(name, kind, model, args)
+        if cassette is not None and isinstance(agents[name], OpenAIAgent):
+            agents[name].backend = cassette.backend(name, agents[name].backend)
+            description += f" ({cassette.mode}ing {cassette.path})"
+        if not args.headless:
+            print(f"  ✓ {name}: {description}")
     
-    # Player 1
-    if args.player1_type == "openai":
-        agents[args.player1] = OpenAIAgent(args.player1, model=args.player1_model)
-        print(f"  ✓ {args.player1}: OpenAI {args.player1_model}")
-    elif args.player1_type == "ollama":
-        agents[args.player1] = OllamaAgent(args.player1, model=args.player1_model, host=args.ollama_host)
-        print(f"  ✓ {args.player1}: Ollama {args.player1_model}")
-    else:
-        agents[args.player1] = create_agent(args.player1, "human")
-        print(f"  ✓ {args.player1}: Human player")
-    
-    # Player 2
-    if args.player2_type == "openai":
-        agents[args.player2] = OpenAIAgent(args.player2, model=args.player2_model)
-        print(f"  ✓ {args.player2}: OpenAI {args.player2_model}")
-    elif args.player2_type == "ollama":
-        agents[args.player2] = OllamaAgent(args.player2, model=args.player2_model, host=args.ollama_host)
-        print(f"  ✓ {args.player2}: Ollama {args.player2_model}")
+    if args.reporter == "jsonl":
+        reporter = JsonlReporter(sys.stdout if args.jsonl == "-" else args.jsonl)
+    elif args.reporter == "null":
+        reporter = NullReporter()
     else:
-        agents[args.player2] = create_agent(args.player2, "human")
-        print(f"  ✓ {args.player2}: Human player")
+        reporter = ConsoleReporter(args.delay)
     
     # Run the game
-    print("\n" + "=" * 60)
-    input("Press Enter to start the game...")
+    if not args.headless:
+        print("\n" + "=" * 60)
+        input("Press Enter to start the game...")
     
-    result = run_game(agents, max_turns=args.max_turns, delay=args.delay)
+    start = time.perf_counter()
+    try:
+        result = run_game(agents, max_turns=args.max_turns, seed=args.seed, reporter=reporter)
+        if cassette is not None:
+            cassette.verify_complete()
+    except CassetteMismatch as e:
+        raise SystemExit(f"❌ Replay of {cassette.path} diverged from the recording: {e}")
+    finally:
+        reporter.close()
+        if cassette is not None:
+            cassette.close()
+        for agent in agents.values():
+            if isinstance(agent, MCTSAgent):
+                agent.close()
+    elapsed = time.perf_counter() - start
     
-    print(f"\n✅ Game completed in {result['turns']} turns")
+    if args.reporter == "jsonl" and args.jsonl == "-":
+        return
+    if args.headless:
+        print(f"{result['winner']} won in {result['turns']} turns (seed {result['seed']}, {elapsed:.3f}s)")
+        return
+    print(f"\n✅ Game completed in {result['turns']} turns (seed {result['seed']})")
     print(f"🏆 Winner: {result['winner']}")
 
 
+def open_cassette(args, players: List[tuple]) -> Optional[Cassette]:
+    """The cassette for --record or --replay, fixing args.seed (and the turn limit on replay) to match it."""
+    if args.replay:
+        cassette = Cassette(args.replay, "replay")
+        if args.seed is not None and args.seed != cassette.seed:
+            raise SystemExit(f"{args.replay} was recorded with seed {cassette.seed}, not {args.seed}")
+        args.seed = cassette.seed
+        args.max_turns = cassette.meta.get("max_turns", args.max_turns)
+        return cassette
+    if args.record:
+        if args.seed is None:
+            args.seed = random.randrange(2 ** 31)
+        return Cassette(args.record, "record", args.seed,
+                        meta={"players": players, "max_turns": args.max_turns, "temperature": args.temperature})
+    return None
+
+
+def make_player(name: str, kind: str, model: str, args) -> tuple:
+    """The agent for one --playerN option group, and how to describe it."""
+    verbose = not args.headless
+    if kind == "openai":
+        return (OpenAIAgent(name, model=model, verbose=verbose, temperature=args.temperature, cache=args.cache,
+                            deadline=args.decision_deadline), f"OpenAI {model}")
+    if kind == "ollama":
+        return (OllamaAgent(name, model=model, host=args.ollama_host, verbose=verbose,
+                            temperature=args.temperature, cache=args.cache, deadline=args.decision_deadline),
+                f"Ollama {model}")
+    if kind == "mcts":
+        return (MCTSAgent(name, budget_ms=args.mcts_budget_ms, workers=args.mcts_workers),
+                f"MCTS {args.mcts_budget_ms:g} ms x {args.mcts_workers} workers")
+    if kind == "policy":
+        return create_agent(name, "policy"), "Fixed policy"
+    if kind == "random":
+        return create_agent(name, "random", seed=args.seed), "Random legal moves"
+    return create_agent(name, "human"), "Human player"
+
+
+def run_many(args):
+    """Play --games games concurrently with async agents and report throughput."""
+    players = [(args.player1, args.player1_type, args.player1_model),
+               (args.player2, args.player2_type, args.player2_model)]
+    if any(kind == "human" for _, kind, _ in players):
+        raise SystemExit("Human players cannot join concurrent games")
+    limiter = asyncio.Semaphore(args.max_concurrent_requests)
+    created: List[BaseAgent] = []
+    
+    def make_agents(i: int) -> Dict[str, BaseAgent]:
+        agents = {}
+        for name, kind, model in players:
+            if kind == "openai":
+                agents[name] = AsyncOpenAIAgent(name, model=model, limiter=limiter, verbose=False,
+                                                temperature=args.temperature, cache=args.cache,
+                                                deadline=args.decision_deadline)
+            elif kind == "ollama":
+                agents[name] = AsyncOllamaAgent(name, model=model, host=args.ollama_host, limiter=limiter,
+                                                verbose=False, temperature=args.temperature, cache=args.cache,
+                                                deadline=args.decision_deadline)
+            else:
+                agents[name] = make_player(name, kind, model, args)[0]
+            created.append(agents[name])
+        return agents
+    
+    def on_result(result: Dict[str, Any]):
+        print(f"  game (seed {result['seed']}): {result['winner']} won after {result['turns']} turns")
+    
+    print(f"\n🎮 Playing {args.games} games at once, up to {args.max_concurrent_requests} model requests in flight")
+    try:
+        summary = asyncio.run(run_games_async(make_agents, args.games, args.max_turns, args.seed, on_result))
+    finally:
+        for agent in created:
+            if isinstance(agent, MCTSAgent):
+                agent.close()
+    
+    requests = sum(getattr(agent, "requests", 0) for agent in created)
+    print(f"\n✅ {args.games} games in {summary['elapsed']:.1f}s: {summary['decisions_per_second']:.1f} decisions/s, "
+          f"{requests / summary['elapsed']:.1f} model requests/s")
+    for name, wins in sorted(summary["wins"].items(), key=lambda x: -x[1]):
+        print(f"🏆 {name}: {wins} wins")
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
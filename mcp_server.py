@@ -2,27 +2,126 @@
 Monopoly MCP Server - Exposes game actions as tools for AI agents
 """
 
+import os
 import json
 import asyncio
-from typing import Any, Optional
+import argparse
+import contextlib
+from typing import Any, Dict, Optional
+from jsonschema.validators import validator_for
 from mcp.server import Server, NotificationOptions
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
+from mcp.types import Tool, TextContent, Resource, ResourceTemplate
 
-from game_engine import MonopolyGame, GamePhase
+from game_engine import MonopolyGame, GamePhase, ACTIONS
+from game_registry import GameRegistry, GameSession, DEFAULT_CAPACITY, IDLE_SECONDS, MAX_RESIDENT
+from game_persistence import GamePersistence, SNAPSHOT_EVERY, FSYNC_INTERVAL
+from subscriptions import SubscriptionHub
+from board_analytics import board_analytics, tile_analytics, group_analytics, JAIL_STRATEGIES
 
 
-# Global game instance
-game: Optional[MonopolyGame] = None
-server = Server("monopoly-game")
+# Hosted games by game_id
+registry = GameRegistry(int(os.getenv("MONOPOLY_MAX_GAMES", DEFAULT_CAPACITY)),
+                        idle_seconds=float(os.getenv("MONOPOLY_IDLE_SECONDS", IDLE_SECONDS)),
+                        max_resident=int(os.getenv("MONOPOLY_MAX_RESIDENT", MAX_RESIDENT)),
+                        store_path=os.getenv("MONOPOLY_HIBERNATE_DB"))
 
 
-def get_game() -> MonopolyGame:
-    global game
-    if game is None:
-        raise ValueError("Game not initialized. Call 'start_game' first.")
-    return game
+class MonopolyServer(Server):
+    def get_capabilities(self, *args, **kwargs):
+        # The SDK always announces resources without subscribe support
+        capabilities = super().get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+
+server = MonopolyServer("monopoly-game")
+# Clients subscribed to game resources
+hub = SubscriptionHub()
+
+# Tools that do not address a game
+SERVER_TOOLS = frozenset({"start_game", "list_games", "end_game", "get_board_analytics"})
+
+# Serialized responses of read-only tools, per game, keyed by (tool, arguments,
+# state version, compact). Any other tool on that game clears its cache.
+READ_ONLY_TOOLS = frozenset({
+    "get_game_state", "get_state_since", "get_my_status", "get_property_info", "get_available_actions",
+})
+RESPONSE_CACHE_SIZE = 32
+_analytics_cache: Dict[tuple, str] = {}
+cache_stats = {"hits": 0, "misses": 0}
+
+COMPACT_PROPERTY = {"type": "boolean", "description": "Return compact JSON without indentation"}
+GAME_ID_PROPERTY = {"type": "string", "description": "Game to act on, as returned by start_game (optional while only one game is running)"}
+
+
+# ============================================================================
+# RESOURCES
+# ============================================================================
+
+GAMES_URI = "monopoly://games"
+
+
+def game_uri(game_id: str) -> str:
+    return f"{GAMES_URI}/{game_id}"
+
+
+def uri_session(uri: str) -> GameSession:
+    if not uri.startswith(GAMES_URI + "/"):
+        raise ValueError(f"Unknown resource: {uri}")
+    return registry.get(uri[len(GAMES_URI) + 1:])
+
+
+def watched_state(game: MonopolyGame) -> tuple:
+    """The parts of a game whose change is pushed to subscribers: phase, turn, auction bids and bankruptcies."""
+    auction = game.auction and (game.auction.current_bid, game.auction.current_bidder)
+    return (game.phase, game.current_player_idx, game.turn_number, auction,
+            tuple(p.bankrupt for p in game.players.values()))
+
+
+@server.list_resources()
+async def list_resources() -> list[Resource]:
+    resources = [Resource(uri=GAMES_URI, name="games", mimeType="application/json",
+                          description="Hosted games; updated when a game starts or ends")]
+    for session in list(registry.sessions.values()):
+        resources.append(Resource(
+            uri=game_uri(session.game_id), name=f"game {session.game_id}", mimeType="application/json",
+            description="Full game state; updated on phase and turn changes, auction bids and bankruptcies"))
+    return resources
+
+
+@server.list_resource_templates()
+async def list_resource_templates() -> list[ResourceTemplate]:
+    return [ResourceTemplate(uriTemplate=f"{GAMES_URI}/{{game_id}}", name="game", mimeType="application/json",
+                             description="Full state of a hosted game")]
+
+
+@server.read_resource()
+async def read_resource(uri) -> list[ReadResourceContents]:
+    uri = str(uri)
+    if uri == GAMES_URI:
+        text = serialize(registry.list(), compact=True)
+    else:
+        session = uri_session(uri)
+        async with session.lock:
+            text = run_game_tool(session, "get_game_state", {}, compact=True)
+    return [ReadResourceContents(content=text, mime_type="application/json")]
+
+
+@server.subscribe_resource()
+async def subscribe_resource(uri):
+    uri = str(uri)
+    if uri != GAMES_URI:
+        uri_session(uri)
+    hub.subscribe(server.request_context.session, uri)
+
+
+@server.unsubscribe_resource()
+async def unsubscribe_resource(uri):
+    hub.unsubscribe(server.request_context.session, str(uri))
 
 
 # ============================================================================
@@ -31,7 +130,7 @@ def get_game() -> MonopolyGame:
 
 @server.list_tools()
 async def list_tools() -> list[Tool]:
-    return [
+    tools = [
         Tool(
             name="start_game",
             description="Initialize a new Monopoly game with specified players. Must be called before any other action.",
@@ -44,7 +143,8 @@ async def list_tools() -> list[Tool]:
                         "description": "List of player names",
                         "minItems": 2,
                         "maxItems": 6
-                    }
+                    },
+                    "seed": {"type": "integer", "description": "Optional seed for dice and card shuffles, for reproducible games"}
                 },
                 "required": ["players"]
             }
@@ -54,6 +154,17 @@ async def list_tools() -> list[Tool]:
             description="Get the current state of the game including all player positions, money, properties, and whose turn it is.",
             inputSchema={"type": "object", "properties": {}}
         ),
+        Tool(
+            name="get_state_since",
+            description="Get only what changed since a state version returned by get_game_state or an earlier call: changed player fields, tiles, phase and new messages. Returns the full state with \"full\": true if that version is too old.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "version": {"type": "integer", "description": "The \"version\" of the state you already have"}
+                },
+                "required": ["version"]
+            }
+        ),
         Tool(
             name="get_my_status",
             description="Get detailed status for a specific player including their money, position, properties, and available actions.",
@@ -156,6 +267,40 @@ async def list_tools() -> list[Tool]:
             description="End the current player's turn and move to the next player.",
             inputSchema={"type": "object", "properties": {}}
         ),
+        Tool(
+            name="advance_until_decision",
+            description="Take forced moves (a lone roll or end_turn) until a player has a real choice or the game ends. Returns the moves taken, their events and the actions now available.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "allow_jail_roll": {"type": "boolean", "description": "Also roll for doubles for a jailed player who cannot pay bail or use a card"},
+                    "max_steps": {"type": "integer", "description": "Most forced moves to take (default 200)"}
+                }
+            }
+        ),
+        Tool(
+            name="execute_actions",
+            description="Run several actions in one call, e.g. buy_property, build_house x2, end_turn. Stops at the first error; when atomic (default) the earlier steps are undone too. Returns each step's result and the final state version.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "actions": {
+                        "type": "array",
+                        "description": "Steps in order",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "action": {"type": "string", "enum": list(ACTIONS), "description": "Action tool name"},
+                                "params": {"type": "object", "description": "That tool's arguments"}
+                            },
+                            "required": ["action"]
+                        }
+                    },
+                    "atomic": {"type": "boolean", "description": "Undo every step if one fails (default true)"}
+                },
+                "required": ["actions"]
+            }
+        ),
         Tool(
             name="get_property_info",
             description="Get detailed information about a specific property on the board.",
@@ -167,107 +312,400 @@ async def list_tools() -> list[Tool]:
                 "required": ["position"]
             }
         ),
+        Tool(
+            name="get_board_analytics",
+            description="Steady-state landing odds, expected rent per opponent turn and payback period for tiles and color groups at every house level. Works without a running game.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "position": {"type": "integer", "description": "Only this board position (0-39)"},
+                    "color_group": {"type": "string", "description": "Only this color group, e.g. 'orange'"},
+                    "jail_strategy": {"type": "string", "enum": list(JAIL_STRATEGIES), "description": "Stay in jail rolling for doubles, or pay to leave (default roll)"}
+                }
+            }
+        ),
         Tool(
             name="get_available_actions",
             description="Get a list of valid actions the current player can take right now.",
             inputSchema={"type": "object", "properties": {}}
         ),
     ]
+    tools += [
+        Tool(
+            name="list_games",
+            description="List the games hosted by this server with their phase, turn and idle time, plus hibernation metrics (resident and hibernated counts, rehydration latency).",
+            inputSchema={"type": "object", "properties": {}}
+        ),
+        Tool(
+            name="end_game",
+            description="End a game and free its slot on the server.",
+            inputSchema={
+                "type": "object",
+                "properties": {"game_id": {"type": "string", "description": "Game to end"}},
+                "required": ["game_id"]
+            }
+        ),
+    ]
+    for tool in tools:
+        if tool.name not in SERVER_TOOLS:
+            tool.inputSchema["properties"]["game_id"] = GAME_ID_PROPERTY
+        tool.inputSchema["properties"]["compact"] = COMPACT_PROPERTY
+    return tools
 
 
 # ============================================================================
 # TOOL HANDLERS
 # ============================================================================
 
-@server.call_tool()
+# Input validators compiled once per tool. The SDK's own validation calls
+# jsonschema.validate(), which re-checks the schema itself on every call.
+_validators: Dict[str, Any] = {}
+# (tool, arguments) that passed validation; agents repeat the same calls a lot
+# and a jsonschema check costs more than most reads
+VALID_CALLS_SIZE = 4096
+_valid_calls: Dict[tuple, None] = {}
+
+
+async def validate_arguments(name: str, arguments: Dict[str, Any]):
+    if not _validators:
+        for tool in await list_tools():
+            _validators[tool.name] = validator_for(tool.inputSchema)(tool.inputSchema)
+    if name in _validators:
+        key = (name, json.dumps(arguments, sort_keys=True))
+        if key in _valid_calls:
+            return
+        error = next(_validators[name].iter_errors(arguments), None)
+        if error is not None:
+            raise ValueError(f"Input validation error: {error.message}")
+        if len(_valid_calls) >= VALID_CALLS_SIZE:
+            _valid_calls.clear()
+        _valid_calls[key] = None
+
+
+@server.call_tool(validate_input=False)
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
-    global game
+    arguments = dict(arguments or {})
     
     try:
-        if name == "start_game":
-            players = arguments.get("players", ["Player1", "Player2"])
-            game = MonopolyGame(players)
-            result = game.initialize()
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        g = get_game()
-        
-        if name == "get_game_state":
-            result = g.get_full_state()
-        
-        elif name == "get_my_status":
-            player_name = arguments["player_name"]
-            result = g.get_player_status(player_name)
-        
-        elif name == "roll_dice_and_move":
-            result = g.roll_and_move()
-        
-        elif name == "buy_property":
-            result = g.buy_current_property()
-        
-        elif name == "decline_purchase":
-            result = g.decline_purchase()
-        
-        elif name == "place_bid":
-            result = g.place_bid(arguments["player_name"], arguments["amount"])
-        
-        elif name == "pass_auction":
-            result = g.pass_auction(arguments["player_name"])
-        
-        elif name == "pay_jail_bail":
-            result = g.pay_bail()
-        
-        elif name == "use_jail_card":
-            result = g.use_jail_card()
-        
-        elif name == "roll_for_doubles":
-            result = g.roll_for_doubles()
-        
-        elif name == "build_house":
-            result = g.build_house(arguments["property_position"])
-        
-        elif name == "mortgage_property":
-            result = g.mortgage_property(arguments["property_position"])
-        
-        elif name == "unmortgage_property":
-            result = g.unmortgage_property(arguments["property_position"])
-        
-        elif name == "end_turn":
-            result = g.end_turn()
-        
-        elif name == "get_property_info":
-            result = g.get_property_info(arguments["position"])
-        
-        elif name == "get_available_actions":
-            result = g.get_available_actions()
-        
+        text = cached_response(name, arguments)
+        if text is not None:
+            return [TextContent(type="text", text=text)]
+        await validate_arguments(name, arguments)
+        compact = bool(arguments.pop("compact", False))
+        if name in SERVER_TOOLS:
+            text = await run_server_tool(name, arguments, compact)
         else:
-            result = {"error": f"Unknown tool: {name}"}
-        
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            session = registry.get(arguments.pop("game_id", None))
+            async with session.lock:
+                text = run_game_tool(session, name, arguments, compact)
+        return [TextContent(type="text", text=text)]
     
     except Exception as e:
         return [TextContent(type="text", text=json.dumps({"error": str(e)}))]
 
 
+def serialize(result: Dict[str, Any], compact: bool = False) -> str:
+    if compact:
+        return json.dumps(result, separators=(",", ":"))
+    return json.dumps(result, indent=2)
+
+
+async def run_server_tool(name: str, arguments: Dict[str, Any], compact: bool) -> str:
+    if name == "start_game":
+        players = arguments.get("players", ["Player1", "Player2"])
+        session = registry.start(players, seed=arguments.get("seed"))
+        result = {"game_id": session.game_id, **session.game.initialize()}
+        registry.commit(session)
+        hub.publish(GAMES_URI)
+    
+    elif name == "list_games":
+        result = {**registry.list(), "subscriptions": hub.metrics()}
+    
+    elif name == "end_game":
+        session = registry.get(arguments["game_id"])
+        async with session.lock:
+            result = registry.end(session.game_id)
+        hub.publish(game_uri(session.game_id))
+        hub.forget(game_uri(session.game_id))
+        hub.publish(GAMES_URI)
+    
+    else:
+        # Board analytics never change, so their text is kept for good
+        key = (json.dumps(arguments, sort_keys=True), compact)
+        if key not in _analytics_cache:
+            _analytics_cache[key] = serialize(run_analytics_tool(arguments), compact)
+        return _analytics_cache[key]
+    
+    return serialize(result, compact)
+
+
+def run_analytics_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    strategy = arguments.get("jail_strategy", "roll")
+    if "position" in arguments:
+        return tile_analytics(arguments["position"], strategy)
+    if "color_group" in arguments:
+        return group_analytics(arguments["color_group"], strategy)
+    return board_analytics(strategy)
+
+
+def cached_response(name: str, arguments: Dict[str, Any]) -> Optional[str]:
+    """A read-only tool's cached text for the raw call arguments, or None.
+
+    Only valid calls are ever cached, so a hit skips input validation; any
+    argument the cache key does not cover exactly leaves it to the full path.
+    """
+    compact = arguments.get("compact", False)
+    game_id = arguments.get("game_id")
+    if (name not in READ_ONLY_TOOLS or not RESPONSE_CACHE_SIZE or type(compact) is not bool
+            or ("game_id" in arguments and type(game_id) is not str)):
+        return None
+    session = registry.sessions.get(game_id) if game_id is not None else None
+    if session is None and game_id is None and len(registry.sessions) == 1:
+        session = next(iter(registry.sessions.values()))
+    if session is None or session.game is None:
+        return None
+    rest = {k: v for k, v in arguments.items() if k != "game_id" and k != "compact"}
+    text = _cache_get(session, (name, json.dumps(rest, sort_keys=True), session.game.version, compact))
+    if text is not None:
+        registry.touch(session)
+    return text
+
+
+def _cache_get(session: GameSession, key: tuple) -> Optional[str]:
+    text = session.responses.get(key)
+    if text is not None:
+        session.responses.move_to_end(key)
+        cache_stats["hits"] += 1
+    return text
+
+
+def run_game_tool(session: GameSession, name: str, arguments: Dict[str, Any], compact: bool) -> str:
+    """Serialized result of a tool on one game, from its response cache when nothing changed."""
+    game = registry.touch(session)
+    if name not in READ_ONLY_TOOLS:
+        session.responses.clear()
+        before = watched_state(game)
+        result = run_tool(game, name, arguments)
+        registry.commit(session)
+        if watched_state(game) != before:
+            hub.publish(game_uri(session.game_id))
+        return serialize(result, compact)
+    if not RESPONSE_CACHE_SIZE:
+        return serialize(run_tool(game, name, arguments), compact)
+    
+    key = (name, json.dumps(arguments, sort_keys=True), game.version, compact)
+    text = _cache_get(session, key)
+    if text is not None:
+        return text
+    cache_stats["misses"] += 1
+    text = serialize(run_tool(game, name, arguments), compact)
+    session.responses[key] = text
+    if len(session.responses) > RESPONSE_CACHE_SIZE:
+        session.responses.popitem(last=False)
+    return text
+
+
+def run_tool(g: MonopolyGame, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one tool call against a game and return its result dict."""
+    
+    if name == "get_game_state":
+        result = g.get_full_state()
+    
+    elif name == "get_state_since":
+        result = g.get_state_since(arguments["version"])
+    
+    elif name == "get_my_status":
+        player_name = arguments["player_name"]
+        result = g.get_player_status(player_name)
+    
+    elif name == "roll_dice_and_move":
+        result = g.roll_and_move()
+    
+    elif name == "buy_property":
+        result = g.buy_current_property()
+    
+    elif name == "decline_purchase":
+        result = g.decline_purchase()
+    
+    elif name == "place_bid":
+        result = g.place_bid(arguments["player_name"], arguments["amount"])
+    
+    elif name == "pass_auction":
+        result = g.pass_auction(arguments["player_name"])
+    
+    elif name == "pay_jail_bail":
+        result = g.pay_bail()
+    
+    elif name == "use_jail_card":
+        result = g.use_jail_card()
+    
+    elif name == "roll_for_doubles":
+        result = g.roll_for_doubles()
+    
+    elif name == "build_house":
+        result = g.build_house(arguments["property_position"])
+    
+    elif name == "mortgage_property":
+        result = g.mortgage_property(arguments["property_position"])
+    
+    elif name == "unmortgage_property":
+        result = g.unmortgage_property(arguments["property_position"])
+    
+    elif name == "end_turn":
+        result = g.end_turn()
+    
+    elif name == "advance_until_decision":
+        result = g.advance_until_decision(arguments.get("allow_jail_roll", False), arguments.get("max_steps", 200))
+    
+    elif name == "execute_actions":
+        result = g.execute_actions(arguments["actions"], arguments.get("atomic", True))
+    
+    elif name == "get_property_info":
+        result = g.get_property_info(arguments["position"])
+    
+    elif name == "get_available_actions":
+        result = g.get_available_actions()
+    
+    else:
+        result = {"error": f"Unknown tool: {name}"}
+    
+    return result
+
+
 # ============================================================================
 # SERVER ENTRY POINT
 # ============================================================================
 
 async def main():
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="monopoly-game",
-                server_version="1.0.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={}
-                )
-            )
+    parser = argparse.ArgumentParser(description="Monopoly MCP server")
+    parser.add_argument("--transport", choices=["stdio", "http", "sse"], default="stdio",
+                        help="stdio serves one client; http (streamable HTTP) and sse share one server between many")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--keep-alive", type=float, default=30.0,
+                        help="Seconds an idle HTTP connection is kept open for the client's next request")
+    parser.add_argument("--max-connections", type=int, default=1000,
+                        help="Concurrent HTTP connections and requests; beyond this new ones get 503")
+    parser.add_argument("--max-sessions", type=int, default=1000,
+                        help="Concurrent MCP sessions over HTTP; beyond this new sessions get 503")
+    parser.add_argument("--stream-responses", action="store_true",
+                        help="Answer streamable HTTP requests with SSE streams instead of JSON bodies")
+    parser.add_argument("--max-games", type=int, default=registry.capacity,
+                        help="Games hosted at once (or set MONOPOLY_MAX_GAMES)")
+    parser.add_argument("--idle-seconds", type=float, default=registry.idle_seconds,
+                        help="Hibernate games idle this long (or set MONOPOLY_IDLE_SECONDS)")
+    parser.add_argument("--max-resident", type=int, default=registry.max_resident,
+                        help="Games kept in memory; least recently used ones beyond this are hibernated "
+                             "(or set MONOPOLY_MAX_RESIDENT)")
+    parser.add_argument("--hibernate-db", default=registry.store_path,
+                        help="SQLite file for hibernated games (default: a file in the temp directory)")
+    parser.add_argument("--state-dir", default=os.getenv("MONOPOLY_STATE_DIR"),
+                        help="Journal games here and recover them on restart (or set MONOPOLY_STATE_DIR)")
+    parser.add_argument("--snapshot-every", type=int, default=SNAPSHOT_EVERY,
+                        help="Actions between full snapshots of a game")
+    parser.add_argument("--fsync-interval", type=float, default=FSYNC_INTERVAL,
+                        help="Seconds between group fsyncs of the journals; 0 fsyncs every action")
+    args = parser.parse_args()
+    registry.capacity = args.max_games
+    registry.idle_seconds = args.idle_seconds
+    registry.max_resident = args.max_resident
+    registry.store_path = args.hibernate_db
+    
+    tasks = [asyncio.create_task(hibernate_idle_games())]
+    if args.state_dir:
+        registry.persistence = GamePersistence(args.state_dir, args.snapshot_every, args.fsync_interval)
+        registry.recover()
+        if args.fsync_interval:
+            tasks.append(asyncio.create_task(sync_journals(args.fsync_interval)))
+    try:
+        if args.transport == "stdio":
+            await serve()
+        else:
+            await serve_http(args)
+    finally:
+        for task in tasks:
+            task.cancel()
+        registry.close()
+
+
+async def hibernate_idle_games():
+    while True:
+        await asyncio.sleep(max(1.0, registry.idle_seconds / 4))
+        registry.hibernate_idle()
+
+
+async def sync_journals(interval: float):
+    # Group commit: one pass fsyncs every journal written since the last one
+    while True:
+        await asyncio.sleep(interval)
+        registry.persistence.sync()
+
+
+def initialization_options() -> InitializationOptions:
+    return InitializationOptions(
+        server_name="monopoly-game",
+        server_version="1.0.0",
+        capabilities=server.get_capabilities(
+            notification_options=NotificationOptions(),
+            experimental_capabilities={}
         )
+    )
+
+
+async def serve():
+    async with stdio_server() as (read_stream, write_stream):
+        await server.run(read_stream, write_stream, initialization_options())
+
+
+def http_app(transport: str, max_sessions: int, stream_responses: bool = False):
+    """Starlette app serving MCP over streamable HTTP at /mcp, or SSE at /sse + /messages/."""
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Mount, Route
+    
+    if transport == "sse":
+        from mcp.server.sse import SseServerTransport
+        sse = SseServerTransport("/messages/")
+        
+        async def handle_sse(request):
+            async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, initialization_options())
+            return Response()
+        
+        return Starlette(routes=[Route("/sse", endpoint=handle_sse, methods=["GET"]),
+                                 Mount("/messages/", app=sse.handle_post_message)])
+    
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    # Plain JSON responses leave the connection reusable for the client's next
+    # request; SSE response streams are often dropped mid-stream by clients,
+    # costing a new TCP connection per call
+    manager = StreamableHTTPSessionManager(app=server, max_sessions=max_sessions, json_response=not stream_responses)
+    
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        async with manager.run():
+            yield
+    
+    return Starlette(routes=[Route("/mcp", endpoint=_SessionEndpoint(manager))], lifespan=lifespan)
+
+
+class _SessionEndpoint:
+    """ASGI endpoint handing /mcp requests to the streamable HTTP session manager."""
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    async def __call__(self, scope, receive, send):
+        await self.manager.handle_request(scope, receive, send)
+
+
+async def serve_http(args):
+    import uvicorn
+    config = uvicorn.Config(
+        http_app(args.transport, args.max_sessions, args.stream_responses), host=args.host, port=args.port,
+        timeout_keep_alive=args.keep_alive, limit_concurrency=args.max_connections, log_level="warning",
+    )
+    await uvicorn.Server(config).serve()
 
 
 if __name__ == "__main__":
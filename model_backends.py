@@ -0,0 +1,262 @@
+"""
+Model Backends - Shared, pooled chat-completion clients with deadlines and a circuit breaker
+
+Agents that talk to the same host share one backend: one pooled HTTP client,
+one breaker and one set of latency metrics. Every decision has a deadline
+that covers its retries, split between the attempts still allowed so a hung
+request leaves time to try again. Transient failures are retried with full-jitter
+backoff while time remains. After repeated failures the breaker fails
+requests at once, so agents go straight to their fallback policy until a probe
+request gets through again.
+"""
+
+import time
+import random
+import asyncio
+import weakref
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import openai
+from openai import OpenAI, AsyncOpenAI
+
+
+OPENAI_URL = "https://api.openai.com/v1"
+# Seconds a decision may spend on the model, retries included
+DEADLINE_SECONDS = 20.0
+# Retries after the first attempt, and the backoff cap they draw from
+RETRIES = 2
+BACKOFF_BASE = 0.1
+BACKOFF_CAP = 2.0
+# Consecutive failures that open the breaker, and how long it stays open before a probe
+FAILURE_THRESHOLD = 5
+RESET_SECONDS = 30.0
+# Connections kept per backend host
+POOL_CONNECTIONS = 64
+LATENCY_SAMPLES = 1000
+
+# Worth another try: the backend may answer next time
+RETRYABLE = (openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError,
+             openai.InternalServerError)
+# The caller gave up, e.g. a cancelled game; not a failure of the backend
+INTERRUPTED = (asyncio.CancelledError, KeyboardInterrupt)
+
+
+class BackendUnavailable(Exception):
+    """The backend's breaker is open; the decision should use its fallback."""
+
+
+class CircuitBreaker:
+    """Closed while requests succeed; open after failure_threshold failures in a row.
+
+    Once reset_seconds have passed, one request is let through as a probe
+    (half-open): success closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, reset_seconds: float = RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.stats = {"opened": 0, "short_circuited": 0}
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = "half_open"
+            return True
+        self.stats["short_circuited"] += 1
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+
+    def release(self):
+        """A request was cancelled before it had an outcome; a probe it held goes to the next request."""
+        if self.state == "half_open":
+            self.state = "open"
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.stats["opened"] += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+class ModelBackend:
+    """One chat-completions host: pooled clients, breaker, retry policy and metrics."""
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 deadline: float = DEADLINE_SECONDS, retries: int = RETRIES,
+                 breaker: Optional[CircuitBreaker] = None, pool_connections: int = POOL_CONNECTIONS):
+        self.base_url = base_url or OPENAI_URL
+        self.api_key = api_key
+        self.deadline = deadline
+        self.retries = retries
+        self.breaker = breaker or CircuitBreaker()
+        self.limits = httpx.Limits(max_connections=pool_connections, max_keepalive_connections=pool_connections)
+        self._http: Optional[httpx.Client] = None
+        self._client: Optional[OpenAI] = None
+        # Async clients are tied to the event loop their connections were opened on
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = \
+            weakref.WeakKeyDictionary()
+        self.stats = {"decisions": 0, "requests": 0, "retries": 0, "timeouts": 0, "failures": 0}
+        self._latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+
+    @property
+    def client(self) -> OpenAI:
+        if self._client is None:
+            if self._http is None:
+                self._http = httpx.Client(limits=self.limits)
+            self._client = OpenAI(base_url=self.base_url, api_key=self.api_key, max_retries=0,
+                                  http_client=self._http)
+        return self._client
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = AsyncOpenAI(
+                base_url=self.base_url, api_key=self.api_key, max_retries=0,
+                http_client=httpx.AsyncClient(limits=self.limits))
+        return client
+
+    def complete(self, model: str, messages: List[Dict[str, str]], temperature: float,
+                 max_tokens: int, deadline: Optional[float] = None) -> str:
+        """The completion's text, within deadline seconds (the backend's by default)."""
+        start, end = self._begin(deadline)
+        attempt = 0
+        while True:
+            try:
+                response = self.client.chat.completions.create(
+                    model=model, messages=messages, temperature=temperature, max_tokens=max_tokens,
+                    timeout=self._timeout(attempt, end))
+                return self._succeeded(response, start)
+            except RETRYABLE as e:
+                delay = self._failed(e, attempt, end)
+            except openai.APIStatusError:
+                # The backend answered; the request itself was refused
+                self.breaker.record_success()
+                raise
+            except INTERRUPTED:
+                # Says nothing about the backend, but must not hold on to a probe
+                self.breaker.release()
+                raise
+            except BaseException:
+                # Bad responses and the like still need an outcome, or a
+                # half-open breaker would wait on its probe for ever
+                self.breaker.record_failure()
+                raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def acomplete(self, model: str, messages: List[Dict[str, str]], temperature: float,
+                        max_tokens: int, deadline: Optional[float] = None) -> str:
+        """complete() for the async runner."""
+        start, end = self._begin(deadline)
+        attempt = 0
+        while True:
+            try:
+                response = await self.async_client.chat.completions.create(
+                    model=model, messages=messages, temperature=temperature, max_tokens=max_tokens,
+                    timeout=self._timeout(attempt, end))
+                return self._succeeded(response, start)
+            except RETRYABLE as e:
+                delay = self._failed(e, attempt, end)
+            except openai.APIStatusError:
+                self.breaker.record_success()
+                raise
+            except INTERRUPTED:
+                self.breaker.release()
+                raise
+            except BaseException:
+                self.breaker.record_failure()
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    # ------------------------------------------------------------------ retry policy
+
+    def _begin(self, deadline: Optional[float]) -> Tuple[float, float]:
+        self.stats["decisions"] += 1
+        if not self.breaker.allow():
+            raise BackendUnavailable(f"{self.base_url} is failing; circuit open")
+        start = time.monotonic()
+        return start, start + (self.deadline if deadline is None else deadline)
+
+    def _timeout(self, attempt: int, end: float) -> float:
+        """An equal share of the time left for this and each remaining attempt."""
+        self.stats["requests"] += 1
+        return max(0.001, (end - time.monotonic()) / (self.retries - attempt + 1))
+
+    def _succeeded(self, response: Any, start: float) -> str:
+        content = response.choices[0].message.content
+        self.breaker.record_success()
+        self._latencies.append(time.monotonic() - start)
+        return content
+
+    def _failed(self, error: Exception, attempt: int, end: float) -> float:
+        """Backoff before the next attempt; re-raises error when out of retries or time."""
+        if isinstance(error, openai.APITimeoutError):
+            self.stats["timeouts"] += 1
+        delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+        # A failed probe reopens the breaker at once rather than retrying
+        if attempt >= self.retries or time.monotonic() + delay >= end or self.breaker.state == "half_open":
+            self.stats["failures"] += 1
+            self.breaker.record_failure()
+            raise error
+        self.stats["retries"] += 1
+        return delay
+
+    def metrics(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        return {"base_url": self.base_url, "breaker": self.breaker.state, **self.stats, **self.breaker.stats,
+                "latency_ms_p50": _percentile_ms(latencies, 0.5),
+                "latency_ms_p99": _percentile_ms(latencies, 0.99)}
+
+    async def aclose(self):
+        """Close the running event loop's async client; call it before the loop ends."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    def close(self):
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+            self._client = None
+        # Clients of loops that ended without aclose() can no longer be awaited
+        for loop, client in list(self._async_clients.items()):
+            if not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(client.close())
+        self._async_clients.clear()
+
+
+def _percentile_ms(latencies: List[float], q: float) -> Optional[float]:
+    if not latencies:
+        return None
+    return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 3)
+
+
+# Backends shared by every agent in the process, by (base_url, api_key)
+_backends: Dict[Tuple[str, Optional[str]], ModelBackend] = {}
+
+
+def backend_for(base_url: Optional[str] = None, api_key: Optional[str] = None) -> ModelBackend:
+    """The process-wide backend for a host, created with the module defaults on first use."""
+    key = (base_url or OPENAI_URL, api_key)
+    backend = _backends.get(key)
+    if backend is None:
+        backend = _backends[key] = ModelBackend(base_url, api_key)
+    return backend
+
+
+def backend_metrics() -> List[Dict[str, Any]]:
+    return [backend.metrics() for backend in _backends.values()]
@@ -0,0 +1,118 @@
+"""
+Subscriptions - Resource update notifications for MCP clients that watch games
+
+Publishing never waits on a client: each subscriber has a set of pending URIs
+drained by its own sender task, so repeated changes to a game a slow client
+has not been told about yet collapse into one notification.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set
+
+from pydantic import AnyUrl
+
+
+@dataclass(eq=False)
+class Subscriber:
+    """One client session, the URIs it watches and those it still has to be told about."""
+    session: Any
+    uris: Set[str] = field(default_factory=set)
+    # Insertion-ordered set of URIs changed since they were last sent
+    pending: Dict[str, None] = field(default_factory=dict)
+    wake: asyncio.Event = field(default_factory=asyncio.Event)
+    task: Optional[asyncio.Task] = None
+
+
+class SubscriptionHub:
+    """Who watches which resource URI, and the coalescing senders that notify them."""
+
+    def __init__(self):
+        self.subscribers: Dict[int, Subscriber] = {}
+        self.watchers: Dict[str, Set[Subscriber]] = {}
+        self.stats = {"published": 0, "sent": 0, "coalesced": 0, "dropped": 0}
+
+    def subscribe(self, session: Any, uri: str):
+        subscriber = self.subscribers.get(id(session))
+        if subscriber is None:
+            subscriber = self.subscribers[id(session)] = Subscriber(session)
+            subscriber.task = asyncio.create_task(self._send(subscriber))
+        subscriber.uris.add(uri)
+        self.watchers.setdefault(uri, set()).add(subscriber)
+
+    def unsubscribe(self, session: Any, uri: str):
+        subscriber = self.subscribers.get(id(session))
+        if subscriber is None:
+            return
+        subscriber.uris.discard(uri)
+        subscriber.pending.pop(uri, None)
+        self._unwatch(subscriber, uri)
+        if not subscriber.uris:
+            self._drop(subscriber)
+
+    def publish(self, uri: str):
+        """Mark uri changed for everyone watching it. Never blocks."""
+        watchers = self.watchers.get(uri)
+        if not watchers:
+            return
+        self.stats["published"] += 1
+        for subscriber in watchers:
+            if uri in subscriber.pending:
+                self.stats["coalesced"] += 1
+            else:
+                subscriber.pending[uri] = None
+                subscriber.wake.set()
+
+    def forget(self, uri: str):
+        """Stop watching a resource that no longer exists, after a last publish().
+
+        Subscribers left watching nothing are dropped, as unsubscribe() does,
+        once their sender has delivered that last notification.
+        """
+        for subscriber in list(self.watchers.get(uri, ())):
+            subscriber.uris.discard(uri)
+            self._unwatch(subscriber, uri)
+            if not subscriber.uris and not subscriber.pending:
+                self._drop(subscriber)
+
+    async def _send(self, subscriber: Subscriber):
+        try:
+            while True:
+                await subscriber.wake.wait()
+                subscriber.wake.clear()
+                while subscriber.pending:
+                    uri = next(iter(subscriber.pending))
+                    del subscriber.pending[uri]
+                    await subscriber.session.send_resource_updated(AnyUrl(uri))
+                    self.stats["sent"] += 1
+                if not subscriber.uris:
+                    # Everything it watched was forgotten while notifications were pending
+                    subscriber.task = None
+                    self._drop(subscriber)
+                    return
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # The client went away; its session cannot be written to any more
+            self.stats["dropped"] += 1
+            subscriber.task = None
+            self._drop(subscriber)
+
+    def _unwatch(self, subscriber: Subscriber, uri: str):
+        watchers = self.watchers.get(uri)
+        if watchers is not None:
+            watchers.discard(subscriber)
+            if not watchers:
+                del self.watchers[uri]
+
+    def _drop(self, subscriber: Subscriber):
+        for uri in subscriber.uris:
+            self._unwatch(subscriber, uri)
+        subscriber.uris.clear()
+        subscriber.pending.clear()
+        self.subscribers.pop(id(subscriber.session), None)
+        if subscriber.task is not None:
+            subscriber.task.cancel()
+
+    def metrics(self) -> Dict[str, int]:
+        return {"subscribers": len(self.subscribers), "watched_uris": len(self.watchers), **self.stats}
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Tournament - Self-play across a process pool for strategy evaluation at scale
+
+Games are independent, so they are split into chunks and played in worker
+processes; each worker sends back one small GameResult per game rather than
+the final state. Game i always uses seed + i and the agent lineup rotated by
+i, so the results do not depend on the number of workers, and every agent
+sits in every seat equally often.
+
+    python tournament.py --agents policy random "mcts:budget_ms=20" --players 3 --games 3000
+"""
+
+import os
+import json
+import math
+import time
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from game_engine import MonopolyGame, GamePhase, merge_state
+from ai_agents import create_agent, BaseAgent, MCTSAgent
+from decision_cache import DecisionCache
+from game_runner import force_turn_end, final_score, game_winner
+
+
+# Agent kinds whose choices are random; they get a seed derived from the game's
+SEEDED_KINDS = ("random", "mcts")
+# Decisions allowed in one turn before the runner forces it to end
+MAX_DECISIONS_PER_TURN = 100
+
+# Decision caches of this process by path, for agent specs with a cache=PATH option
+_caches: Dict[str, DecisionCache] = {}
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """Outcome of one tournament game; lineup[seat] is the agent spec in that seat."""
+    index: int
+    seed: int
+    lineup: Tuple[str, ...]
+    winner: int
+    turns: int
+    decisions: int
+    finished: bool
+    # game_runner.final_score per seat
+    scores: Tuple[int, ...]
+
+
+def parse_agent_spec(spec: str) -> Tuple[str, Dict[str, Any]]:
+    """'kind' or 'kind:key=value,key=value' to (kind, options); values are JSON or plain strings."""
+    kind, _, rest = spec.partition(":")
+    options = {}
+    for item in filter(None, rest.split(",")):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Agent option '{item}' in '{spec}' is not key=value")
+        try:
+            options[key.strip()] = json.loads(value)
+        except ValueError:
+            options[key.strip()] = value
+    return kind.strip(), options
+
+
+def lineup_for(agents: List[str], players: int, index: int) -> Tuple[str, ...]:
+    """Seats of game index: the agent list repeated to the player count, rotated by index."""
+    return tuple(agents[(index + seat) % len(agents)] for seat in range(players))
+
+
+def wilson_interval(wins: int, games: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for a win rate; (0, 1) when there are no games."""
+    if not games:
+        return 0.0, 1.0
+    p = wins / games
+    denominator = 1 + z * z / games
+    centre = (p + z * z / (2 * games)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+# ============================================================================
+# PLAYING ONE GAME
+# ============================================================================
+
+def _decider(game: MonopolyGame) -> str:
+    """Who acts now: the current player, or during an auction the next bidder after them."""
+    if game.phase != GamePhase.AUCTION:
+        return game.current_player.name
+    auction = game.auction
+    order = game.player_order
+    start = game.current_player_idx
+    for k in range(len(order)):
+        name = order[(start + k) % len(order)]
+        if (name not in auction.passed_players and name != auction.current_bidder
+                and not game.players[name].bankrupt):
+            return name
+    return game.current_player.name
+
+
+def play_game(agents: Dict[str, BaseAgent], seed: int, max_turns: int = 100) -> Tuple[MonopolyGame, int]:
+    """Play one game without output; returns the finished game and the number of decisions."""
+    game = MonopolyGame(list(agents), seed=seed)
+    game.initialize()
+    for agent in agents.values():
+        agent.attach(game)
+    # Only agents that read the state dict pay for keeping it current
+    game_state = game.get_full_state() if any(a.reads_state for a in agents.values()) else None
+
+    decisions = 0
+    turn_started = game.turn_number
+    in_turn = 0
+    while game.phase != GamePhase.GAME_OVER and game.turn_number < max_turns:
+        name = _decider(game)
+        agent = agents[name]
+        available = game.get_available_actions()
+        available["current_player"] = name
+        if agent.reads_state:
+            game_state = merge_state(game_state, game.get_state_since(game_state["version"]))
+        decision = agent.decide(game_state, available)
+        decisions += 1
+
+        action = decision.get("action", "").replace(" ", "_")
+        if "(" in action:
+            action = action.split("(")[0].strip()
+        game.execute(action, decision.get("params", {}))
+
+        if game.turn_number != turn_started:
+            turn_started = game.turn_number
+            in_turn = 0
+        else:
+            in_turn += 1
+            if in_turn > MAX_DECISIONS_PER_TURN:
+                force_turn_end(game)
+    return game, decisions
+
+
+def _build_agents(lineup: Tuple[str, ...], seed: int) -> Dict[str, BaseAgent]:
+    agents = {}
+    for seat, spec in enumerate(lineup):
+        kind, options = parse_agent_spec(spec)
+        name = f"P{seat}"
+        if kind in SEEDED_KINDS:
+            options.setdefault("seed", seed * 31 + seat)
+        if "cache" in options:
+            path = options["cache"]
+            if path not in _caches:
+                _caches[path] = DecisionCache(path=path)
+            options["cache"] = _caches[path]
+        agents[name] = create_agent(name, kind, **options)
+    return agents
+
+
+def _play_chunk(indices: range, agent_specs: List[str], players: int, seed: int,
+                max_turns: int) -> List[GameResult]:
+    """Worker entry point: play games indices and return their compact results."""
+    results = []
+    for index in indices:
+        lineup = lineup_for(agent_specs, players, index)
+        agents = _build_agents(lineup, seed + index)
+        try:
+            game, decisions = play_game(agents, seed + index, max_turns)
+        finally:
+            for agent in agents.values():
+                if isinstance(agent, MCTSAgent):
+                    agent.close()
+        seats = [f"P{seat}" for seat in range(players)]
+        scores = tuple(final_score(game, name) for name in seats)
+        winner = seats.index(game_winner(game))
+        results.append(GameResult(index, seed + index, lineup, winner, game.turn_number, decisions,
+                                  game.phase == GamePhase.GAME_OVER, scores))
+    return results
+
+
+# ============================================================================
+# TOURNAMENT
+# ============================================================================
+
+def summarize(results: List[GameResult], elapsed: float = 0.0) -> Dict[str, Any]:
+    """Win rates per agent spec and per seat, with 95% Wilson intervals.
+
+    A game counts once for every seat an agent holds, so with duplicated
+    agents in a lineup the rates are per seat and comparable to 1 / players.
+    """
+    seats: Counter = Counter()
+    wins: Counter = Counter()
+    seat_wins: Counter = Counter()
+    for r in results:
+        seats.update(r.lineup)
+        wins[r.lineup[r.winner]] += 1
+        seat_wins[r.winner] += 1
+
+    def rate(won: int, played: int) -> Dict[str, Any]:
+        low, high = wilson_interval(won, played)
+        return {"games": played, "wins": won, "win_rate": won / played if played else 0.0,
+                "ci_low": low, "ci_high": high}
+
+    players = len(results[0].lineup) if results else 0
+    return {
+        "games": len(results),
+        "unfinished": sum(not r.finished for r in results),
+        "mean_turns": sum(r.turns for r in results) / len(results) if results else 0.0,
+        "decisions": sum(r.decisions for r in results),
+        "elapsed": elapsed,
+        "games_per_second": len(results) / elapsed if elapsed else 0.0,
+        "agents": {spec: rate(wins[spec], seats[spec]) for spec in sorted(seats)},
+        "seats": [rate(seat_wins[seat], len(results)) for seat in range(players)],
+    }
+
+
+def run_tournament(agent_specs: List[str], games: int, players: int = 2, seed: int = 0,
+                   max_turns: int = 100, workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                   on_result: Optional[Callable[[GameResult], None]] = None) -> Dict[str, Any]:
+    """Play games games across workers processes and aggregate win rates.
+
+    workers=0 plays in this process. Chunks default to a few per worker so
+    slow games even out without paying per-game dispatch.
+    """
+    if not agent_specs:
+        raise ValueError("A tournament needs at least one agent")
+    if not 2 <= players <= 8:
+        raise ValueError("Games need 2 to 8 players")
+    for spec in agent_specs:
+        kind, _ = parse_agent_spec(spec)
+        if kind == "human":
+            raise ValueError("Human players cannot join a tournament")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, min(200, games // (max(1, workers) * 8)))
+    chunks = [range(i, min(games, i + chunk_size)) for i in range(0, games, chunk_size)]
+
+    start = time.perf_counter()
+    results: List[GameResult] = []
+
+    def collect(chunk_results: List[GameResult]):
+        results.extend(chunk_results)
+        if on_result is not None:
+            for result in chunk_results:
+                on_result(result)
+
+    if workers == 0:
+        for chunk in chunks:
+            collect(_play_chunk(chunk, agent_specs, players, seed, max_turns))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_play_chunk, chunk, agent_specs, players, seed, max_turns)
+                       for chunk in chunks]
+            for future in as_completed(futures):
+                collect(future.result())
+    results.sort(key=lambda r: r.index)
+    summary = summarize(results, time.perf_counter() - start)
+    summary["workers"] = workers
+    summary["results"] = results
+    return summary
+
+
+def print_summary(summary: Dict[str, Any]):
+    print(f"\n{summary['games']} games in {summary['elapsed']:.1f}s "
+          f"({summary['games_per_second']:.1f} games/s on {summary['workers']} workers), "
+          f"mean {summary['mean_turns']:.1f} turns, {summary['unfinished']} hit the turn limit")
+    print(f"\n  {'agent':<32} {'seats':>7} {'wins':>7} {'win rate':>9}   95% CI")
+    for spec, r in sorted(summary["agents"].items(), key=lambda x: -x[1]["win_rate"]):
+        print(f"  {spec:<32} {r['games']:>7} {r['wins']:>7} {r['win_rate']:>9.3f}   "
+              f"[{r['ci_low']:.3f}, {r['ci_high']:.3f}]")
+    print(f"\n  {'seat':<32} {'games':>7} {'wins':>7} {'win rate':>9}   95% CI")
+    for seat, r in enumerate(summary["seats"]):
+        print(f"  {seat:<32} {r['games']:>7} {r['wins']:>7} {r['win_rate']:>9.3f}   "
+              f"[{r['ci_low']:.3f}, {r['ci_high']:.3f}]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monopoly self-play tournament")
+    parser.add_argument("--agents", nargs="+", default=["policy", "random"],
+                        help="Agent specs 'kind' or 'kind:key=value,...' (policy, random, mcts, openai, ollama), "
+                             "seated in rotation")
+    parser.add_argument("--players", type=int, default=2, help="Players per game (2-8)")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="Game i uses seed + i")
+    parser.add_argument("--max-turns", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count, 0: in-process)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Games per task sent to a worker")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    summary = run_tournament(args.agents, args.games, args.players, args.seed, args.max_turns,
+                             args.workers, args.chunk_size)
+    if args.json:
+        summary.pop("results")
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()